@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 
@@ -24,7 +25,7 @@ ALLOWED_HOSTS = os.getenv('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
 # Configuration REST Framework avec JWT
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user_management.authentication.SlimUserJWTAuthentication',
     ),
 }
 
@@ -61,6 +62,17 @@ CACHES = {
     }
 }
 
+# Durée de vie des réponses du catalogue de formations en cache (invalidées à chaque modification)
+CATALOGUE_CACHE_TIMEOUT = int(os.getenv('CATALOGUE_CACHE_TIMEOUT', 60 * 10))
+# Nombre de stagiaires disponibles pour l'attribution des thèmes (invalidé à chaque attribution)
+AVAILABLE_INTERNS_CACHE_TIMEOUT = int(os.getenv('AVAILABLE_INTERNS_CACHE_TIMEOUT', 60 * 5))
+# Indicateurs globaux du tableau de bord (logs_and_analytics/Services/StatisticsService.py)
+STATISTICS_CACHE_TIMEOUT = int(os.getenv('STATISTICS_CACHE_TIMEOUT', 60))
+# Statistiques des projets par visibilité (invalidées à chaque modification de projet)
+PROJECT_STATS_CACHE_TIMEOUT = int(os.getenv('PROJECT_STATS_CACHE_TIMEOUT', 60 * 5))
+# Fil d'annonces (invalidé à chaque modification, borné par la prochaine publication programmée)
+ANNOUNCEMENT_FEED_CACHE_TIMEOUT = int(os.getenv('ANNOUNCEMENT_FEED_CACHE_TIMEOUT', 60 * 10))
+
 ASGI_APPLICATION = 'bcef_innovation_backend.asgi.application'
 CHANNEL_LAYERS = {
     'default': {
@@ -177,6 +189,20 @@ STATIC_ROOT = os.getenv('STATIC_ROOT', BASE_DIR / 'staticfiles')  # Pour déploi
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.getenv('MEDIA_ROOT', BASE_DIR / 'media')
 
+# Stockage adressé par contenu des supports et fichiers de projet (voir user_management/storage.py)
+CONTENT_STORE_PREFIX = 'cas'
+CONTENT_STORE_GC_GRACE_SECONDS = int(os.getenv('CONTENT_STORE_GC_GRACE_SECONDS', 60 * 60))
+# Aperçus des supports (pdftoppm / ffmpeg sur les workers Celery, voir training_management/previews.py)
+SUPPORT_PREVIEW_WIDTH = int(os.getenv('SUPPORT_PREVIEW_WIDTH', 480))
+SUPPORT_PREVIEW_TIMEOUT = int(os.getenv('SUPPORT_PREVIEW_TIMEOUT', 60))
+# Préfixe d'une location nginx `internal` : les téléchargements sont délégués via X-Accel-Redirect
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+
+# Téléversement par morceaux reprenable (voir user_management/views/uploads.py)
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv('CHUNKED_UPLOAD_MAX_SIZE', 2 * 1024 * 1024 * 1024))  # 2GB
+CHUNKED_UPLOAD_CHUNK_MAX_SIZE = int(os.getenv('CHUNKED_UPLOAD_CHUNK_MAX_SIZE', 8 * 1024 * 1024))  # 8MB
+CHUNKED_UPLOAD_EXPIRY_HOURS = int(os.getenv('CHUNKED_UPLOAD_EXPIRY_HOURS', 24))
+
 # Tailles max pour les uploads
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
@@ -190,8 +216,39 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'user_management.tasks.clean_expired_tokens',
         'schedule': timedelta(hours=24),
     },
+    'update-sessions-statuts': {
+        'task': 'training_management.tasks.update_sessions_statuts',
+        'schedule': timedelta(minutes=5),
+    },
+    'refresh-formateur-eligibility': {
+        'task': 'training_management.tasks.refresh_formateur_eligibility',
+        'schedule': timedelta(hours=24),
+    },
+    'collect-orphan-files': {
+        'task': 'user_management.tasks.collect_orphan_files',
+        'schedule': timedelta(hours=24),
+    },
+    'purge-expired-uploads': {
+        'task': 'user_management.tasks.purge_expired_uploads',
+        'schedule': timedelta(hours=1),
+    },
+    'refresh-analytics-rollups': {
+        'task': 'logs_and_analytics.tasks.refresh_analytics_rollups',
+        'schedule': crontab(hour=0, minute=30),
+    },
 }
 
+# Agrégats quotidiens du tableau de bord (voir logs_and_analytics/rollups.py)
+ROLLUP_LOOKBACK_DAYS = int(os.getenv('ROLLUP_LOOKBACK_DAYS', 2))  # jours récents toujours recalculés
+ROLLUP_INITIAL_DAYS = int(os.getenv('ROLLUP_INITIAL_DAYS', 365))  # historique du premier passage
+AUDIT_LOG_PATH = os.getenv('AUDIT_LOG_PATH', 'logs/audit.log')
+# Tokens consommés conservés avant la purge (comptage des activations)
+ONE_TIME_TOKEN_RETENTION_DAYS = int(os.getenv('ONE_TIME_TOKEN_RETENTION_DAYS', 3))
+
+# Tâches de maintenance par lots (voir user_management/maintenance.py)
+MAINTENANCE_BATCH_SIZE = int(os.getenv('MAINTENANCE_BATCH_SIZE', 500))
+MAINTENANCE_BATCH_PAUSE = float(os.getenv('MAINTENANCE_BATCH_PAUSE', 0.1))  # secondes entre deux lots
+
 
 # Logging configuration
 # Le dossier 'logs' existe dans votre répertoire de projet ?
@@ -207,7 +264,7 @@ LOGGING = {
         'audit_file': {
             'level': 'INFO',
             'class': 'logging.handlers.RotatingFileHandler',
-            'filename': 'logs/audit.log',
+            'filename': AUDIT_LOG_PATH,
             'maxBytes': 10485760,  # 10MB
             'backupCount': 10,
             'formatter': 'audit',
@@ -25,6 +25,9 @@ urlpatterns = [
     
     # Inclure les URLs de annoucements directement sous /api/
     path('api/', include('communications_management.urls')),
+
+    # Inclure les URLs de logs_and_analytics (statistiques) directement sous /api/
+    path('api/', include('logs_and_analytics.urls')),
     
     
     # Inclure les URLs de chating directement sous /api/
@@ -1,7 +1,7 @@
 // components/themes/AssignModal.jsx
 import React, { useState } from 'react';
 import { useAssignTheme } from '../../../../Hooks/internship/useAssignTheme';
-import { useAvailableInterns } from '../../../../Hooks/internship/useAvailableInterns';
+import { useAvailableInterns } from '../../../../Hooks/internship/useThemes';
 
 export default function AssignModal({ theme, isOpen, onClose, onSuccess }) {
   const [internId, setInternId] = useState('');
@@ -2,6 +2,19 @@
 import { useState, useEffect } from "react";
 import api from "../../../../api/api"; // ton fichier api.js
 
+// Les listes sont paginées ({ next, results }) : on suit `next` jusqu'à la dernière page
+export const fetchAllPages = async (url) => {
+  const items = [];
+  let next = url;
+  while (next) {
+    const res = await api.get(next);
+    if (Array.isArray(res.data)) return res.data; // liste non paginée
+    items.push(...res.data.results);
+    next = res.data.next;
+  }
+  return items;
+};
+
 export const useThemes = () => {
   const [themes, setThemes] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -10,8 +23,7 @@ export const useThemes = () => {
   const fetchThemes = async () => {
     try {
       setLoading(true);
-      const res = await api.get("/themes/");
-      setThemes(res.data);
+      setThemes(await fetchAllPages("/themes/"));
       setError(null);
     } catch (err) {
       setError(err.response?.data?.detail || "Erreur de chargement des thèmes");
@@ -33,8 +45,8 @@ export const useAvailableThemes = () => {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    api.get("themes/available/").then(res => {
-      setThemes(res.data);
+    fetchAllPages("themes/available/").then(data => {
+      setThemes(data);
       setLoading(false);
     }).catch(() => setLoading(false));
   }, []);
@@ -48,8 +60,8 @@ export const useAssignedThemes = () => {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    api.get("/themes/assigned/").then(res => {
-      setThemes(res.data);
+    fetchAllPages("/themes/assigned/").then(data => {
+      setThemes(data);
       setLoading(false);
     }).catch(() => setLoading(false));
   }, []);
@@ -88,9 +100,9 @@ export const useAvailableInterns = () => {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    api.get("/available-interns/")  // ← URL exacte que ton router attend
-      .then(res => {
-        setInterns(res.data);
+    fetchAllPages("/available-interns/")  // ← URL exacte que ton router attend
+      .then(data => {
+        setInterns(data);
         setLoading(false);
       })
       .catch(() => {
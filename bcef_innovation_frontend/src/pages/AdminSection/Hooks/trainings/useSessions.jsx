@@ -215,19 +215,31 @@ export const useSessions = (filters = {}) => {
     }
   };
 
-  const getCalendarSessions = async () => {
+  // visibleDate : un jour du mois affiché ; la fenêtre demandée est [1er du mois, 1er du mois suivant)
+  const getCalendarSessions = async (visibleDate = new Date()) => {
+    const toParam = (d) =>
+      `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
+    const start = new Date(visibleDate.getFullYear(), visibleDate.getMonth(), 1);
+    const end = new Date(visibleDate.getFullYear(), visibleDate.getMonth() + 1, 1);
+
     try {
       setLoading(true);
       setError(null);
-      const response = await api.get('/sessions/calendar/');
-      const data = response.data.results || response.data;
-      
-      if (!Array.isArray(data)) {
-        console.warn('useFormationSessions: Expected array for calendar, received:', data);
+      const response = await api.get('/sessions/calendar/', {
+        params: { start: toParam(start), end: toParam(end) },
+      });
+      const { fields, sessions: rows } = response.data;
+
+      if (!Array.isArray(fields) || !Array.isArray(rows)) {
+        console.warn('useFormationSessions: Unexpected calendar payload:', response.data);
         setSessions([]);
-      } else {
-        setSessions(data);
+        return [];
       }
+      // Réponse compacte : une ligne par session, dans l'ordre de `fields`
+      const data = rows.map(row =>
+        Object.fromEntries(fields.map((field, index) => [field, row[index]]))
+      );
+      setSessions(data);
       return data;
     } catch (err) {
       const errorMsg = 
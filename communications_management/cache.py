@@ -0,0 +1,43 @@
+# communications_management/cache.py
+"""
+Cache du fil d'annonces, chargé par chaque utilisateur à la connexion.
+Deux variantes : `admin` (toutes les annonces et leurs compteurs) et `public`
+(annonces publiées). La clé contient l'URL complète, donc la page demandée.
+
+Les clés sont versionnées : enregistrer, publier, dépublier ou supprimer une
+annonce incrémente la version. Une annonce programmée devient visible sans
+écriture : la durée de vie d'une entrée ne dépasse donc jamais la prochaine
+date de publication.
+"""
+from django.conf import settings
+from django.db.models import Min
+from django.utils import timezone
+
+from user_management.cache_versions import bump_version, get_version
+
+ANNOUNCEMENT_FEED_VERSION_KEY = 'communications:announcements:version'
+
+
+def announcement_feed_cache_key(scope, path):
+    """Clé d'une page du fil pour une variante (`admin` ou `public`) et une URL."""
+    return f"communications:announcements:v{get_version(ANNOUNCEMENT_FEED_VERSION_KEY)}:{scope}:{path}"
+
+
+def get_announcement_feed_cache_timeout():
+    """Durée de vie bornée par la prochaine publication programmée."""
+    from .models import Announcement
+
+    timeout = getattr(settings, 'ANNOUNCEMENT_FEED_CACHE_TIMEOUT', 60 * 10)
+    now = timezone.now()
+    next_publication = (
+        Announcement.objects.filter(is_active=True, publication_date__gt=now)
+        .aggregate(next=Min('publication_date'))['next']
+    )
+    if next_publication is not None:
+        timeout = min(timeout, max(int((next_publication - now).total_seconds()) + 1, 1))
+    return timeout
+
+
+def invalidate_announcement_feed():
+    """Invalide toutes les pages du fil en cache, pour les deux variantes."""
+    bump_version(ANNOUNCEMENT_FEED_VERSION_KEY)
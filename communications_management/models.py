@@ -106,4 +106,43 @@ class Announcement(models.Model):
         Détermine si un utilisateur peut supprimer cette annonce
         Seuls les admins peuvent supprimer les annonces
         """
-        return user.is_authenticated and user.role == 'admin'
\ No newline at end of file
+        return user.is_authenticated and user.role == 'admin'
+
+
+# Invalidation du fil d'annonces en cache (voir communications_management/cache.py).
+# Le nom et l'email de l'auteur font partie de la réponse en cache.
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .cache import invalidate_announcement_feed
+
+AUTHOR_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver([post_save, post_delete], sender=Announcement)
+def announcement_changed(sender, **kwargs):
+    """Enregistrement, publication, dépublication ou suppression d'une annonce."""
+    invalidate_announcement_feed()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def announcement_author_changed(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Ignore les créations et les sauvegardes ciblées sans effet sur l'auteur (ex. last_login).
+    Le rôle n'est pas consulté : un auteur rétrogradé reste affiché sous ses annonces.
+    """
+    if created or (update_fields is not None and not AUTHOR_FIELDS.intersection(update_fields)):
+        return
+    if Announcement.objects.filter(created_by=instance).exists():
+        invalidate_announcement_feed()
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def announcement_author_deleting(sender, instance, **kwargs):
+    """created_by passe à NULL sans signal : les annonces de l'auteur sont relevées avant."""
+    instance._authored_announcements = Announcement.objects.filter(created_by=instance).exists()
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def announcement_author_deleted(sender, instance, **kwargs):
+    if getattr(instance, '_authored_announcements', False):
+        invalidate_announcement_feed()
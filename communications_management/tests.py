@@ -1,3 +1,86 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from user_management.models import User
+
+from .cache import get_announcement_feed_cache_timeout
+from .models import Announcement
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, ANNOUNCEMENT_FEED_CACHE_TIMEOUT=600)
+class AnnouncementFeedCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser('admin@example.com', 'pw', first_name='Ada')
+        self.intern = User.objects.create_user('intern@example.com', 'pw', role='intern', is_active=True)
+        self.published = Announcement.objects.create(title='Publiée', content='...', created_by=self.admin)
+        self.draft = Announcement.objects.create(title='Brouillon', content='...', is_active=False)
+
+    def feed(self, user, path='/api/announcements/'):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        results = data['results'] if isinstance(data, dict) else data
+        return data, [item['title'] for item in results]
+
+    def test_admin_and_public_variants(self):
+        admin_data, admin_titles = self.feed(self.admin)
+        _, public_titles = self.feed(self.intern)
+
+        self.assertCountEqual(admin_titles, ['Publiée', 'Brouillon'])
+        self.assertEqual(admin_data['metadata']['total'], 2)
+        self.assertEqual(public_titles, ['Publiée'])
+        # Les réponses en cache ne se mélangent pas entre variantes
+        self.assertEqual(self.feed(self.intern)[1], ['Publiée'])
+        self.assertCountEqual(self.feed(self.admin)[1], ['Publiée', 'Brouillon'])
+
+    def test_feed_is_served_from_cache(self):
+        self.feed(self.intern)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.feed(self.intern)[1], ['Publiée'])
+
+    def test_publish_and_unpublish_invalidate(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        self.feed(self.intern)
+
+        client.post(f'/api/announcements/{self.draft.pk}/publish/')
+        self.assertCountEqual(self.feed(self.intern)[1], ['Publiée', 'Brouillon'])
+
+        client.post(f'/api/announcements/{self.published.pk}/unpublish/')
+        self.assertEqual(self.feed(self.intern)[1], ['Brouillon'])
+
+    def test_author_changes_invalidate(self):
+        self.feed(self.intern)
+
+        # Auteur rétrogradé et renommé dans la même sauvegarde
+        self.admin.role = 'supervisor'
+        self.admin.is_staff = self.admin.is_superuser = False
+        self.admin.first_name = 'Grace'
+        self.admin.save()
+        data, _ = self.feed(self.intern)
+        self.assertIn('Grace', str(data))
+
+        self.admin.delete()
+        data, _ = self.feed(self.intern)
+        self.assertNotIn('admin@example.com', str(data))
+
+    def test_timeout_is_capped_by_next_publication(self):
+        self.assertEqual(get_announcement_feed_cache_timeout(), 600)
+
+        Announcement.objects.create(
+            title='Programmée', content='...', publication_date=timezone.now() + timedelta(seconds=90)
+        )
+
+        self.assertLessEqual(get_announcement_feed_cache_timeout(), 91)
+        self.assertGreater(get_announcement_feed_cache_timeout(), 0)
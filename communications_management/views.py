@@ -2,8 +2,10 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Q
+from .cache import announcement_feed_cache_key, get_announcement_feed_cache_timeout
 from .models import Announcement
 from .serializers import (
     AnnouncementSerializer, 
@@ -41,14 +43,22 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         
         # Pour les admins : voir toutes les annonces
         if user.role == 'admin':
-            return Announcement.objects.all().order_by('-publication_date', '-priority')
+            return Announcement.objects.select_related('created_by').order_by('-publication_date', '-priority')
         
         # Pour les autres utilisateurs : seulement les annonces publiées et actives
-        return Announcement.objects.filter(
+        return self._published_queryset()
+
+    @staticmethod
+    def _published_queryset():
+        # Auteur joint : created_by_name / created_by_email sans requête par annonce
+        return Announcement.objects.select_related('created_by').filter(
             is_active=True,
             publication_date__lte=timezone.now()
         ).order_by('-publication_date', '-priority')
 
+    def _feed_scope(self, request):
+        return 'admin' if request.user.role == 'admin' else 'public'
+
     def get_permissions(self):
         """
         Instancie et retourne la liste des permissions requises pour cette vue
@@ -64,16 +74,30 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
     def list(self, request, *args, **kwargs):
-        """Liste des annonces avec statistiques"""
+        """Liste des annonces avec statistiques, servie depuis le cache (une entrée par variante et par page)"""
+        cache_key = announcement_feed_cache_key(self._feed_scope(request), request.get_full_path())
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        response = self._list_with_metadata(request, *args, **kwargs)
+        cache.set(cache_key, response.data, get_announcement_feed_cache_timeout())
+        return response
+
+    def _list_with_metadata(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         
         # Ajouter des métadonnées pour les admins
         if request.user.role == 'admin':
-            total_announcements = Announcement.objects.count()
-            active_announcements = Announcement.objects.filter(is_active=True).count()
-            upcoming_announcements = Announcement.objects.filter(
-                publication_date__gt=timezone.now()
-            ).count()
+            # Un seul agrégat pour les trois compteurs
+            counts = Announcement.objects.aggregate(
+                total=Count('id'),
+                active=Count('id', filter=Q(is_active=True)),
+                upcoming=Count('id', filter=Q(publication_date__gt=timezone.now())),
+            )
+            total_announcements = counts['total']
+            active_announcements = counts['active']
+            upcoming_announcements = counts['upcoming']
             
             # CORRECTION : Vérifier si response.data est un dictionnaire (avec pagination)
             # ou une liste (sans pagination)
@@ -103,7 +127,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         announcement = self.get_object()
         announcement.publication_date = timezone.now()
         announcement.is_active = True
-        announcement.save()
+        announcement.save(update_fields=['publication_date', 'is_active', 'updated_at'])
         
         serializer = self.get_serializer(announcement)
         return Response(serializer.data)
@@ -113,7 +137,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         """Action pour dépublier une annonce"""
         announcement = self.get_object()
         announcement.is_active = False
-        announcement.save()
+        announcement.save(update_fields=['is_active', 'updated_at'])
         
         serializer = self.get_serializer(announcement)
         return Response(serializer.data)
@@ -127,7 +151,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        announcements = Announcement.objects.filter(created_by=request.user)
+        announcements = Announcement.objects.select_related('created_by').filter(created_by=request.user)
         page = self.paginate_queryset(announcements)
         
         if page is not None:
@@ -139,17 +163,22 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def active(self, request):
-        """Liste des annonces actives (pour tous les utilisateurs)"""
-        active_announcements = Announcement.objects.filter(
-            is_active=True,
-            publication_date__lte=timezone.now()
-        ).order_by('-publication_date', '-priority')
+        """Liste des annonces actives (pour tous les utilisateurs), variante publique du cache"""
+        cache_key = announcement_feed_cache_key('public', request.get_full_path())
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        active_announcements = self._published_queryset()
         
         page = self.paginate_queryset(active_announcements)
         
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(active_announcements, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(active_announcements, many=True)
+            response = Response(serializer.data)
+
+        cache.set(cache_key, response.data, get_announcement_feed_cache_timeout())
+        return response
\ No newline at end of file
@@ -0,0 +1,171 @@
+# internship_management/Services/AssignmentService.py
+"""Attribution et désattribution des thèmes de stage.
+
+La validation est faite une seule fois, sous verrou de la ligne du thème, puis
+le stagiaire et le thème sont mis à jour dans la même transaction avec des
+écritures ciblées (sans full_clean ni relecture de la relation inverse)."""
+
+import logging
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from internship_management.cache import invalidate_available_interns_count
+from internship_management.models import Theme
+from logs_and_analytics.models import RollupDirtyDay
+from logs_and_analytics.rollups import ThemeAssignmentRollup, missed_by_sources
+from user_management.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_assigned_intern(theme, intern):
+    """Renseigne le cache de la relation inverse theme.assigned_intern."""
+    Theme.assigned_intern.related.set_cached_value(theme, intern)
+
+
+class ThemeAssignmentService:
+    """Service dédié à l'attribution d'un thème à un stagiaire."""
+
+    @staticmethod
+    def assign(theme, intern_id, assignment_date=None):
+        """
+        Attribue le thème (instance ou id) au stagiaire.
+        Le SELECT ... FOR UPDATE sur le thème sérialise les attributions
+        concurrentes ; l'UPDATE du stagiaire est conditionnel à l'absence de thème.
+        :return: le thème mis à jour, stagiaire en cache
+        """
+        theme_id = getattr(theme, 'pk', theme)
+        with transaction.atomic():
+            theme = Theme.objects.select_for_update().filter(pk=theme_id).first()
+            if theme is None:
+                raise ValidationError(_("Thème introuvable."), code='not_found')
+            if not theme.is_assignable:
+                raise ValidationError(_("Ce thème n'est pas attribuable."))
+
+            intern = (
+                User.objects.filter(pk=intern_id, role='intern')
+                .only('id', 'email', 'first_name', 'last_name', 'role', 'assigned_theme_id')
+                .first()
+            )
+            if intern is None:
+                raise ValidationError(_("Stagiaire introuvable."), code='not_found')
+            if intern.assigned_theme_id is not None:
+                raise ValidationError(_("Ce stagiaire a déjà un thème attribué."))
+
+            updated = User.objects.filter(pk=intern.pk, assigned_theme__isnull=True).update(assigned_theme=theme)
+            if not updated:
+                # Thème attribué au même stagiaire par une autre requête entre-temps
+                raise ValidationError(_("Ce stagiaire a déjà un thème attribué."))
+            intern.assigned_theme = theme
+
+            theme.status = Theme.Status.ASSIGNED
+            theme.assignment_date = assignment_date or timezone.now()
+            theme.save(update_fields=['status', 'assignment_date'])
+            _cache_assigned_intern(theme, intern)
+            transaction.on_commit(invalidate_available_interns_count)
+
+        logger.info(f"Theme {theme.pk} assigned to intern {intern.pk}")
+        return theme
+
+    @staticmethod
+    def unassign(theme):
+        """Retire le stagiaire du thème (instance ou id)."""
+        theme_id = getattr(theme, 'pk', theme)
+        with transaction.atomic():
+            theme = Theme.objects.select_for_update().filter(pk=theme_id).first()
+            if theme is None:
+                raise ValidationError(_("Thème introuvable."), code='not_found')
+
+            cleared = User.objects.filter(assigned_theme=theme).update(assigned_theme=None)
+            if not cleared and theme.status != Theme.Status.ASSIGNED:
+                raise ValidationError(_("Ce thème n'est pas attribué."))
+
+            theme.status = Theme.Status.NOT_ASSIGNED
+            theme.assignment_date = None
+            theme.save(update_fields=['status', 'assignment_date'])
+            _cache_assigned_intern(theme, None)
+            transaction.on_commit(invalidate_available_interns_count)
+
+        logger.info(f"Theme {theme.pk} unassigned")
+        return theme
+
+    @staticmethod
+    def bulk_assign(pairs, assignment_date=None):
+        """
+        Attribue une liste de paires (theme_id, intern_id).
+        Deux requêtes ensemblistes verrouillent et chargent thèmes et stagiaires,
+        puis les paires valides sont écrites par deux bulk_update.
+        :return: dict avec 'assigned', 'rejected' et 'results'
+        """
+        results = []
+        seen_themes, seen_interns = set(), set()
+        for theme_id, intern_id in pairs:
+            if theme_id in seen_themes or intern_id in seen_interns:
+                results.append({'theme_id': theme_id, 'intern_id': intern_id,
+                                'status': 'rejected', 'detail': 'Paire en double dans la requête.'})
+            else:
+                results.append({'theme_id': theme_id, 'intern_id': intern_id, 'status': None})
+            seen_themes.add(theme_id)
+            seen_interns.add(intern_id)
+
+        assignment_date = assignment_date or timezone.now()
+        with transaction.atomic():
+            themes = Theme.objects.select_for_update().in_bulk(seen_themes)
+            interns = (
+                User.objects.select_for_update()
+                .filter(role='intern', is_active=True)
+                .only('id', 'role', 'is_active', 'assigned_theme_id')
+                .in_bulk(seen_interns)
+            )
+
+            themes_to_update, interns_to_update = [], []
+            previous_days = set()
+            for result in results:
+                if result['status']:
+                    continue
+                theme = themes.get(result['theme_id'])
+                intern = interns.get(result['intern_id'])
+                if theme is None:
+                    detail = 'Thème introuvable.'
+                elif not theme.is_assignable:
+                    detail = "Ce thème n'est pas attribuable."
+                elif intern is None:
+                    detail = 'Stagiaire introuvable ou inactif.'
+                elif intern.assigned_theme_id is not None:
+                    detail = 'Ce stagiaire a déjà un thème attribué.'
+                else:
+                    detail = None
+
+                if detail:
+                    result.update(status='rejected', detail=detail)
+                    continue
+
+                intern.assigned_theme = theme
+                theme.status = Theme.Status.ASSIGNED
+                if theme.assignment_date is not None:
+                    previous_days.add(timezone.localtime(theme.assignment_date).date())
+                theme.assignment_date = assignment_date
+                interns_to_update.append(intern)
+                themes_to_update.append(theme)
+                result['status'] = 'assigned'
+
+            if interns_to_update:
+                User.objects.bulk_update(interns_to_update, ['assigned_theme'], batch_size=500)
+                Theme.objects.bulk_update(themes_to_update, ['status', 'assignment_date'], batch_size=500)
+                # bulk_update ne déclenche pas pre_save : jours quittés, et jour
+                # d'attribution s'il est antidaté avant le dernier passage
+                if missed_by_sources(assignment_date):
+                    previous_days.add(timezone.localtime(assignment_date).date())
+                RollupDirtyDay.mark(ThemeAssignmentRollup.name, previous_days)
+                transaction.on_commit(invalidate_available_interns_count)
+
+        assigned = len(themes_to_update)
+        logger.info(f"Bulk theme assignment: {assigned} assigned, {len(results) - assigned} rejected")
+        return {
+            'assigned': assigned,
+            'rejected': len(results) - assigned,
+            'results': results,
+        }
@@ -0,0 +1,86 @@
+# internship_management/Services/ExportService.py
+"""Export des thèmes en CSV (flux) ou Excel (openpyxl en écriture seule).
+
+Les lignes sont lues par queryset.iterator() avec le stagiaire assigné joint
+dans la même requête : aucune requête par thème et une mémoire constante."""
+
+import csv
+import tempfile
+
+from openpyxl import Workbook
+
+from internship_management.models import Theme
+
+
+class _Echo:
+    """Pseudo-fichier pour csv.writer : retourne la ligne au lieu de l'écrire."""
+
+    def write(self, value):
+        return value
+
+
+class ThemeExportService:
+    """Service dédié à l'exportation des thèmes en CSV ou Excel selon filtres."""
+
+    HEADERS = [
+        'id', 'title', 'description', 'status', 'is_active', 'created_date',
+        'assignment_date', 'intern_email', 'intern_first_name', 'intern_last_name',
+    ]
+    FIELDS = [
+        'id', 'title', 'description', 'status', 'is_active', 'created_date',
+        'assignment_date', 'assigned_intern__email', 'assigned_intern__first_name',
+        'assigned_intern__last_name',
+    ]
+    ITERATOR_CHUNK_SIZE = 2000
+
+    @staticmethod
+    def build_queryset(filters=None):
+        queryset = Theme.objects.all()
+        filters = filters or {}
+
+        status = filters.get('status')
+        is_active = filters.get('is_active')
+        search = filters.get('search')
+
+        if status:
+            queryset = queryset.filter(status=status)
+        if is_active not in (None, ''):
+            queryset = queryset.filter(is_active=str(is_active).lower() in ('1', 'true', 'yes'))
+        if search:
+            queryset = queryset.filter(title__icontains=search)
+        return queryset.order_by('created_date', 'id')
+
+    @classmethod
+    def iter_rows(cls, queryset):
+        """Tuples de valeurs prêts à écrire, stagiaire assigné joint (LEFT JOIN)."""
+        for row in queryset.values_list(*cls.FIELDS).iterator(chunk_size=cls.ITERATOR_CHUNK_SIZE):
+            row = list(row)
+            row[4] = 'Yes' if row[4] else 'No'
+            row[5] = row[5].isoformat() if row[5] else ''
+            row[6] = row[6].isoformat() if row[6] else ''
+            yield ['' if value is None else value for value in row]
+
+    @classmethod
+    def stream_csv(cls, queryset):
+        """Générateur de lignes CSV pour StreamingHttpResponse."""
+        writer = csv.writer(_Echo())
+        yield '\ufeff' + writer.writerow(cls.HEADERS)  # BOM pour Excel
+        for row in cls.iter_rows(queryset):
+            yield writer.writerow(row)
+
+    @classmethod
+    def export_to_excel(cls, queryset):
+        """
+        Écrit le classeur dans un fichier temporaire et le retourne ouvert (rembobiné).
+        Le mode write_only d'openpyxl n'accumule pas les lignes en mémoire.
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Thèmes')
+        sheet.append(cls.HEADERS)
+        for row in cls.iter_rows(queryset):
+            sheet.append(row)
+
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
+        output.seek(0)
+        return output
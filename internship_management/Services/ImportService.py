@@ -0,0 +1,174 @@
+# internship_management/Services/ImportService.py
+"""Import en masse des thèmes depuis un fichier CSV ou Excel.
+
+Le fichier est lu par blocs (pandas chunksize pour le CSV, openpyxl en
+lecture seule pour l'Excel) : la mémoire utilisée ne dépend pas du nombre de
+lignes. Pour chaque bloc, l'unicité des titres est vérifiée par une seule
+requête (title__in) puis les thèmes valides sont insérés par bulk_create."""
+
+import logging
+
+import pandas as pd
+from django.db import transaction
+from openpyxl import load_workbook
+
+from internship_management.models import Theme
+
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = {'1', 'true', 'yes', 'oui', 'vrai', 'x'}
+FALSE_VALUES = {'0', 'false', 'no', 'non', 'faux'}
+
+
+class ThemeImportService:
+    """Service dédié à l'importation des thèmes"""
+
+    # Colonnes acceptées (en-têtes français ou anglais)
+    COLUMN_ALIASES = {
+        'title': 'title', 'titre': 'title',
+        'description': 'description',
+        'is_active': 'is_active', 'actif': 'is_active',
+    }
+    REQUIRED_COLUMNS = {'title', 'description'}
+    CHUNK_SIZE = 1000
+    # Nombre maximal d'erreurs détaillées dans le rapport
+    MAX_REPORTED_ERRORS = 200
+
+    def __init__(self, chunk_size=None):
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.title_max_length = Theme._meta.get_field('title').max_length
+        self.description_max_length = Theme._meta.get_field('description').max_length
+
+    @classmethod
+    def normalize_columns(cls, columns):
+        """Associe chaque en-tête reconnu à son champ."""
+        return [cls.COLUMN_ALIASES.get(str(col).strip().lower(), None) for col in columns]
+
+    @staticmethod
+    def _is_blank(row):
+        return not any(value not in (None, '') for value in row)
+
+    def _iter_csv(self, file_path):
+        # Lignes vides conservées (None) pour que la numérotation suive le fichier
+        reader = pd.read_csv(
+            file_path, dtype=str, keep_default_na=False, skip_blank_lines=False, chunksize=self.chunk_size
+        )
+        header_checked = False
+        for chunk in reader:
+            columns = self.normalize_columns(chunk.columns)
+            if not header_checked:
+                self._check_header(columns)
+                header_checked = True
+            yield [
+                None if self._is_blank(row) else dict(zip(columns, row))
+                for row in chunk.itertuples(index=False, name=None)
+            ]
+
+    def _iter_excel(self, file_path):
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            columns = self.normalize_columns(next(rows, ()))
+            self._check_header(columns)
+            batch = []
+            for row in rows:
+                if self._is_blank(row):
+                    batch.append(None)  # ligne vide, conservée pour la numérotation
+                else:
+                    batch.append(dict(zip(columns, row)))
+                if len(batch) >= self.chunk_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            workbook.close()
+
+    def _check_header(self, columns):
+        missing = self.REQUIRED_COLUMNS - set(columns)
+        if missing:
+            raise ValueError(f"Colonnes manquantes: {', '.join(sorted(missing))}")
+
+    @staticmethod
+    def _clean(value):
+        if value is None:
+            return ''
+        return str(value).strip()
+
+    def _parse_active(self, value):
+        value = self._clean(value).lower()
+        if not value or value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        raise ValueError(f"Valeur 'is_active' invalide: {value}")
+
+    def _build(self, row):
+        """Construit un thème non sauvegardé à partir d'une ligne, ou lève ValueError."""
+        title = self._clean(row.get('title'))
+        description = self._clean(row.get('description'))
+        if not title:
+            raise ValueError("Titre manquant")
+        if len(title) > self.title_max_length:
+            raise ValueError(f"Titre trop long (max {self.title_max_length} caractères)")
+        if not description:
+            raise ValueError("Description manquante")
+        if len(description) > self.description_max_length:
+            raise ValueError(f"Description trop longue (max {self.description_max_length} caractères)")
+        return Theme(
+            title=title,
+            description=description,
+            is_active=self._parse_active(row.get('is_active')),
+        )
+
+    @transaction.atomic
+    def import_file(self, file_path, imported_by=None, file_format='csv'):
+        """
+        Importe les thèmes du fichier ; les lignes invalides sont ignorées et signalées.
+        :return: dict avec 'success', 'skipped' et 'errors'
+        """
+        chunks = self._iter_excel(file_path) if file_format == 'excel' else self._iter_csv(file_path)
+        results = {'success': 0, 'skipped': 0, 'errors': []}
+        titles_seen = set()
+        line_num = 1  # ligne d'en-tête
+
+        for chunk in chunks:
+            candidates = []
+            for row in chunk:
+                line_num += 1
+                if row is None:
+                    continue
+                try:
+                    theme = self._build(row)
+                    if theme.title in titles_seen:
+                        raise ValueError("Titre dupliqué dans le fichier")
+                    titles_seen.add(theme.title)
+                    candidates.append((line_num, theme))
+                except ValueError as e:
+                    self._reject(results, line_num, str(e), row.get('title'))
+
+            # Une requête par bloc pour les titres déjà présents en base
+            existing = set(
+                Theme.objects.filter(title__in=[theme.title for _, theme in candidates])
+                .values_list('title', flat=True)
+            )
+            to_create = []
+            for line, theme in candidates:
+                if theme.title in existing:
+                    self._reject(results, line, "Titre déjà existant dans la base", theme.title)
+                else:
+                    to_create.append(theme)
+
+            Theme.objects.bulk_create(to_create, batch_size=500)
+            results['success'] += len(to_create)
+
+        logger.info(
+            f"Theme import by {getattr(imported_by, 'email', imported_by)}: "
+            f"{results['success']} created, {results['skipped']} skipped"
+        )
+        return results
+
+    def _reject(self, results, line, error, title=None):
+        results['skipped'] += 1
+        if len(results['errors']) < self.MAX_REPORTED_ERRORS:
+            results['errors'].append({'line': line, 'error': error, 'title': self._clean(title)})
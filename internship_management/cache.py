@@ -0,0 +1,29 @@
+# internship_management/cache.py
+"""
+Cache du nombre de stagiaires disponibles (actifs, sans thème), affiché par
+l'écran d'attribution. Invalidé à chaque attribution ou modification d'un
+stagiaire ; la durée de vie courte couvre les mises à jour en masse
+(QuerySet.update) qui ne déclenchent pas de signal.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+AVAILABLE_INTERNS_COUNT_KEY = 'internship:available_interns:count'
+
+
+def get_available_interns_cache_timeout():
+    return getattr(settings, 'AVAILABLE_INTERNS_CACHE_TIMEOUT', 60 * 5)
+
+
+def get_available_interns_count():
+    """Nombre de stagiaires disponibles, lu dans le cache ou compté sur l'index partiel."""
+    count = cache.get(AVAILABLE_INTERNS_COUNT_KEY)
+    if count is None:
+        from user_management.models import User
+        count = User.objects.available_interns().count()
+        cache.set(AVAILABLE_INTERNS_COUNT_KEY, count, get_available_interns_cache_timeout())
+    return count
+
+
+def invalidate_available_interns_count():
+    cache.delete(AVAILABLE_INTERNS_COUNT_KEY)
@@ -0,0 +1,124 @@
+"""internship_management/matching.py
+Appariement automatique stagiaires / thèmes disponibles.
+
+Chaque stagiaire est décrit par sa filière et son domaine d'étude
+(Profile.filiere, Profile.domain_study), chaque thème par son titre et sa
+description. La similarité est un cosinus entre sacs de mots pondérés IDF,
+calculé matriciellement (numpy) pour tous les couples à la fois ; les paires
+sont ensuite retenues de la plus forte à la plus faible, chaque stagiaire et
+chaque thème n'étant utilisé qu'une fois.
+"""
+import re
+import unicodedata
+
+import numpy as np
+
+from user_management.models import User
+from .models import Theme
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]{3,}')
+
+# Mots trop fréquents pour discriminer un thème
+STOP_WORDS = {
+    'les', 'des', 'une', 'pour', 'par', 'avec', 'dans', 'sur', 'aux', 'est',
+    'sont', 'qui', 'que', 'ces', 'son', 'ses', 'leur', 'leurs', 'plus', 'entre',
+    'the', 'and', 'for', 'with', 'from', 'etude', 'mise', 'place', 'application',
+    'systeme', 'projet', 'stage', 'gestion',
+}
+
+
+def tokenize(text):
+    """Mots normalisés (minuscules, sans accents, 3 caractères ou plus)."""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().lower()
+    return {token for token in TOKEN_PATTERN.findall(text) if token not in STOP_WORDS}
+
+
+def _matrix(documents, vocabulary):
+    """Matrice binaire documents x vocabulaire."""
+    matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(documents):
+        columns = [vocabulary[token] for token in tokens if token in vocabulary]
+        matrix[row, columns] = 1.0
+    return matrix
+
+
+def similarity_matrix(intern_docs, theme_docs):
+    """Cosinus TF-IDF entre chaque stagiaire (lignes) et chaque thème (colonnes)."""
+    vocabulary = {}
+    for tokens in intern_docs + theme_docs:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+    if not vocabulary:
+        return np.zeros((len(intern_docs), len(theme_docs)), dtype=np.float32)
+
+    interns = _matrix(intern_docs, vocabulary)
+    themes = _matrix(theme_docs, vocabulary)
+
+    # IDF calculé sur l'ensemble des documents
+    document_count = interns.shape[0] + themes.shape[0]
+    frequency = interns.sum(axis=0) + themes.sum(axis=0)
+    idf = np.log((1 + document_count) / (1 + frequency)) + 1
+    interns *= idf
+    themes *= idf
+
+    interns /= np.maximum(np.linalg.norm(interns, axis=1, keepdims=True), 1e-9)
+    themes /= np.maximum(np.linalg.norm(themes, axis=1, keepdims=True), 1e-9)
+    return interns @ themes.T
+
+
+def greedy_pairs(scores, min_score=0.0):
+    """
+    Indices (stagiaire, thème, score) par score décroissant, sans réutilisation.
+    Une paire sans aucun mot commun (score nul) n'est jamais proposée.
+    """
+    if scores.size == 0:
+        return []
+    order = np.argsort(-scores, axis=None, kind='stable')
+    rows, cols = np.unravel_index(order, scores.shape)
+    used_rows, used_cols = set(), set()
+    limit = min(scores.shape)
+    pairs = []
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        if row in used_rows or col in used_cols:
+            continue
+        score = float(scores[row, col])
+        if score <= 0 or score < min_score:
+            break
+        pairs.append((row, col, score))
+        used_rows.add(row)
+        used_cols.add(col)
+        if len(pairs) == limit:
+            break
+    return pairs
+
+
+def propose_matches(theme_ids=None, intern_ids=None, min_score=0.0):
+    """
+    Propose des paires pour les thèmes disponibles et les stagiaires sans thème.
+    :return: liste de dicts {'theme_id', 'intern_id', 'score'}
+    """
+    themes = Theme.objects.available()
+    if theme_ids:
+        themes = themes.filter(pk__in=theme_ids)
+    theme_rows = list(themes.order_by('created_date', 'id').values_list('id', 'title', 'description'))
+
+    interns = User.objects.available_interns()
+    if intern_ids:
+        interns = interns.filter(pk__in=intern_ids)
+    intern_rows = list(interns.order_by('id').values_list('id', 'profile__filiere', 'profile__domain_study'))
+
+    if not theme_rows or not intern_rows:
+        return []
+
+    scores = similarity_matrix(
+        [tokenize(f"{filiere or ''} {domain or ''}") for _, filiere, domain in intern_rows],
+        [tokenize(f"{title} {description}") for _, title, description in theme_rows],
+    )
+    return [
+        {
+            'theme_id': theme_rows[col][0],
+            'intern_id': intern_rows[row][0],
+            'score': round(score, 4),
+        }
+        for row, col, score in greedy_pairs(scores, min_score)
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship_management', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='theme',
+            index=models.Index(fields=['created_date', 'id'], name='theme_created_keyset_idx'),
+        ),
+    ]
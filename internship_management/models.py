@@ -3,11 +3,22 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
-from django.db.models import Q
+from django.db.models import DurationField, ExpressionWrapper, F, Q
+from django.db.models.functions import Now
 from user_management.models import User
 
 
 class ThemeQuerySet(models.QuerySet):
+    def with_assignment(self):
+        """
+        Chemin de lecture des listes : stagiaire assigné joint (relation inverse
+        du OneToOne) et ancienneté calculée par la base, sans requête par thème.
+        """
+        return self.select_related('assigned_intern').annotate(
+            creation_age=ExpressionWrapper(Now() - F('created_date'), output_field=DurationField()),
+            assignment_age=ExpressionWrapper(Now() - F('assignment_date'), output_field=DurationField()),
+        )
+
     def available(self):
         return self.filter(status=Theme.Status.NOT_ASSIGNED, is_active=True)
 
@@ -38,6 +49,9 @@ class ThemeManager(models.Manager):
     def recent(self, days=7):
         return self.get_queryset().recent(days=days)
 
+    def with_assignment(self):
+        return self.get_queryset().with_assignment()
+
 
 class Theme(models.Model):
     class Status(models.TextChoices):
@@ -81,6 +95,8 @@ class Theme(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['created_date']),
             models.Index(fields=['status', 'is_active']),
+            # Pagination par clé (created_date, id) des listes
+            models.Index(fields=['created_date', 'id'], name='theme_created_keyset_idx'),
         ]
 
     def __str__(self):
@@ -96,19 +112,25 @@ class Theme(models.Model):
             return None
 
     def clean(self):
-        # On utilise la propriété assigned_to qui passe par la relation inverse
+        # Relation inverse lue une seule fois (une requête si elle n'est pas en cache)
+        intern = self.assigned_to
         if self.status == self.Status.ASSIGNED:
-            if not self.assigned_to:
+            if not intern:
                 raise ValidationError(_("Un thème attribué doit avoir un stagiaire."))
             if not self.assignment_date:
                 raise ValidationError(_("Un thème attribué doit avoir une date."))
         if self.status == self.Status.NOT_ASSIGNED:
-            if self.assigned_to:
+            if intern:
                 raise ValidationError(_("Un thème non attribué ne peut pas avoir de stagiaire."))
-        if self.assigned_to and self.assigned_to.role != 'intern':
+        if intern and intern.role != 'intern':
             raise ValidationError(_("Seuls les stagiaires peuvent avoir un thème."))
 
     def save(self, *args, **kwargs):
+        # Écriture ciblée (update_fields) : déjà validée par l'appelant,
+        # voir ThemeAssignmentService
+        if kwargs.get('update_fields') is not None:
+            return super().save(*args, **kwargs)
+
         self.full_clean()
         # Auto-sync du statut basé sur la relation inverse
         has_intern = self.assigned_to is not None
@@ -122,27 +144,20 @@ class Theme(models.Model):
         super().save(*args, **kwargs)
 
     def assign_to_intern(self, intern, assignment_date=None):
+        from internship_management.Services.AssignmentService import ThemeAssignmentService
         if intern.role != 'intern':
             raise ValidationError(_("Seuls les stagiaires peuvent recevoir un thème."))
-        if intern.assigned_theme is not None:
-            raise ValidationError(_("Ce stagiaire a déjà un thème attribué."))
-
-        # On assigne via le OneToOneField côté User
+        theme = ThemeAssignmentService.assign(self, intern.pk, assignment_date)
+        self.status = theme.status
+        self.assignment_date = theme.assignment_date
         intern.assigned_theme = self
-        intern.save()
-
-        self.assignment_date = assignment_date or timezone.now()
-        self.status = self.Status.ASSIGNED
-        self.save()
 
     def unassign(self):
-        if self.assigned_to:
-            self.assigned_to.assigned_theme = None
-            self.assigned_to.save()
-
-        self.assignment_date = None
-        self.status = self.Status.NOT_ASSIGNED
-        self.save()
+        from internship_management.Services.AssignmentService import ThemeAssignmentService
+        theme = ThemeAssignmentService.unassign(self)
+        self.status = theme.status
+        self.assignment_date = theme.assignment_date
+        type(self).assigned_intern.related.set_cached_value(self, None)
 
     @property
     def is_assignable(self):
@@ -150,10 +165,33 @@ class Theme(models.Model):
 
     @property
     def days_since_creation(self):
+        # Valeur annotée par with_assignment() si disponible
+        age = getattr(self, 'creation_age', None)
+        if age is not None:
+            return age.days
         return (timezone.now() - self.created_date).days
 
     @property
     def days_since_assignment(self):
-        if self.assignment_date:
-            return (timezone.now() - self.assignment_date).days
-        return None
\ No newline at end of file
+        if not self.assignment_date:
+            return None
+        age = getattr(self, 'assignment_age', None)
+        if age is not None:
+            return age.days
+        return (timezone.now() - self.assignment_date).days
+
+
+# Invalidation du nombre de stagiaires disponibles (voir internship_management/cache.py)
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .cache import invalidate_available_interns_count
+
+AVAILABILITY_FIELDS = {'role', 'is_active', 'assigned_theme'}
+
+
+@receiver([post_save, post_delete], sender=User)
+def intern_availability_changed(sender, instance, update_fields=None, **kwargs):
+    """Ignore les sauvegardes ciblées sans effet sur la disponibilité (ex. last_login)."""
+    if update_fields is not None and not AVAILABILITY_FIELDS.intersection(update_fields):
+        return
+    invalidate_available_interns_count()
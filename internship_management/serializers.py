@@ -98,6 +98,42 @@ class ThemeAssignmentSerializer(serializers.Serializer):
 
 
 
+class ThemeAssignmentPairSerializer(serializers.Serializer):
+    theme_id = serializers.IntegerField()
+    intern_id = serializers.IntegerField()
+
+
+class ThemeBulkAssignmentSerializer(serializers.Serializer):
+    """Attribution en masse : paires explicites ou appariement automatique."""
+
+    MAX_PAIRS = 1000
+
+    pairs = ThemeAssignmentPairSerializer(many=True, required=False)
+    auto_match = serializers.BooleanField(default=False)
+    theme_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    intern_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    min_score = serializers.FloatField(default=0.0, min_value=0.0, max_value=1.0)
+    dry_run = serializers.BooleanField(default=False)
+    assignment_date = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        pairs = attrs.get('pairs')
+        if attrs['auto_match'] == bool(pairs):
+            raise serializers.ValidationError(
+                _("Fournissez soit 'pairs', soit 'auto_match': true.")
+            )
+        if pairs and len(pairs) > self.MAX_PAIRS:
+            raise serializers.ValidationError({
+                'pairs': _("Au plus %(max)d paires par requête.") % {'max': self.MAX_PAIRS}
+            })
+        assignment_date = attrs.get('assignment_date')
+        if assignment_date and assignment_date > timezone.now():
+            raise serializers.ValidationError({
+                'assignment_date': _("La date d'attribution ne peut pas être dans le futur.")
+            })
+        return attrs
+
+
 class AvailableInternSerializer(serializers.ModelSerializer):
     """Sérialiseur pour les stagiaires disponibles."""
     
@@ -1,3 +1,218 @@
+import csv
+import os
+import tempfile
+
+import numpy as np
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from openpyxl import Workbook
+
+from user_management.models import Profile, User
+
+from .matching import greedy_pairs, propose_matches
+from .models import Theme
+from .Services.AssignmentService import ThemeAssignmentService
+from .Services.ExportService import ThemeExportService
+from .Services.ImportService import ThemeImportService
+
+
+def create_intern(email, filiere='', domain_study='', is_active=True):
+    intern = User.objects.create_user(email, 'pw', role='intern', is_active=is_active)
+    Profile.objects.filter(user=intern).update(filiere=filiere, domain_study=domain_study)
+    return intern
+
+
+class MatchingTests(TestCase):
+
+    def test_zero_scores_are_never_paired(self):
+        scores = np.array([[0.8, 0.0], [0.0, 0.0]], dtype=np.float32)
+
+        self.assertEqual(greedy_pairs(scores), [(0, 0, scores[0, 0].item())])
+
+    def test_pairs_follow_shared_words(self):
+        data = create_intern('data@example.com', 'Informatique', 'Science des données')
+        reseau = create_intern('reseau@example.com', 'Télécoms', 'Réseaux informatiques')
+        theme_data = Theme.objects.create(title='Tableau de bord', description='Science des données clients')
+        theme_reseau = Theme.objects.create(title='Supervision', description='Réseaux informatiques du siège')
+
+        pairs = {(p['theme_id'], p['intern_id']) for p in propose_matches()}
+
+        self.assertEqual(pairs, {(theme_data.pk, data.pk), (theme_reseau.pk, reseau.pk)})
+
+    def test_interns_without_common_words_are_left_out(self):
+        create_intern('droit@example.com', 'Droit', 'Droit des affaires')
+        Theme.objects.create(title='Supervision', description='Réseaux informatiques du siège')
+
+        self.assertEqual(propose_matches(), [])
+
+    def test_only_available_interns_are_proposed(self):
+        create_intern('inactive@example.com', 'Informatique', 'Réseaux informatiques', is_active=False)
+        Theme.objects.create(title='Supervision', description='Réseaux informatiques du siège')
+
+        self.assertEqual(propose_matches(), [])
+
+
+class ThemeAssignmentTests(TestCase):
+
+    def setUp(self):
+        self.intern = create_intern('intern@example.com')
+        self.theme = Theme.objects.create(title='Thème', description='Description')
+
+    def test_assign_then_unassign(self):
+        ThemeAssignmentService.assign(self.theme, self.intern.pk)
+
+        self.intern.refresh_from_db()
+        self.theme.refresh_from_db()
+        self.assertEqual(self.intern.assigned_theme_id, self.theme.pk)
+        self.assertEqual(self.theme.status, Theme.Status.ASSIGNED)
+        self.assertIsNotNone(self.theme.assignment_date)
+
+        ThemeAssignmentService.unassign(self.theme.pk)
+
+        self.intern.refresh_from_db()
+        self.theme.refresh_from_db()
+        self.assertIsNone(self.intern.assigned_theme_id)
+        self.assertEqual(self.theme.status, Theme.Status.NOT_ASSIGNED)
+        self.assertIsNone(self.theme.assignment_date)
+
+    def test_assigned_theme_cannot_be_assigned_again(self):
+        ThemeAssignmentService.assign(self.theme, self.intern.pk)
+        other = create_intern('other@example.com')
+
+        with self.assertRaises(ValidationError):
+            ThemeAssignmentService.assign(self.theme, other.pk)
+        other.refresh_from_db()
+        self.assertIsNone(other.assigned_theme_id)
+
+    def test_intern_with_a_theme_cannot_take_another(self):
+        ThemeAssignmentService.assign(self.theme, self.intern.pk)
+        second = Theme.objects.create(title='Autre', description='Description')
+
+        with self.assertRaises(ValidationError):
+            ThemeAssignmentService.assign(second, self.intern.pk)
+        second.refresh_from_db()
+        self.assertEqual(second.status, Theme.Status.NOT_ASSIGNED)
+
+    def test_unknown_theme_or_intern(self):
+        with self.assertRaises(ValidationError) as ctx:
+            ThemeAssignmentService.assign(0, self.intern.pk)
+        self.assertEqual(ctx.exception.code, 'not_found')
+
+        with self.assertRaises(ValidationError) as ctx:
+            ThemeAssignmentService.assign(self.theme, 0)
+        self.assertEqual(ctx.exception.code, 'not_found')
+
+    def test_unassign_requires_an_assigned_theme(self):
+        with self.assertRaises(ValidationError):
+            ThemeAssignmentService.unassign(self.theme)
+
+    def test_bulk_assign_rejects_conflicts(self):
+        second_intern = create_intern('second@example.com')
+        inactive = create_intern('inactive@example.com', is_active=False)
+        second_theme = Theme.objects.create(title='Deuxième', description='Description')
+        third_theme = Theme.objects.create(title='Troisième', description='Description')
+        taken_theme = Theme.objects.create(title='Pris', description='Description')
+        ThemeAssignmentService.assign(taken_theme, second_intern.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            outcome = ThemeAssignmentService.bulk_assign([
+                (self.theme.pk, self.intern.pk),
+                (second_theme.pk, self.intern.pk),      # stagiaire en double
+                (second_theme.pk, second_intern.pk),    # stagiaire déjà pourvu
+                (third_theme.pk, inactive.pk),          # stagiaire inactif
+                (taken_theme.pk, 0),                    # thème déjà attribué
+            ])
+
+        self.assertEqual(outcome['assigned'], 1)
+        self.assertEqual(outcome['rejected'], 4)
+        self.assertEqual(
+            [result['status'] for result in outcome['results']],
+            ['assigned', 'rejected', 'rejected', 'rejected', 'rejected'],
+        )
+        self.intern.refresh_from_db()
+        self.assertEqual(self.intern.assigned_theme_id, self.theme.pk)
+        second_theme.refresh_from_db()
+        self.assertEqual(second_theme.status, Theme.Status.NOT_ASSIGNED)
+        third_theme.refresh_from_db()
+        self.assertEqual(third_theme.status, Theme.Status.NOT_ASSIGNED)
+
+
+class ThemeImportExportTests(TestCase):
+
+    def write(self, content, suffix='.csv'):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def import_csv(self, content, chunk_size=None):
+        return ThemeImportService(chunk_size=chunk_size).import_file(self.write(content))
+
+    def test_blank_lines_keep_line_numbers(self):
+        results = self.import_csv('title,description\nA,desc\n\n,missing\n')
+
+        self.assertEqual(results['success'], 1)
+        self.assertEqual(results['errors'], [{'line': 4, 'error': 'Titre manquant', 'title': ''}])
+
+    def test_blank_rows_match_between_csv_and_excel(self):
+        workbook = Workbook()
+        for row in (['title', 'description'], ['A', 'desc'], [None, None], [None, 'missing']):
+            workbook.active.append(row)
+        handle, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        workbook.save(path)
+
+        results = ThemeImportService().import_file(path, file_format='excel')
+
+        self.assertEqual([error['line'] for error in results['errors']], [4])
+
+    def test_duplicate_titles_in_file_and_database(self):
+        Theme.objects.create(title='Existant', description='Description')
+
+        results = self.import_csv(
+            'title,description\nNouveau,desc\nNouveau,autre\nExistant,desc\n', chunk_size=2
+        )
+
+        self.assertEqual(results['success'], 1)
+        self.assertEqual(
+            [(error['line'], error['error']) for error in results['errors']],
+            [(3, 'Titre dupliqué dans le fichier'), (4, 'Titre déjà existant dans la base')],
+        )
+        self.assertEqual(Theme.objects.filter(title='Nouveau').count(), 1)
+
+    def test_is_active_values(self):
+        results = self.import_csv('title,description,is_active\nA,desc,non\nB,desc,oui\nC,desc,peut-être\n')
+
+        self.assertEqual(results['success'], 2)
+        self.assertFalse(Theme.objects.get(title='A').is_active)
+        self.assertTrue(Theme.objects.get(title='B').is_active)
+        self.assertEqual(results['errors'][0]['line'], 4)
+        self.assertIn('is_active', results['errors'][0]['error'])
+
+    def test_french_header_aliases(self):
+        results = self.import_csv('Titre,Description,Actif\nA,desc,0\n')
+
+        self.assertEqual(results['success'], 1)
+        self.assertFalse(Theme.objects.get(title='A').is_active)
+
+    def test_missing_required_column(self):
+        with self.assertRaises(ValueError):
+            self.import_csv('title,actif\nA,1\n')
+
+    def test_csv_export_streams_rows(self):
+        intern = create_intern('intern@example.com')
+        theme = Theme.objects.create(title='Thème, avec virgule', description='Description')
+        ThemeAssignmentService.assign(theme, intern.pk)
+        Theme.objects.create(title='Inactif', description='Description', is_active=False)
+
+        stream = ThemeExportService.stream_csv(ThemeExportService.build_queryset({'is_active': 'true'}))
+        header = next(stream)
+        rows = list(csv.reader(''.join(stream).splitlines()))
 
-# Create your tests here.
+        self.assertTrue(header.startswith('\ufeffid,title,description'))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][1], 'Thème, avec virgule')
+        self.assertEqual(rows[0][4], 'Yes')
+        self.assertEqual(rows[0][7], 'intern@example.com')
@@ -1,36 +1,150 @@
 """
 Vues API pour la gestion des thèmes de stage avec DRF.
 """
+import base64
+import binascii
+import os
+import tempfile
+from functools import partial
+
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
 from django.db import transaction
 from django.db.models import Count, Q
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 from django.shortcuts import get_object_or_404
+from rest_framework.utils.urls import replace_query_param
 from . import permissions
 
 from .models import Theme
+from .Services.AssignmentService import ThemeAssignmentService
+from .Services.ExportService import ThemeExportService
+from .Services.ImportService import ThemeImportService
+from user_management.permissions import Permission
 from user_management.models import User
 from .serializers import (
-    ThemeSerializer, ThemeCreateSerializer, ThemeAssignmentSerializer, AvailableInternSerializer, ThemeStatsSerializer
+    ThemeSerializer, ThemeCreateSerializer, ThemeAssignmentSerializer, AvailableInternSerializer, ThemeStatsSerializer,
+    ThemeBulkAssignmentSerializer
 )
+from .cache import get_available_interns_count
+from .matching import propose_matches
+
+def _assignment_error(error):
+    """Réponse d'erreur du service d'attribution (404 pour un objet introuvable)."""
+    not_found = error.error_list[0].code == 'not_found'
+    return Response(
+        {"detail": error.messages[0]},
+        status=status.HTTP_404_NOT_FOUND if not_found else status.HTTP_400_BAD_REQUEST
+    )
+
+
+class ThemeKeysetPagination(BasePagination):
+    """
+    Pagination par clé sur (created_date, id), du plus récent au plus ancien.
+    Le curseur encode le dernier élément de la page : le coût d'une page ne
+    dépend pas de sa position, contrairement à OFFSET.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    ordering = ('-created_date', '-id')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, theme):
+        raw = f"{theme.created_date.isoformat()}|{theme.pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created, pk = base64.urlsafe_b64decode(encoded.encode()).decode().split('|')
+            created_date = parse_datetime(created)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            created_date = None
+        if created_date is None:
+            raise NotFound("Curseur invalide.")
+        return created_date, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            created_date, pk = cursor
+            queryset = queryset.filter(
+                Q(created_date__lt=created_date) | Q(created_date=created_date, id__lt=pk)
+            )
+
+        # Un élément de plus pour savoir s'il existe une page suivante
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+        self.next_cursor = self.encode_cursor(results[-1]) if self.has_next else None
+        return results
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
 
 class ThemeViewSet(viewsets.ModelViewSet):
     queryset = Theme.objects.all()
     serializer_class = ThemeSerializer
-    permission_classes = permissions.ThemeAccessPermission
+    permission_classes = [permissions.ThemeAccessPermission]
+    pagination_class = ThemeKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
         if user.role in ['admin', 'supervisor']:
-            return Theme.objects.all()
+            return Theme.objects.with_assignment()
         # Les stagiaires ne voient que leur thème (via my-theme/)
         return Theme.objects.none()
 
+    def _paginated(self, queryset):
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     # Mon thème (pour les stagiaires)
     # Dans ThemeViewSet
     @action(detail=False, methods=['get'], url_path='my-theme')
@@ -45,7 +159,7 @@ class ThemeViewSet(viewsets.ModelViewSet):
         if not hasattr(request.user, 'assigned_theme') or request.user.assigned_theme is None:
             return Response(
                 {"detail": "Aucun thème attribué."},
-                status=status.HTTP_NOT_FOUND
+                status=status.HTTP_404_NOT_FOUND
             )
         
         serializer = self.get_serializer(request.user.assigned_theme)
@@ -54,27 +168,17 @@ class ThemeViewSet(viewsets.ModelViewSet):
     # Thèmes disponibles
     @action(detail=False, methods=['get'])
     def available(self, request):
-        themes = Theme.objects.available()  # grâce au manager
-        serializer = self.get_serializer(themes, many=True)
-        return Response(serializer.data)
+        themes = Theme.objects.with_assignment().available()  # grâce au manager
+        return self._paginated(themes)
 
     # Thèmes attribués
     @action(detail=False, methods=['get'])
     def assigned(self, request):
-        themes = Theme.objects.assigned()
-        serializer = self.get_serializer(themes, many=True)
-        return Response(serializer.data)
+        return self._paginated(Theme.objects.with_assignment().assigned())
 
     # Attribution d’un thème
     @action(detail=True, methods=['post'], url_path='assign')
     def assign(self, request, pk=None):
-        theme = self.get_object()
-        if not theme.is_assignable:
-            return Response(
-                {"detail": "Ce thème n'est pas attribuable."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
         intern_id = request.data.get('intern_id')
         if not intern_id:
             return Response(
@@ -82,51 +186,168 @@ class ThemeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        intern = get_object_or_404(User, id=intern_id, role='intern')
-        
-        if intern.assigned_theme is not None:
-            return Response(
-                {"detail": "Ce stagiaire a déjà un thème."},
-                status=status.HTTP_400_BAD_REQUEST
+        # Les contrôles (thème attribuable, stagiaire libre) sont faits par le
+        # service sous verrou de la ligne du thème
+        try:
+            ThemeAssignmentService.assign(self.get_object(), intern_id)
+        except ValidationError as e:
+            return _assignment_error(e)
+        return Response({"detail": "Thème attribué avec succès."})
+
+    # Attribution en masse (paires explicites ou appariement automatique)
+    @action(detail=False, methods=['post'], url_path='bulk-assign')
+    def bulk_assign(self, request):
+        serializer = ThemeBulkAssignmentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if data['auto_match']:
+            proposals = propose_matches(
+                theme_ids=data.get('theme_ids'),
+                intern_ids=data.get('intern_ids'),
+                min_score=data['min_score'],
             )
+            if data['dry_run']:
+                return Response({'proposals': proposals})
+            pairs = [(p['theme_id'], p['intern_id']) for p in proposals]
+        else:
+            proposals = None
+            pairs = [(p['theme_id'], p['intern_id']) for p in data['pairs']]
 
-        theme.assign_to_intern(intern)
-        return Response({"detail": "Thème attribué avec succès."})
+        outcome = ThemeAssignmentService.bulk_assign(pairs, data.get('assignment_date'))
+        if proposals is not None:
+            for result, proposal in zip(outcome['results'], proposals):
+                result['score'] = proposal['score']
+        return Response(outcome)
+
+    # Import en masse (CSV ou Excel)
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_themes(self, request):
+        if Permission.CREATE_THEMES not in request.user.get_permissions():
+            return Response({'detail': 'Permission refusée.'}, status=status.HTTP_403_FORBIDDEN)
+
+        file = request.FILES.get('file')
+        if not file:
+            return Response({'detail': "Aucun fichier fourni."}, status=status.HTTP_400_BAD_REQUEST)
+        name = file.name.lower()
+        if name.endswith('.csv'):
+            file_format = 'csv'
+        elif name.endswith('.xlsx'):
+            file_format = 'excel'
+        else:
+            return Response({'detail': "Format de fichier non supporté. Utilisez CSV ou Excel (.xlsx)."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Copie par blocs dans un fichier temporaire, lu ensuite par blocs
+        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(name)[1]) as temp_file:
+            for chunk in file.chunks():
+                temp_file.write(chunk)
+            temp_file_path = temp_file.name
+        try:
+            results = ThemeImportService().import_file(temp_file_path, request.user, file_format)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            os.remove(temp_file_path)
+
+        response_data = {
+            'created_count': results['success'],
+            'skipped': results['skipped'],
+            'errors': results['errors'],
+        }
+        if results['success'] > 0:
+            return Response(response_data, status=status.HTTP_201_CREATED)
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    # Export (CSV en flux, ou Excel) ; `file_format` car `format` est réservé par DRF
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        if Permission.EXPORT_THEMES not in request.user.get_permissions():
+            return Response({'detail': 'Permission refusée.'}, status=status.HTTP_403_FORBIDDEN)
+
+        queryset = ThemeExportService.build_queryset({
+            'status': request.query_params.get('status'),
+            'is_active': request.query_params.get('is_active'),
+            'search': request.query_params.get('search'),
+        })
+        filename = f"themes_export_{timezone.now().strftime('%Y%m%d_%H%M%S')}"
+
+        if request.query_params.get('file_format', 'csv').lower() in ('excel', 'xlsx'):
+            return FileResponse(
+                ThemeExportService.export_to_excel(queryset),
+                as_attachment=True,
+                filename=f"{filename}.xlsx",
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            )
+
+        response = StreamingHttpResponse(ThemeExportService.stream_csv(queryset), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+        return response
 
     # Désattribution
     @action(detail=True, methods=['post'], url_path='unassign')
     def unassign(self, request, pk=None):
-        theme = self.get_object()
-        if not theme.assigned_to:
-            return Response(
-                {"detail": "Ce thème n'est pas attribué."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        theme.unassign()
+        try:
+            ThemeAssignmentService.unassign(self.get_object())
+        except ValidationError as e:
+            return _assignment_error(e)
         return Response({"detail": "Thème désattribué."})
 
+class AvailableInternPaginator(Paginator):
+    """Paginator acceptant un total déjà connu (compteur en cache) à la place du COUNT."""
+
+    def __init__(self, *args, known_count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.known_count = known_count
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        return super().count
+
+
+class AvailableInternPagination(PageNumberPagination):
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    known_count = None
+
+    @property
+    def django_paginator_class(self):
+        return partial(AvailableInternPaginator, known_count=self.known_count)
+
+
 class AvailableInternViewSet( viewsets.ModelViewSet):
     """
     ViewSet pour les stagiaires disponibles (sans thème attribué).
+    Liste paginée et filtrable (?search=) ; sans recherche, le total provient
+    du compteur en cache.
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
     serializer_class = AvailableInternSerializer
-    
+    pagination_class = AvailableInternPagination
+    filter_backends = [SearchFilter]
+    search_fields = ['first_name', 'last_name', 'email', 'profile__filiere', 'profile__domain_study']
+
     def get_queryset(self):
-        """Retourne les stagiaires sans thème attribué."""
-        return User.objects.filter(
-            role='intern',
-            is_active=True
-        ).exclude(
-            assigned_theme__isnull=False
-        ).select_related('profile')
-    
-    @action(detail=False, methods=['get'])
+        """Retourne les stagiaires sans thème attribué (index partiel user_available_intern_idx)."""
+        return User.objects.available_interns().select_related('profile').order_by('id')
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not request.query_params.get(SearchFilter.search_param):
+            self.paginator.known_count = get_available_interns_count()
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path=r'for_theme/(?P<theme_id>\d+)')
     def for_theme(self, request, theme_id=None):
         """
         Stagiaires disponibles pour un thème spécifique.
         """
-        theme = get_object_or_404(Theme, pk=theme_id)
+        theme = get_object_or_404(Theme.objects.only('id', 'status', 'is_active'), pk=theme_id)
         
         if not theme.is_assignable:
             return Response(
@@ -134,7 +355,4 @@ class AvailableInternViewSet( viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        interns = self.get_queryset()
-        serializer = self.get_serializer(interns, many=True)
-        
-        return Response(serializer.data)
\ No newline at end of file
+        return self.list(request)
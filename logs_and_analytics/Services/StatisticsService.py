@@ -0,0 +1,128 @@
+# logs_and_analytics/Services/StatisticsService.py
+"""Indicateurs du tableau de bord calculés par la base.
+
+Chaque bloc (thèmes, sessions, projets, utilisateurs) est une seule requête
+d'agrégation avec des COUNT filtrés ; la progression moyenne des projets est
+calculée ligne par ligne en SQL (Case/When et arithmétique de dates) puis
+moyennée par AVG. Le coût ne dépend pas du volume des tables, et le résultat
+est conservé quelques instants en cache."""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (Avg, Case, Count, DateField, DurationField, ExpressionWrapper, F,
+                              FloatField, Func, Q, Value, When)
+from django.utils import timezone
+
+from internship_management.models import Theme
+from project_management.models import Projet
+from training_management.models import FormationSession
+from user_management.models import User
+
+logger = logging.getLogger(__name__)
+
+STATISTICS_CACHE_KEY = 'analytics:statistics'
+
+
+class DurationSeconds(Func):
+    """Durée (intervalle) convertie en secondes, PostgreSQL et SQLite."""
+    template = 'EXTRACT(EPOCH FROM %(expressions)s)'
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite représente les durées en microsecondes
+        return self.as_sql(compiler, connection, template='(%(expressions)s / 1000000.0)', **extra_context)
+
+
+def _days_between(start, end):
+    return DurationSeconds(ExpressionWrapper(end - start, output_field=DurationField()))
+
+
+def project_progress(today):
+    """
+    Progression d'un projet en pourcentage : 100 si terminé ou échu, 0 s'il
+    n'a pas commencé, sinon la part écoulée de la période date_debut → date_fin.
+    """
+    today = Value(today, output_field=DateField())
+    return Case(
+        When(statut='termine', then=Value(100.0)),
+        When(date_fin__lte=today, then=Value(100.0)),
+        When(date_debut__gt=today, then=Value(0.0)),
+        # Ici date_debut <= aujourd'hui < date_fin : la durée est non nulle
+        default=100.0 * _days_between(F('date_debut'), today) / _days_between(F('date_debut'), F('date_fin')),
+        output_field=FloatField(),
+    )
+
+
+class StatisticsService:
+    """Service dédié au calcul des indicateurs globaux."""
+
+    @staticmethod
+    def theme_stats():
+        return Theme.objects.aggregate(
+            total=Count('id'),
+            assigned=Count('id', filter=Q(status=Theme.Status.ASSIGNED)),
+            available=Count('id', filter=Q(status=Theme.Status.NOT_ASSIGNED, is_active=True)),
+            active=Count('id', filter=Q(is_active=True)),
+        )
+
+    @staticmethod
+    def session_stats(now):
+        # La date de fin fait foi : le statut n'est resynchronisé que périodiquement.
+        # Une session commencée sans date de fin est en cours.
+        return FormationSession.objects.aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(date_fin__lt=now)),
+            in_progress=Count(
+                'id', filter=Q(date_debut__lte=now) & (Q(date_fin__gte=now) | Q(date_fin__isnull=True))
+            ),
+            planned=Count('id', filter=Q(date_debut__gt=now)),
+        )
+
+    @staticmethod
+    def project_stats(today):
+        dated = Q(statut='termine') | Q(date_debut__isnull=False, date_fin__isnull=False)
+        return Projet.objects.aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(statut='en_attente')),
+            in_progress=Count('id', filter=Q(statut='en_cours')),
+            completed=Count('id', filter=Q(statut='termine')),
+            average_progress=Avg(project_progress(today), filter=dated),
+        )
+
+    @staticmethod
+    def user_stats():
+        return User.active_objects.aggregate(
+            total=Count('id'),
+            interns=Count('id', filter=Q(role='intern')),
+            supervisors=Count('id', filter=Q(role='supervisor')),
+            admins=Count('id', filter=Q(role='admin')),
+        )
+
+    @classmethod
+    def compute(cls, now=None):
+        now = now or timezone.now()
+        themes = cls.theme_stats()
+        sessions = cls.session_stats(now)
+        projects = cls.project_stats(timezone.localdate(now))
+        users = cls.user_stats()
+
+        projects['average_progress'] = round(projects['average_progress'] or 0, 2)
+        themes['assigned_ratio'] = round(themes['assigned'] / themes['total'], 4) if themes['total'] else 0
+        return {
+            'themes': themes,
+            'sessions': sessions,
+            'projects': projects,
+            'users': users,
+            'generated_at': now.isoformat(),
+        }
+
+    @classmethod
+    def get_statistics(cls):
+        """Indicateurs en cache (STATISTICS_CACHE_TIMEOUT secondes)."""
+        data = cache.get(STATISTICS_CACHE_KEY)
+        if data is None:
+            data = cls.compute()
+            cache.set(STATISTICS_CACHE_KEY, data, getattr(settings, 'STATISTICS_CACHE_TIMEOUT', 60))
+        return data
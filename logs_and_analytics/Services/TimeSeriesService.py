@@ -0,0 +1,209 @@
+# logs_and_analytics/Services/TimeSeriesService.py
+"""Séries temporelles du tableau de bord, lues dans les agrégats MetricRollup.
+
+Une série est lue en une requête (quelques centaines de lignes au plus),
+pivotée par dimension puis rééchantillonnée par pandas sur des périodes de
+largeur fixe, choisies pour ne pas dépasser le nombre de points demandé : une
+année de connexions horaires se résume à ~200 points, soit quelques Ko.
+
+La réponse est en colonnes (horodatages d'un côté, une liste de valeurs par
+dimension de l'autre), ou au format Arrow si pyarrow est installé."""
+
+import io
+import logging
+import math
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from django.utils import timezone
+
+from logs_and_analytics.models import MetricRollup
+from logs_and_analytics.rollups import SOURCES, SnapshotSource, day_start
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POINTS = 200
+MAX_POINTS = 2000
+DEFAULT_RANGE = timedelta(days=30)
+MAX_RANGE = timedelta(days=366 * 5)
+
+# Largeurs de période proposées, de la plus fine à la plus large
+INTERVALS = {
+    'hour': pd.Timedelta(hours=1),
+    '3h': pd.Timedelta(hours=3),
+    '6h': pd.Timedelta(hours=6),
+    '12h': pd.Timedelta(hours=12),
+    'day': pd.Timedelta(days=1),
+    '2d': pd.Timedelta(days=2),
+    'week': pd.Timedelta(weeks=1),
+    '2w': pd.Timedelta(weeks=2),
+    'month': pd.Timedelta(days=30),
+    'quarter': pd.Timedelta(days=91),
+}
+
+# Niveaux (et non flux) : moyenne sur la période au lieu de la somme
+MEAN_METRICS = {'sessions.active', 'auth.active_users'}
+
+# Métriques disposant aussi d'agrégats horaires
+HOURLY_METRICS = {'auth.logins'}
+
+# Nom de colonne des métriques sans dimension
+VALUE_COLUMN = 'value'
+
+
+class TimeSeriesError(Exception):
+    """Paramètres de série invalides ; `status_code` est le code HTTP à renvoyer."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def available_metrics():
+    """Métrique -> agrégation appliquée au rééchantillonnage (sum, mean ou last)."""
+    metrics = {}
+    for source in SOURCES:
+        for metric in source.metrics:
+            if issubclass(source, SnapshotSource):
+                metrics[metric] = 'last'
+            else:
+                metrics[metric] = 'mean' if metric in MEAN_METRICS else 'sum'
+    return metrics
+
+
+class TimeSeriesService:
+
+    @staticmethod
+    def choose_interval(start, end, points, requested=None):
+        """
+        Plus petite largeur donnant au plus `points` périodes, ou celle demandée
+        si elle ne dépasse pas MAX_POINTS périodes.
+        """
+        span = pd.Timestamp(end) - pd.Timestamp(start)
+        if requested:
+            if requested not in INTERVALS:
+                raise TimeSeriesError(f"interval invalide. Utilisez: {', '.join(INTERVALS)}")
+            if math.ceil(span / INTERVALS[requested]) > MAX_POINTS:
+                raise TimeSeriesError(
+                    f"interval trop fin pour cette période (plus de {MAX_POINTS} points)."
+                )
+            return requested
+        for name, width in INTERVALS.items():
+            if math.ceil(span / width) <= points:
+                return name
+        return 'quarter'
+
+    @classmethod
+    def get_series(cls, metric, start, end, points=DEFAULT_POINTS, interval=None, dimensions=None):
+        """
+        Série rééchantillonnée de `metric` sur [start, end[.
+        :return: dict {'index': DatetimeIndex, 'columns': {dimension: ndarray}, ...}
+        """
+        metrics = available_metrics()
+        if metric not in metrics:
+            raise TimeSeriesError(f"metric invalide. Utilisez: {', '.join(sorted(metrics))}")
+        if end <= start:
+            raise TimeSeriesError("end doit être postérieur à start.")
+        if end - start > MAX_RANGE:
+            raise TimeSeriesError(f"Période limitée à {MAX_RANGE.days} jours.")
+        points = max(1, min(points, MAX_POINTS))
+
+        name = cls.choose_interval(start, end, points, interval)
+        width = INTERVALS[name]
+        # Les agrégats horaires ne sont lus que si la période le demande
+        if width < INTERVALS['day'] and metric not in HOURLY_METRICS:
+            name, width = 'day', INTERVALS['day']
+        granularity = MetricRollup.Granularity.HOUR if width < INTERVALS['day'] else MetricRollup.Granularity.DAY
+        # La première période commence à la borne de l'agrégat qui contient `start`
+        start = cls.floor(start, granularity)
+
+        queryset = MetricRollup.objects.series(metric, start, end, granularity)
+        if dimensions:
+            queryset = queryset.filter(dimension__in=dimensions)
+        rows = list(queryset.values_list('bucket', 'dimension', 'value'))
+
+        aggregation = metrics[metric]
+        frame = cls._resample(rows, start, end, width, granularity, aggregation)
+        return {
+            'metric': metric,
+            'interval': name,
+            'granularity': granularity,
+            'aggregation': aggregation,
+            'index': frame.index,
+            'columns': {column: frame[column].to_numpy() for column in frame.columns},
+        }
+
+    @staticmethod
+    def floor(moment, granularity):
+        """Début de l'heure ou du jour (fuseau courant) contenant `moment`."""
+        moment = timezone.localtime(moment)
+        if granularity == MetricRollup.Granularity.HOUR:
+            return moment.replace(minute=0, second=0, microsecond=0)
+        return day_start(moment.date())
+
+    @staticmethod
+    def _resample(rows, start, end, width, granularity, aggregation):
+        """Pivot dimension x période puis agrégation sur des périodes de largeur `width`."""
+        step = pd.Timedelta(hours=1) if granularity == MetricRollup.Granularity.HOUR else pd.Timedelta(days=1)
+        origin = pd.Timestamp(start)
+        index = pd.date_range(origin, pd.Timestamp(end), freq=step, inclusive='left')
+
+        if rows:
+            raw = pd.DataFrame(rows, columns=['bucket', 'dimension', 'value'])
+            raw['dimension'] = raw['dimension'].replace('', VALUE_COLUMN)
+            frame = raw.pivot_table(index='bucket', columns='dimension', values='value', aggfunc='sum')
+            frame.index = pd.DatetimeIndex(frame.index).tz_convert(origin.tz)
+        else:
+            frame = pd.DataFrame(columns=[VALUE_COLUMN], dtype=float)
+            frame.index = pd.DatetimeIndex([], tz=origin.tz)
+
+        # Flux : une période absente vaut 0. Instantanés : valeur inconnue (NaN).
+        frame = frame.reindex(index)
+        if aggregation != 'last':
+            frame = frame.fillna(0)
+
+        resampled = frame.resample(width, origin=origin, label='left', closed='left')
+        if aggregation == 'sum':
+            return resampled.sum()
+        if aggregation == 'mean':
+            return resampled.mean()
+        return resampled.last()
+
+    @staticmethod
+    def to_columnar(series):
+        """Charge utile JSON en colonnes ; horodatages en secondes epoch, lacunes à null."""
+        columns = {}
+        for name, values in series['columns'].items():
+            if series['aggregation'] == 'sum':
+                columns[name] = values.astype(np.int64).tolist()
+            else:
+                rounded = np.round(values.astype(float), 3)
+                columns[name] = [None if math.isnan(value) else value for value in rounded.tolist()]
+        return {
+            'metric': series['metric'],
+            'interval': series['interval'],
+            'aggregation': series['aggregation'],
+            'timestamps': series['index'].as_unit('s').asi8.tolist(),
+            'columns': columns,
+        }
+
+    @staticmethod
+    def to_arrow(series):
+        """Flux IPC Arrow (une colonne `timestamp` puis une par dimension)."""
+        import pyarrow as pa
+
+        arrays = {'timestamp': pa.array(series['index'].as_unit('s').asi8, type=pa.int64())}
+        for name, values in series['columns'].items():
+            arrays[name] = pa.array(values, from_pandas=True)
+        table = pa.table(arrays)
+        table = table.replace_schema_metadata({
+            'metric': series['metric'],
+            'interval': series['interval'],
+            'aggregation': series['aggregation'],
+        })
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
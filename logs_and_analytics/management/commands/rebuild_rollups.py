@@ -0,0 +1,39 @@
+# logs_and_analytics/management/commands/rebuild_rollups.py
+"""
+Recalcule les agrégats du tableau de bord sur une période, par exemple après
+une correction de données antidatée ou lors de la mise en service :
+
+    python manage.py rebuild_rollups --start 2025-01-01 --end 2025-06-30
+    python manage.py rebuild_rollups --days 30
+
+Sans option, effectue le même passage incrémental que la tâche nocturne.
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from logs_and_analytics.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalcule les agrégats quotidiens du tableau de bord"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help="Premier jour (AAAA-MM-JJ)")
+        parser.add_argument('--end', type=date.fromisoformat, help="Dernier jour inclus (aujourd'hui par défaut)")
+        parser.add_argument('--days', type=int, help="Recalcule les N derniers jours")
+
+    def handle(self, *args, **options):
+        start, end = options['start'], options['end']
+        if options['days']:
+            start = timezone.localdate() - timedelta(days=options['days'] - 1)
+        if end and not start:
+            raise CommandError("--end nécessite --start")
+        if start and end and end < start:
+            raise CommandError("--end doit être postérieur à --start")
+
+        run = refresh_rollups(start=start, end=end)
+        for name, detail in run.details.items():
+            self.stdout.write(f"{name}: {detail['days']} jours, {detail['rows']} lignes")
+        self.stdout.write(self.style.SUCCESS("Agrégats recalculés"))
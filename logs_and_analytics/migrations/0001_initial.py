@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50, verbose_name='métrique')),
+                ('dimension', models.CharField(blank=True, default='', max_length=50, verbose_name='dimension')),
+                ('granularity', models.CharField(choices=[('hour', 'Heure'), ('day', 'Jour')], default='day', max_length=10, verbose_name='granularité')),
+                ('bucket', models.DateTimeField(verbose_name='début de période')),
+                ('value', models.BigIntegerField(default=0, verbose_name='valeur')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='mis à jour le')),
+            ],
+            options={
+                'verbose_name': 'agrégat de métrique',
+                'verbose_name_plural': 'agrégats de métriques',
+                'indexes': [models.Index(fields=['metric', 'granularity', 'bucket'], name='metric_rollup_series_idx')],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'granularity', 'dimension', 'bucket'), name='metric_rollup_unique_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='début')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='fin')),
+                ('status', models.CharField(choices=[('running', 'En cours'), ('success', 'Réussi'), ('failed', 'Échec')], default='running', max_length=10, verbose_name='statut')),
+                ('range_start', models.DateField(blank=True, null=True, verbose_name='début de la reconstruction')),
+                ('range_end', models.DateField(blank=True, null=True, verbose_name='fin de la reconstruction')),
+                ('details', models.JSONField(blank=True, default=dict, verbose_name='détails')),
+            ],
+            options={
+                'verbose_name': 'calcul des agrégats',
+                'verbose_name_plural': 'calculs des agrégats',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['status', '-started_at'], name='logs_and_an_status_de55de_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs_and_analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, verbose_name='source')),
+                ('day', models.DateField(verbose_name='jour')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='noté le')),
+            ],
+            options={
+                'verbose_name': 'jour à recalculer',
+                'verbose_name_plural': 'jours à recalculer',
+                'indexes': [models.Index(fields=['source'], name='logs_and_an_source_e1c06a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,219 @@
+# logs_and_analytics/models.py
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class MetricRollupQuerySet(models.QuerySet):
+    def series(self, metric, start, end, granularity='day'):
+        """Points d'une métrique sur [start, end[, dans l'ordre chronologique."""
+        return self.filter(
+            metric=metric,
+            granularity=granularity,
+            bucket__gte=start,
+            bucket__lt=end,
+        ).order_by('bucket', 'dimension')
+
+
+class MetricRollup(models.Model):
+    """
+    Agrégat pré-calculé d'une métrique sur une période (jour ou heure).
+    Alimenté par logs_and_analytics/rollups.py ; les tableaux de bord lisent
+    ces lignes au lieu de parcourir l'historique des tables sources.
+    """
+
+    class Granularity(models.TextChoices):
+        HOUR = 'hour', _('Heure')
+        DAY = 'day', _('Jour')
+
+    metric = models.CharField(_('métrique'), max_length=50)
+    dimension = models.CharField(_('dimension'), max_length=50, blank=True, default='')
+    granularity = models.CharField(
+        _('granularité'), max_length=10, choices=Granularity.choices, default=Granularity.DAY
+    )
+    bucket = models.DateTimeField(_('début de période'))
+    value = models.BigIntegerField(_('valeur'), default=0)
+    updated_at = models.DateTimeField(_('mis à jour le'), auto_now=True)
+
+    objects = MetricRollupQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _('agrégat de métrique')
+        verbose_name_plural = _('agrégats de métriques')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['metric', 'granularity', 'dimension', 'bucket'],
+                name='metric_rollup_unique_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['metric', 'granularity', 'bucket'], name='metric_rollup_series_idx'),
+        ]
+
+    def __str__(self):
+        suffix = f"[{self.dimension}]" if self.dimension else ''
+        return f"{self.metric}{suffix} @ {self.bucket:%Y-%m-%d %H:%M} = {self.value}"
+
+
+class RollupRun(models.Model):
+    """
+    Passage du calcul des agrégats. Le début du dernier passage réussi sert
+    de point de reprise : le suivant ne recalcule que les jours modifiés depuis.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = 'running', _('En cours')
+        SUCCESS = 'success', _('Réussi')
+        FAILED = 'failed', _('Échec')
+
+    started_at = models.DateTimeField(_('début'), default=timezone.now)
+    finished_at = models.DateTimeField(_('fin'), null=True, blank=True)
+    status = models.CharField(_('statut'), max_length=10, choices=Status.choices, default=Status.RUNNING)
+    # Bornes fixées pour une reconstruction manuelle (rebuild_rollups)
+    range_start = models.DateField(_('début de la reconstruction'), null=True, blank=True)
+    range_end = models.DateField(_('fin de la reconstruction'), null=True, blank=True)
+    # Jours recalculés par source
+    details = models.JSONField(_('détails'), default=dict, blank=True)
+
+    class Meta:
+        verbose_name = _('calcul des agrégats')
+        verbose_name_plural = _('calculs des agrégats')
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['status', '-started_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.started_at:%Y-%m-%d %H:%M} ({self.status})"
+
+    @classmethod
+    def watermark(cls):
+        """Début du dernier passage réussi, ou None s'il n'y en a jamais eu."""
+        return (
+            cls.objects.filter(status=cls.Status.SUCCESS)
+            .order_by('-started_at')
+            .values_list('started_at', flat=True)
+            .first()
+        )
+
+
+class RollupDirtyDay(models.Model):
+    """
+    Jour à recalculer pour une source d'agrégats, noté quand une ligne quitte
+    ce jour (date déplacée, thème désattribué, suppression) : l'état courant des
+    tables sources ne permet plus de le retrouver. Consommé par le passage suivant.
+    """
+    source = models.CharField(_('source'), max_length=50)
+    day = models.DateField(_('jour'))
+    created_at = models.DateTimeField(_('noté le'), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('jour à recalculer')
+        verbose_name_plural = _('jours à recalculer')
+        indexes = [
+            models.Index(fields=['source']),
+        ]
+
+    def __str__(self):
+        return f"{self.source} @ {self.day}"
+
+    @classmethod
+    def mark(cls, source, days):
+        """Note les jours donnés (dates) comme à recalculer pour la source."""
+        days = {day for day in days if day is not None}
+        if days:
+            cls.objects.bulk_create([cls(source=source, day=day) for day in days])
+
+
+# Jours quittés par une ligne source (voir RollupDirtyDay). Les nouveaux jours
+# sont retrouvés par les sources (changed_days) ; seul un jour antidaté avant le
+# dernier passage est noté. Les valeurs chargées sont relevées à l'instanciation
+# (post_init) pour ne pas relire la ligne avant chaque sauvegarde.
+from django.db.models.signals import post_init, post_save, pre_save, post_delete
+from django.dispatch import receiver
+
+SESSION_DATE_FIELDS = ('date_debut', 'date_fin')
+
+
+def _loaded_values(instance, fields):
+    """Valeurs chargées de `fields`, ou None si l'un d'eux est différé."""
+    values = tuple(instance.__dict__.get(field, models.DEFERRED) for field in fields)
+    return None if models.DEFERRED in values else values
+
+
+@receiver(post_init, sender='training_management.FormationSession')
+@receiver(post_save, sender='training_management.FormationSession')
+def session_dates_loaded(sender, instance, **kwargs):
+    instance._rollup_dates = _loaded_values(instance, SESSION_DATE_FIELDS)
+
+
+@receiver(pre_save, sender='training_management.FormationSession')
+def session_dates_changing(sender, instance, raw=False, update_fields=None, **kwargs):
+    from .rollups import SessionRollup, session_days
+    if raw or instance.pk is None or instance._state.adding:
+        return
+    if update_fields is not None and not set(SESSION_DATE_FIELDS).intersection(update_fields):
+        return
+    previous = getattr(instance, '_rollup_dates', None)
+    if previous is None:
+        previous = sender.objects.filter(pk=instance.pk).values_list(*SESSION_DATE_FIELDS).first()
+    current = (instance.date_debut, instance.date_fin)
+    if previous is None or previous == current:
+        return
+    # La nouvelle période est retrouvée par updated_at : seuls les jours quittés sont notés
+    RollupDirtyDay.mark(SessionRollup.name, session_days(*previous) - session_days(*current))
+
+
+@receiver(post_init, sender='internship_management.Theme')
+@receiver(post_save, sender='internship_management.Theme')
+def theme_assignment_loaded(sender, instance, **kwargs):
+    instance._rollup_assignment_date = _loaded_values(instance, ('assignment_date',))
+
+
+@receiver(pre_save, sender='internship_management.Theme')
+def theme_assignment_changing(sender, instance, raw=False, update_fields=None, **kwargs):
+    from .rollups import ThemeAssignmentRollup, local_date, missed_by_sources
+    if raw or instance.pk is None or instance._state.adding:
+        return
+    if update_fields is not None and 'assignment_date' not in update_fields:
+        return
+    loaded = getattr(instance, '_rollup_assignment_date', None)
+    if loaded is not None:
+        previous = loaded[0]
+    else:
+        previous = sender.objects.filter(pk=instance.pk).values_list('assignment_date', flat=True).first()
+    current = instance.assignment_date
+    if previous == current:
+        return
+    days = set()
+    if previous is not None:
+        days.add(local_date(previous))
+    if missed_by_sources(current):
+        days.add(local_date(current))
+    RollupDirtyDay.mark(ThemeAssignmentRollup.name, days)
+
+
+@receiver(post_delete, sender='training_management.FormationSession')
+def session_deleted(sender, instance, **kwargs):
+    from .rollups import SessionRollup, session_days
+    RollupDirtyDay.mark(SessionRollup.name, session_days(instance.date_debut, instance.date_fin))
+
+
+@receiver(post_delete, sender='internship_management.Theme')
+def theme_deleted(sender, instance, **kwargs):
+    from .rollups import ThemeAssignmentRollup, local_date
+    if instance.assignment_date is not None:
+        RollupDirtyDay.mark(ThemeAssignmentRollup.name, [local_date(instance.assignment_date)])
+
+
+@receiver(post_delete, sender='project_management.Projet')
+def projet_deleted(sender, instance, **kwargs):
+    from .rollups import ProjectRollup, local_date
+    RollupDirtyDay.mark(ProjectRollup.name, [local_date(instance.date_creation)])
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleted(sender, instance, **kwargs):
+    from .rollups import UserRegistrationRollup, local_date
+    RollupDirtyDay.mark(UserRegistrationRollup.name, [local_date(instance.date_joined)])
@@ -0,0 +1,494 @@
+"""logs_and_analytics/rollups.py
+Agrégats quotidiens (et horaires pour les connexions) matérialisés dans
+MetricRollup, pour que les séries temporelles du tableau de bord lisent
+quelques centaines de lignes au lieu de parcourir l'historique.
+
+Chaque source déclare ses métriques, les jours dont les données ont changé
+depuis le dernier passage et le calcul de ces jours (une requête groupée par
+métrique, sur des intervalles de jours contigus). Le passage remplace les
+agrégats des seuls jours modifiés, source par source, dans une transaction.
+Une période sans ligne vaut 0 : les valeurs nulles ne sont pas stockées.
+
+Un jour quitté par une ligne (date déplacée, thème désattribué, suppression)
+n'apparaît plus dans les tables sources : il est noté dans RollupDirtyDay par
+les signaux de logs_and_analytics/models.py et recalculé au passage suivant.
+
+Les sources « instantanées » (répartition par statut) décrivent l'état courant :
+elles ne s'écrivent que pour le jour du passage et constituent l'historique
+au fil des nuits.
+
+Reconstruction manuelle d'une période : python manage.py rebuild_rollups.
+"""
+import glob
+import json
+import logging
+import os
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Coalesce, TruncDay
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import MetricRollup, RollupDirtyDay, RollupRun
+
+logger = logging.getLogger(__name__)
+
+DAY = MetricRollup.Granularity.DAY
+HOUR = MetricRollup.Granularity.HOUR
+
+# Marqueur cherché avant de décoder une ligne du journal d'audit
+LOGIN_MARKER = '"login_successful"'
+
+
+def get_lookback_days():
+    """Jours récents toujours recalculés (modifications antidatées, suppressions)."""
+    return getattr(settings, 'ROLLUP_LOOKBACK_DAYS', 2)
+
+
+def get_initial_days():
+    """Profondeur d'historique calculée lors du tout premier passage."""
+    return getattr(settings, 'ROLLUP_INITIAL_DAYS', 365)
+
+
+def get_audit_log_path():
+    return getattr(settings, 'AUDIT_LOG_PATH', 'logs/audit.log')
+
+
+def day_start(day):
+    """Minuit (fuseau courant) du jour donné."""
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def local_date(value):
+    return timezone.localtime(value).date()
+
+
+def days_between(first, last):
+    """Jours de `first` à `last` inclus."""
+    return {first + timedelta(days=offset) for offset in range((last - first).days + 1)}
+
+
+def day_ranges(days):
+    """Jours regroupés en intervalles contigus [début, fin[ de datetimes."""
+    ranges = []
+    for day in sorted(days):
+        if ranges and ranges[-1][1] == day:
+            ranges[-1][1] = day + timedelta(days=1)
+        else:
+            ranges.append([day, day + timedelta(days=1)])
+    return [(day_start(first), day_start(end)) for first, end in ranges]
+
+
+def range_filter(field, ranges):
+    condition = Q()
+    for start, end in ranges:
+        condition |= Q(**{f'{field}__gte': start, f'{field}__lt': end})
+    return condition
+
+
+def count_by(queryset, field, ranges, dimension=None, trunc=TruncDay):
+    """(début de période, dimension, effectif) groupés par période de `field`."""
+    values = ['bucket', dimension] if dimension else ['bucket']
+    rows = (
+        queryset
+        .filter(range_filter(field, ranges))
+        .annotate(bucket=trunc(field))
+        .values(*values)
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        yield row['bucket'], (row[dimension] or '') if dimension else '', row['n']
+
+
+def missed_by_sources(moment):
+    """
+    Vrai si une ligne datée de `moment` ne sera pas retrouvée par changed_days :
+    un passage a déjà commencé après cette date (date antidatée). Une date
+    courante (à une minute près) est toujours retrouvée, sans requête.
+    """
+    if moment is None or moment >= timezone.now() - timedelta(minutes=1):
+        return False
+    return RollupRun.objects.filter(started_at__gt=moment).exists()
+
+
+def session_days(debut, fin):
+    """Jours couverts par une session, bornés à l'historique agrégé et à aujourd'hui."""
+    if debut is None:
+        return set()
+    today = timezone.localdate()
+    first = max(local_date(debut), today - timedelta(days=get_initial_days()))
+    last = min(local_date(fin or debut), today)
+    return days_between(first, last) if first <= last else set()
+
+
+class RollupSource:
+    """Source d'agrégats ; les sous-classes définissent `name`, `metrics` et les calculs."""
+    name = None
+    metrics = ()
+
+    def changed_days(self, since):
+        """Jours dont les données sources ont changé depuis `since`."""
+        raise NotImplementedError
+
+    def horizon(self, today):
+        """Premier jour dont les données sources sont complètes (None : tout l'historique)."""
+        return None
+
+    def compute(self, days):
+        """Itère les (granularité, métrique, dimension, début de période, valeur) des jours donnés."""
+        raise NotImplementedError
+
+    @staticmethod
+    def dates_since(queryset, field, since):
+        return set(queryset.filter(**{f'{field}__gte': since}).dates(field, 'day'))
+
+
+class SnapshotSource(RollupSource):
+    """État courant, enregistré pour le jour du passage uniquement."""
+
+    def changed_days(self, since):
+        return {timezone.localdate()}
+
+    def horizon(self, today):
+        return today
+
+    def compute(self, days):
+        today = timezone.localdate()
+        if today not in days:
+            return
+        bucket = day_start(today)
+        for metric, dimension, value in self.measure():
+            yield DAY, metric, dimension, bucket, value
+
+    def measure(self):
+        """Itère les (métrique, dimension, valeur) de l'état courant."""
+        raise NotImplementedError
+
+
+class UserRegistrationRollup(RollupSource):
+    name = 'user_registrations'
+    metrics = ('users.registered',)
+
+    def queryset(self):
+        from user_management.models import User
+        return User.objects.all()
+
+    def changed_days(self, since):
+        return self.dates_since(self.queryset(), 'date_joined', since)
+
+    def compute(self, days):
+        for bucket, role, n in count_by(self.queryset(), 'date_joined', day_ranges(days), 'role'):
+            yield DAY, 'users.registered', role, bucket, n
+
+
+class UserSnapshotRollup(SnapshotSource):
+    name = 'user_snapshot'
+    metrics = ('users.by_role', 'users.by_status')
+
+    def measure(self):
+        from user_management.models import User
+        rows = (
+            User.objects.filter(deleted_at__isnull=True)
+            .values('role', 'status')
+            .annotate(n=Count('id'))
+            .order_by()
+        )
+        by_role, by_status = {}, {}
+        for row in rows:
+            by_role[row['role']] = by_role.get(row['role'], 0) + row['n']
+            by_status[row['status']] = by_status.get(row['status'], 0) + row['n']
+        for role, n in by_role.items():
+            yield 'users.by_role', role, n
+        for status, n in by_status.items():
+            yield 'users.by_status', status, n
+
+
+class ActivationRollup(RollupSource):
+    """
+    Comptes activés, d'après les tokens d'activation consommés. Les tokens
+    consommés sont conservés ONE_TIME_TOKEN_RETENTION_DAYS jours avant la purge :
+    au-delà, les jours déjà agrégés ne sont plus recalculés.
+    """
+    name = 'activations'
+    metrics = ('users.activated',)
+
+    def queryset(self):
+        from user_management.models import OneTimeToken
+        return OneTimeToken.objects.filter(purpose=OneTimeToken.Purpose.ACTIVATION, used_at__isnull=False)
+
+    def changed_days(self, since):
+        return self.dates_since(self.queryset(), 'used_at', since)
+
+    def horizon(self, today):
+        retention = getattr(settings, 'ONE_TIME_TOKEN_RETENTION_DAYS', 3)
+        return local_date(timezone.now() - timedelta(days=retention)) + timedelta(days=1)
+
+    def compute(self, days):
+        queryset = self.queryset().annotate(role=F('user__role'))
+        for bucket, role, n in count_by(queryset, 'used_at', day_ranges(days), 'role'):
+            yield DAY, 'users.activated', role, bucket, n
+
+
+class LoginRollup(RollupSource):
+    """
+    Connexions réussies lues dans le journal d'audit (JSON, une ligne par
+    évènement) : nombre par heure et par jour, utilisateurs distincts par jour.
+    Les fichiers tournés avant la période demandée ne sont pas ouverts.
+    """
+    name = 'logins'
+    metrics = ('auth.logins', 'auth.active_users')
+
+    def __init__(self):
+        self._events = []
+        self._events_start = None
+
+    def log_files(self):
+        base = get_audit_log_path()
+        return sorted(
+            (path for path in glob.glob(f"{glob.escape(base)}*") if os.path.isfile(path)),
+            key=os.path.getmtime,
+        )
+
+    @staticmethod
+    def _parse(line):
+        """(horodatage, identifiant) d'une ligne de connexion réussie, sinon None."""
+        if LOGIN_MARKER not in line:
+            return None
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return None
+        if entry.get('action') != 'login_successful':
+            return None
+        timestamp = parse_datetime(entry.get('timestamp') or '')
+        if timestamp is None:
+            return None
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp, dt_timezone.utc)
+        # La connexion est journalisée avant l'authentification de la requête
+        who = entry.get('user_id') or (entry.get('details') or {}).get('email') or entry.get('username')
+        return timestamp, str(who)
+
+    def events(self, start):
+        """Connexions réussies à partir de `start`, lues une seule fois par passage."""
+        if self._events_start is None or start < self._events_start:
+            events = []
+            threshold = start.timestamp()
+            for path in self.log_files():
+                if os.path.getmtime(path) < threshold:
+                    continue
+                with open(path, encoding='utf-8', errors='replace') as log_file:
+                    for line in log_file:
+                        event = self._parse(line)
+                        if event is not None and event[0] >= start:
+                            events.append(event)
+            self._events, self._events_start = events, start
+        return [event for event in self._events if event[0] >= start]
+
+    def changed_days(self, since):
+        return {local_date(timestamp) for timestamp, _ in self.events(since)}
+
+    def horizon(self, today):
+        # Sans fichier tourné, le journal couvre tout l'historique ; sinon le
+        # premier jour du plus ancien fichier est probablement incomplet.
+        files = self.log_files()
+        if len(files) < 2:
+            return None
+        with open(files[0], encoding='utf-8', errors='replace') as log_file:
+            for line in log_file:
+                try:
+                    timestamp = parse_datetime(json.loads(line).get('timestamp') or '')
+                except (ValueError, AttributeError):
+                    continue
+                if timestamp is not None:
+                    return local_date(timestamp) + timedelta(days=1)
+        return None
+
+    def compute(self, days):
+        hourly, daily, users = {}, {}, {}
+        for timestamp, who in self.events(day_start(min(days))):
+            local = timezone.localtime(timestamp)
+            if local.date() not in days:
+                continue
+            hour = local.replace(minute=0, second=0, microsecond=0)
+            hourly[hour] = hourly.get(hour, 0) + 1
+            daily[local.date()] = daily.get(local.date(), 0) + 1
+            users.setdefault(local.date(), set()).add(who)
+        for bucket, n in hourly.items():
+            yield HOUR, 'auth.logins', '', bucket, n
+        for day, n in daily.items():
+            yield DAY, 'auth.logins', '', day_start(day), n
+            yield DAY, 'auth.active_users', '', day_start(day), len(users[day])
+
+
+class ThemeAssignmentRollup(RollupSource):
+    name = 'theme_assignments'
+    metrics = ('themes.assigned',)
+
+    def queryset(self):
+        from internship_management.models import Theme
+        return Theme.objects.filter(assignment_date__isnull=False)
+
+    def changed_days(self, since):
+        return self.dates_since(self.queryset(), 'assignment_date', since)
+
+    def compute(self, days):
+        for bucket, _, n in count_by(self.queryset(), 'assignment_date', day_ranges(days)):
+            yield DAY, 'themes.assigned', '', bucket, n
+
+
+class SessionRollup(RollupSource):
+    """Sessions commencées, terminées et en cours (présentes sur la journée)."""
+    name = 'sessions'
+    metrics = ('sessions.started', 'sessions.ended', 'sessions.active')
+
+    def queryset(self):
+        from training_management.models import FormationSession
+        return FormationSession.objects.all()
+
+    def changed_days(self, since):
+        # Une session modifiée touche tous les jours de sa période
+        days = set()
+        spans = self.queryset().filter(updated_at__gte=since).values_list('date_debut', 'date_fin')
+        for debut, fin in spans.iterator():
+            days |= session_days(debut, fin)
+        return days
+
+    def compute(self, days):
+        ranges = day_ranges(days)
+        for bucket, _, n in count_by(self.queryset(), 'date_debut', ranges):
+            yield DAY, 'sessions.started', '', bucket, n
+        for bucket, _, n in count_by(self.queryset().filter(date_fin__isnull=False), 'date_fin', ranges):
+            yield DAY, 'sessions.ended', '', bucket, n
+
+        # Sessions en cours : tableau de différences sur la plage, une seule requête
+        first, last = min(days), max(days)
+        size = (last - first).days + 1
+        spans = (
+            self.queryset()
+            .annotate(fin=Coalesce('date_fin', 'date_debut'))
+            .filter(date_debut__lt=day_start(last + timedelta(days=1)), fin__gte=day_start(first))
+            .values_list('date_debut', 'fin')
+        )
+        starts, ends = [], []
+        for debut, fin in spans.iterator():
+            starts.append(max((local_date(debut) - first).days, 0))
+            ends.append(min((local_date(fin) - first).days, size - 1) + 1)
+        diff = np.zeros(size + 1, dtype=np.int64)
+        np.add.at(diff, np.array(starts, dtype=np.int64), 1)
+        np.add.at(diff, np.array(ends, dtype=np.int64), -1)
+        active = np.cumsum(diff[:-1])
+        for day in days:
+            yield DAY, 'sessions.active', '', day_start(day), int(active[(day - first).days])
+
+
+class SessionStatusSnapshot(SnapshotSource):
+    name = 'session_status'
+    metrics = ('sessions.by_status',)
+
+    def measure(self):
+        from training_management.models import FormationSession
+        for row in FormationSession.objects.values('statut').annotate(n=Count('id')).order_by():
+            yield 'sessions.by_status', row['statut'], row['n']
+
+
+class ProjectRollup(RollupSource):
+    name = 'projects'
+    metrics = ('projects.created',)
+
+    def queryset(self):
+        from project_management.models import Projet
+        return Projet.objects.all()
+
+    def changed_days(self, since):
+        return self.dates_since(self.queryset(), 'date_creation', since)
+
+    def compute(self, days):
+        for bucket, _, n in count_by(self.queryset(), 'date_creation', day_ranges(days)):
+            yield DAY, 'projects.created', '', bucket, n
+
+
+class ProjectStatusSnapshot(SnapshotSource):
+    name = 'project_status'
+    metrics = ('projects.by_status',)
+
+    def measure(self):
+        from project_management.models import Projet
+        for row in Projet.objects.values('statut').annotate(n=Count('id')).order_by():
+            yield 'projects.by_status', row['statut'], row['n']
+
+
+SOURCES = (
+    UserRegistrationRollup,
+    UserSnapshotRollup,
+    ActivationRollup,
+    LoginRollup,
+    ThemeAssignmentRollup,
+    SessionRollup,
+    SessionStatusSnapshot,
+    ProjectRollup,
+    ProjectStatusSnapshot,
+)
+
+
+def write_rollups(source, days):
+    """Remplace les agrégats de la source pour les jours donnés ; retourne le nombre de lignes."""
+    rows = [
+        MetricRollup(granularity=granularity, metric=metric, dimension=dimension[:50], bucket=bucket, value=value)
+        for granularity, metric, dimension, bucket, value in source.compute(days)
+        if value and local_date(bucket) in days
+    ]
+    with transaction.atomic():
+        MetricRollup.objects.filter(range_filter('bucket', day_ranges(days)), metric__in=source.metrics).delete()
+        MetricRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def refresh_rollups(start=None, end=None):
+    """
+    Recalcule les agrégats et retourne le RollupRun enregistré.
+    Sans bornes : jours modifiés depuis le dernier passage réussi, plus les
+    ROLLUP_LOOKBACK_DAYS derniers jours. Avec `start` (et `end`, aujourd'hui
+    par défaut) : tous les jours de la période.
+    """
+    today = timezone.localdate()
+    since = RollupRun.watermark()
+    run = RollupRun.objects.create(range_start=start, range_end=end)
+
+    if start is None:
+        since = since or timezone.now() - timedelta(days=get_initial_days())
+        requested = days_between(today - timedelta(days=get_lookback_days()), today)
+    else:
+        requested = days_between(start, min(end or today, today))
+
+    try:
+        for source_class in SOURCES:
+            source = source_class()
+            days = set(requested)
+            if start is None:
+                days |= source.changed_days(since)
+            # Jours quittés par des lignes déplacées ou supprimées
+            dirty = list(RollupDirtyDay.objects.filter(source=source.name).values_list('id', 'day'))
+            days |= {day for _, day in dirty}
+            horizon = source.horizon(today)
+            days = {day for day in days if day <= today and (horizon is None or day >= horizon)}
+            written = write_rollups(source, days) if days else 0
+            if dirty:
+                RollupDirtyDay.objects.filter(id__in=[pk for pk, _ in dirty]).delete()
+            run.details[source.name] = {'days': len(days), 'rows': written}
+    except Exception:
+        run.status = RollupRun.Status.FAILED
+        run.finished_at = timezone.now()
+        run.save(update_fields=['status', 'finished_at', 'details'])
+        raise
+
+    run.status = RollupRun.Status.SUCCESS
+    run.finished_at = timezone.now()
+    run.save(update_fields=['status', 'finished_at', 'details'])
+    logger.info(f"Analytics rollups refreshed: {run.details}")
+    return run
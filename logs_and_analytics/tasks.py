@@ -0,0 +1,22 @@
+"""tasks.py pour celery"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+# Tâche nocturne : agrégats quotidiens du tableau de bord
+# (voir logs_and_analytics/rollups.py). Seuls les jours modifiés depuis le
+# dernier passage réussi sont recalculés.
+@shared_task(bind=True, max_retries=3, retry_backoff=True)
+def refresh_analytics_rollups(self):
+    from logs_and_analytics.rollups import refresh_rollups
+    try:
+        run = refresh_rollups()
+    except Exception as e:
+        logger.error(f"Failed to refresh analytics rollups: {e}")
+        raise self.retry(exc=e, countdown=60)
+    days = sum(source['days'] for source in run.details.values())
+    rows = sum(source['rows'] for source in run.details.values())
+    return f"{days} source days recomputed, {rows} rollup rows written"
@@ -1,3 +1,195 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+import pandas as pd
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from internship_management.models import Theme
+from project_management.models import Projet
+from internship_management.Services.AssignmentService import ThemeAssignmentService
+from training_management.models import FormationSession, FormationType
+from user_management.models import User
+
+from .models import MetricRollup, RollupDirtyDay
+from .rollups import day_start, refresh_rollups
+from .Services.StatisticsService import StatisticsService
+from .Services.TimeSeriesService import MAX_POINTS, TimeSeriesError, TimeSeriesService
+
+
+def rollup_value(metric, day):
+    row = MetricRollup.objects.filter(metric=metric, granularity='day', dimension='', bucket=day_start(day)).first()
+    return row.value if row else 0
+
+
+# Sans fenêtre de rattrapage : seuls aujourd'hui et les jours modifiés sont recalculés
+@override_settings(ROLLUP_LOOKBACK_DAYS=0, AUDIT_LOG_PATH='/nonexistent/audit.log')
+class IncrementalRollupTests(TestCase):
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.formation = FormationType.objects.create(nom='Python', duree_estimee=10)
+
+    def at(self, days_ago, hour=10):
+        return day_start(self.today - timedelta(days=days_ago)) + timedelta(hours=hour)
+
+    def test_moved_session_leaves_its_old_days(self):
+        session = FormationSession.objects.create(
+            formation_type=self.formation, date_debut=self.at(10), date_fin=self.at(9)
+        )
+        refresh_rollups()
+        old_day = self.today - timedelta(days=10)
+        self.assertEqual(rollup_value('sessions.started', old_day), 1)
+        self.assertEqual(rollup_value('sessions.active', old_day), 1)
+
+        session.date_debut = self.at(8)
+        session.date_fin = self.at(7)
+        session.save()
+        refresh_rollups()
+
+        self.assertEqual(rollup_value('sessions.started', old_day), 0)
+        self.assertEqual(rollup_value('sessions.active', old_day), 0)
+        self.assertEqual(rollup_value('sessions.active', self.today - timedelta(days=9)), 0)
+        self.assertEqual(rollup_value('sessions.started', self.today - timedelta(days=8)), 1)
+        self.assertEqual(rollup_value('sessions.ended', self.today - timedelta(days=7)), 1)
+        self.assertFalse(RollupDirtyDay.objects.exists())
+
+    def test_deleted_session_is_removed_from_rollups(self):
+        session = FormationSession.objects.create(formation_type=self.formation, date_debut=self.at(10))
+        refresh_rollups()
+        session.delete()
+        refresh_rollups()
+
+        self.assertEqual(rollup_value('sessions.started', self.today - timedelta(days=10)), 0)
+
+    def test_unassigned_theme_leaves_its_assignment_day(self):
+        intern = User.objects.create_user('intern@example.com', 'pw', role='intern', is_active=True)
+        theme = Theme.objects.create(title='Thème', description='Description')
+        ThemeAssignmentService.assign(theme, intern.pk, assignment_date=self.at(6))
+        refresh_rollups()
+        assigned_day = self.today - timedelta(days=6)
+        self.assertEqual(rollup_value('themes.assigned', assigned_day), 1)
+
+        ThemeAssignmentService.unassign(Theme.objects.get(pk=theme.pk))
+        refresh_rollups()
+
+        self.assertEqual(rollup_value('themes.assigned', assigned_day), 0)
+
+    def test_backdated_bulk_assignment_is_counted(self):
+        refresh_rollups()
+        intern = User.objects.create_user('intern@example.com', 'pw', role='intern', is_active=True)
+        theme = Theme.objects.create(title='Thème', description='Description')
+        ThemeAssignmentService.bulk_assign([(theme.pk, intern.pk)], assignment_date=self.at(5))
+        refresh_rollups()
+
+        self.assertEqual(rollup_value('themes.assigned', self.today - timedelta(days=5)), 1)
+
+    def test_unchanged_days_are_not_rewritten(self):
+        FormationSession.objects.create(formation_type=self.formation, date_debut=self.at(10))
+        refresh_rollups()
+        row = MetricRollup.objects.get(metric='sessions.started')
+
+        run = refresh_rollups()
+
+        self.assertEqual(MetricRollup.objects.get(metric='sessions.started').pk, row.pk)
+        # Aujourd'hui uniquement
+        self.assertEqual(run.details['sessions']['days'], 1)
+
+
+@override_settings(ROLLUP_LOOKBACK_DAYS=0, AUDIT_LOG_PATH='/nonexistent/audit.log')
+class TimeSeriesTests(TestCase):
+
+    def test_first_bucket_is_read_when_start_is_mid_day(self):
+        today = timezone.localdate()
+        first_day = day_start(today - timedelta(days=3))
+        MetricRollup.objects.create(metric='sessions.started', bucket=first_day, value=4)
+        MetricRollup.objects.create(metric='sessions.started', bucket=first_day + timedelta(days=1), value=2)
+
+        series = TimeSeriesService.get_series(
+            'sessions.started', first_day + timedelta(hours=15), day_start(today), interval='day'
+        )
+
+        self.assertEqual(series['index'][0], pd.Timestamp(first_day))
+        self.assertEqual(series['columns']['value'].tolist(), [4, 2, 0])
+
+    def test_requested_interval_is_capped(self):
+        end = timezone.now()
+
+        with self.assertRaises(TimeSeriesError):
+            TimeSeriesService.get_series('auth.logins', end - timedelta(days=365 * 5), end, interval='hour')
+
+        series = TimeSeriesService.get_series('auth.logins', end - timedelta(days=365 * 5), end, interval='week')
+        self.assertLessEqual(len(series['index']), MAX_POINTS)
+
+
+@override_settings(ROLLUP_LOOKBACK_DAYS=0, AUDIT_LOG_PATH='/nonexistent/audit.log')
+class DirtyDayMarkingTests(TestCase):
+
+    def setUp(self):
+        self.intern = User.objects.create_user('intern@example.com', 'pw', role='intern', is_active=True)
+        self.theme = Theme.objects.create(title='Thème', description='Description')
+
+    def test_current_assignment_adds_no_statement(self):
+        # Verrou du thème, stagiaire, UPDATE du stagiaire, UPDATE du thème (+ savepoint)
+        with self.assertNumQueries(6):
+            ThemeAssignmentService.assign(self.theme.pk, self.intern.pk)
+        self.assertFalse(RollupDirtyDay.objects.exists())
+
+    def test_backdated_assignment_before_last_run_is_marked(self):
+        refresh_rollups()
+        backdated = timezone.now() - timedelta(days=5)
+
+        ThemeAssignmentService.assign(self.theme.pk, self.intern.pk, assignment_date=backdated)
+
+        self.assertEqual(
+            list(RollupDirtyDay.objects.values_list('day', flat=True)),
+            [timezone.localtime(backdated).date()],
+        )
+
+    def test_session_save_does_not_reread_the_row(self):
+        formation = FormationType.objects.create(nom='Python', duree_estimee=10)
+        session = FormationSession.objects.create(formation_type=formation, date_debut=timezone.now())
+        session = FormationSession.objects.get(pk=session.pk)
+        session.date_debut = session.date_debut + timedelta(hours=1)
+
+        with self.assertNumQueries(1):
+            session.save(update_fields=['date_debut'])
+
+
+class StatisticsTests(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.today = timezone.localdate(self.now)
+        self.formation = FormationType.objects.create(nom='Python', duree_estimee=10)
+
+    def test_session_buckets_cover_every_session(self):
+        for debut, fin in [
+            (self.now - timedelta(days=10), self.now - timedelta(days=9)),   # terminée
+            (self.now - timedelta(days=1), self.now + timedelta(days=1)),    # en cours
+            (self.now - timedelta(days=1), None),                            # en cours, sans fin
+            (self.now + timedelta(days=3), None),                            # planifiée
+        ]:
+            FormationSession.objects.create(formation_type=self.formation, date_debut=debut, date_fin=fin)
+
+        sessions = StatisticsService.compute(self.now)['sessions']
+
+        self.assertEqual(sessions, {'total': 4, 'completed': 1, 'in_progress': 2, 'planned': 1})
+
+    def test_project_progress(self):
+        day = timedelta(days=1)
+        for statut, debut, fin in [
+            ('termine', None, None),                                    # 100
+            ('en_cours', self.today - 10 * day, self.today - day),      # échu : 100
+            ('en_attente', self.today + day, self.today + 10 * day),    # pas commencé : 0
+            ('en_cours', self.today - 5 * day, self.today + 5 * day),   # à mi-parcours : 50
+            ('en_cours', None, None),                                   # sans dates : ignoré
+        ]:
+            Projet.objects.create(
+                titre=f'Projet {statut}', formation=self.formation, statut=statut, date_debut=debut, date_fin=fin
+            )
+
+        projects = StatisticsService.compute(self.now)['projects']
+
+        self.assertEqual(projects['total'], 5)
+        self.assertEqual(projects['in_progress'], 3)
+        self.assertEqual(projects['average_progress'], 62.5)
@@ -1 +1,12 @@
-    
\ No newline at end of file
+# logs_and_analytics/urls.py
+from django.urls import path
+
+from .views.statistics_views import get_statistics
+from .views.timeseries_views import get_timeseries
+
+urlpatterns = [
+    # Indicateurs globaux du tableau de bord
+    path('statistics/', get_statistics, name='statistics'),
+    # Séries temporelles lues dans les agrégats quotidiens / horaires
+    path('timeseries/', get_timeseries, name='timeseries'),
+]
@@ -0,0 +1,74 @@
+# logs_and_analytics/views/timeseries_views.py
+
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from logs_and_analytics.rollups import day_start
+from logs_and_analytics.Services.TimeSeriesService import (
+    DEFAULT_POINTS, DEFAULT_RANGE, TimeSeriesError, TimeSeriesService, available_metrics
+)
+
+ARROW_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+def _parse_bound(value, name):
+    """Date (AAAA-MM-JJ, minuit) ou date-heure ISO 8601."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise TimeSeriesError(f"{name} doit être une date ISO 8601.")
+        return day_start(day)
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_timeseries(request):
+    """
+    Série temporelle d'une métrique agrégée, rééchantillonnée côté serveur.
+
+        GET timeseries/?metric=auth.logins&start=2025-01-01&end=2026-01-01&points=200
+        GET timeseries/?metric=sessions.active&interval=week&file_format=arrow
+
+    Sans `metric`, liste les métriques disponibles.
+    """
+    params = request.query_params
+    metric = params.get('metric')
+    if not metric:
+        return Response({'metrics': available_metrics()})
+
+    try:
+        end = _parse_bound(params['end'], 'end') if params.get('end') else timezone.now()
+        start = _parse_bound(params['start'], 'start') if params.get('start') else end - DEFAULT_RANGE
+        try:
+            points = int(params.get('points', DEFAULT_POINTS))
+        except ValueError:
+            raise TimeSeriesError("points doit être un entier.")
+        dimensions = [d for d in params.get('dimension', '').split(',') if d] or None
+
+        series = TimeSeriesService.get_series(
+            metric, start, end, points=points, interval=params.get('interval'), dimensions=dimensions
+        )
+    except TimeSeriesError as e:
+        return Response({'detail': e.message}, status=e.status_code)
+
+    if params.get('file_format') == 'arrow':
+        try:
+            payload = TimeSeriesService.to_arrow(series)
+        except ImportError:
+            return Response(
+                {'detail': "Format Arrow indisponible sur ce serveur (pyarrow non installé)."},
+                status=status.HTTP_406_NOT_ACCEPTABLE
+            )
+        return HttpResponse(payload, content_type=ARROW_CONTENT_TYPE)
+
+    data = TimeSeriesService.to_columnar(series)
+    data['start'] = start
+    data['end'] = end
+    return Response(data)
@@ -0,0 +1,70 @@
+# project_management/Services/StatsService.py
+"""Statistiques des projets visibles, calculées en une requête groupée.
+
+La requête groupe les projets par formation avec des COUNT filtrés (fichier
+joint, statut) ; les totaux sont la somme des groupes. Le résultat est mis en
+cache par visibilité et invalidé à chaque modification (voir
+project_management/cache.py)."""
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from project_management.cache import get_project_stats_cache_timeout, project_stats_cache_key
+from project_management.models import Projet
+
+SCOPE_ALL = 'all'
+SCOPE_EN_COURS = 'en_cours'
+
+# Un fichier est présent si le nom n'est ni NULL ni vide
+WITH_FILE = Q(fichier__isnull=False) & ~Q(fichier='')
+
+
+class ProjetStatsService:
+
+    @staticmethod
+    def scope_for(user):
+        """Visibilité de l'utilisateur, alignée sur ProjetViewSet.get_queryset."""
+        return SCOPE_ALL if getattr(user, 'role', None) == 'admin' else SCOPE_EN_COURS
+
+    @staticmethod
+    def get_queryset(scope):
+        queryset = Projet.objects.all()
+        if scope == SCOPE_EN_COURS:
+            queryset = queryset.filter(statut='en_cours')
+        return queryset
+
+    @classmethod
+    def compute(cls, scope):
+        statut_counts = {
+            statut: Count('id', filter=Q(statut=statut)) for statut, _ in Projet.STATUT_CHOICES
+        }
+        rows = (
+            cls.get_queryset(scope)
+            .values('formation__nom')
+            .annotate(count=Count('id'), avec_fichier=Count('id', filter=WITH_FILE), **statut_counts)
+            .order_by('-count', 'formation__nom')
+        )
+
+        stats = {
+            'total_visible': 0,
+            'avec_fichier': 0,
+            'par_statut': {statut: 0 for statut in statut_counts},
+            'par_formation': [],
+        }
+        for row in rows:
+            stats['total_visible'] += row['count']
+            stats['avec_fichier'] += row['avec_fichier']
+            for statut in statut_counts:
+                stats['par_statut'][statut] += row[statut]
+            stats['par_formation'].append({'formation__nom': row['formation__nom'], 'count': row['count']})
+        return stats
+
+    @classmethod
+    def get_stats(cls, user):
+        scope = cls.scope_for(user)
+        cache_key = project_stats_cache_key(scope)
+        stats = cache.get(cache_key)
+        if stats is None:
+            stats = cls.compute(scope)
+            cache.set(cache_key, stats, get_project_stats_cache_timeout())
+        return stats
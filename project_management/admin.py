@@ -103,7 +103,7 @@ class ProjetAdmin(admin.ModelAdmin):
     actions = ['mark_as_termine']
 
     def mark_as_termine(self, request, queryset):
-        updated = queryset.update(statut='termine')
+        updated = queryset.set_statut('termine')
         self.message_user(request, f"{updated} projet(s) marqué(s) comme terminé(s).")
     mark_as_termine.short_description = "Marquer les projets sélectionnés comme « Terminé »"
 
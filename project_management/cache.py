@@ -0,0 +1,25 @@
+# project_management/cache.py
+"""
+Cache des statistiques de projets (actions `stats` et `count`), une entrée par
+visibilité : les administrateurs voient tous les projets, les autres rôles
+uniquement les projets en cours. La clé est versionnée : toute modification
+d'un projet incrémente la version et rend les entrées en cache obsolètes.
+"""
+from django.conf import settings
+
+from user_management.cache_versions import bump_version, get_version
+
+PROJECT_STATS_VERSION_KEY = 'projects:stats:version'
+
+
+def project_stats_cache_key(scope):
+    return f"projects:stats:v{get_version(PROJECT_STATS_VERSION_KEY)}:{scope}"
+
+
+def get_project_stats_cache_timeout():
+    return getattr(settings, 'PROJECT_STATS_CACHE_TIMEOUT', 60 * 5)
+
+
+def invalidate_project_stats():
+    """Invalide les statistiques en cache de toutes les visibilités."""
+    bump_version(PROJECT_STATS_VERSION_KEY)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:17
+
+import project_management.models
+import user_management.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='projet',
+            name='fichier',
+            field=models.FileField(blank=True, null=True, storage=user_management.storage.get_content_store, upload_to=project_management.models.project_file_upload_path),
+        ),
+    ]
@@ -1,7 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 import uuid
 
+from user_management.storage import get_content_store
+
+from .cache import invalidate_project_stats
+
 
 def project_file_upload_path(instance, filename):
     """Chemin d'upload pour les fichiers de projet"""
@@ -10,6 +14,19 @@ def project_file_upload_path(instance, filename):
     return f"projects/{new_filename}"
 
 
+class ProjetQuerySet(models.QuerySet):
+    def set_statut(self, statut):
+        """
+        Change le statut des projets sélectionnés en un seul UPDATE (les projets
+        déjà dans ce statut ne sont pas réécrits). Retourne le nombre de projets modifiés.
+        """
+        updated = self.exclude(statut=statut).update(statut=statut)
+        if updated:
+            # UPDATE ne déclenche pas post_save : invalidation explicite
+            transaction.on_commit(invalidate_project_stats)
+        return updated
+
+
 class Projet(models.Model):
     """
     Représente un projet lié à une formation.
@@ -40,6 +57,7 @@ class Projet(models.Model):
     # Fichier optionnel
     fichier = models.FileField(
         upload_to=project_file_upload_path,
+        storage=get_content_store,  # Stockage adressé par contenu (dédupliqué)
         blank=True,
         null=True
     )
@@ -49,6 +67,8 @@ class Projet(models.Model):
     date_fin = models.DateField(null=True, blank=True)
     date_creation = models.DateTimeField(auto_now_add=True)
 
+    objects = ProjetQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date_creation']
         verbose_name = "Projet"
@@ -65,6 +85,25 @@ class Projet(models.Model):
                     'date_fin': "La date de fin doit être après la date de début."
                 })
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
\ No newline at end of file
+    # Pas de full_clean() ici : la validation se fait une fois, dans
+    # ProjetSerializer (API) ou le ModelForm (admin). save() ne fait qu'écrire.
+
+    def set_statut(self, statut):
+        """Transition de statut : écriture de la seule colonne `statut`."""
+        if statut not in dict(self.STATUT_CHOICES):
+            raise ValidationError({'statut': f"Statut invalide : {statut}"})
+        self.statut = statut
+        self.save(update_fields=['statut'])
+
+
+# Invalidation des statistiques en cache (voir project_management/cache.py).
+# Le nom des formations fait partie de la réponse en cache.
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+
+@receiver([post_save, post_delete], sender=Projet)
+@receiver([post_save, post_delete], sender='training_management.FormationType')
+def project_stats_changed(sender, **kwargs):
+    """Invalide les statistiques en cache après toute modification."""
+    invalidate_project_stats()
@@ -1,7 +1,12 @@
 # projects/serializers.py
 from rest_framework import serializers
+from training_management.models import FormationType
+
 from .models import Projet
 
+# Extensions acceptées pour les fichiers de projet (téléversement direct ou par morceaux)
+PROJET_ALLOWED_EXTENSIONS = ['pdf', 'doc', 'docx', 'zip', 'txt']
+
 class ProjetListSerializer(serializers.ModelSerializer):
     formation = serializers.CharField(source='formation.nom', read_only=True)
     statut_display = serializers.CharField(source='get_statut_display', read_only=True)
@@ -45,8 +50,54 @@ class ProjetSerializer(serializers.ModelSerializer):
             
             # Extensions autorisées
             ext = value.name.rsplit('.', 1)[-1].lower()
-            allowed = ['pdf', 'doc', 'docx', 'zip', 'txt']
+            allowed = PROJET_ALLOWED_EXTENSIONS
             if ext not in allowed:
                 raise serializers.ValidationError(f"Extension non autorisée. Utilisez: {', '.join(allowed)}")
         
-        return value
\ No newline at end of file
+        return value
+
+    def validate(self, attrs):
+        """Validation du modèle, faite ici une seule fois (Projet.save ne la refait pas)"""
+        date_debut = attrs.get('date_debut', getattr(self.instance, 'date_debut', None))
+        date_fin = attrs.get('date_fin', getattr(self.instance, 'date_fin', None))
+        if date_debut and date_fin and date_fin < date_debut:
+            raise serializers.ValidationError({
+                'date_fin': "La date de fin doit être après la date de début."
+            })
+        return attrs
+
+    def update(self, instance, validated_data):
+        """N'écrit que les colonnes envoyées (une modification de statut = un UPDATE d'une colonne)"""
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data) or None)
+        return instance
+
+
+class ProjetStatutSerializer(serializers.Serializer):
+    statut = serializers.ChoiceField(choices=Projet.STATUT_CHOICES)
+
+
+class ProjetBulkStatutSerializer(serializers.Serializer):
+    """Transition de statut en masse, par formation et/ou liste d'identifiants"""
+    statut = serializers.ChoiceField(choices=Projet.STATUT_CHOICES)
+    formation = serializers.PrimaryKeyRelatedField(queryset=FormationType.objects.all(), required=False)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    from_statut = serializers.MultipleChoiceField(choices=Projet.STATUT_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if 'formation' not in attrs and 'ids' not in attrs:
+            raise serializers.ValidationError("Précisez au moins une formation ou une liste d'identifiants.")
+        return attrs
+
+    def get_queryset(self):
+        data = self.validated_data
+        queryset = Projet.objects.all()
+        if 'formation' in data:
+            queryset = queryset.filter(formation=data['formation'])
+        if 'ids' in data:
+            queryset = queryset.filter(pk__in=data['ids'])
+        if data.get('from_statut'):
+            queryset = queryset.filter(statut__in=data['from_statut'])
+        return queryset
+
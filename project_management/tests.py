@@ -1,3 +1,40 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from training_management.models import FormationType
+from user_management.cache_versions import get_version
+
+from .cache import PROJECT_STATS_VERSION_KEY
+from .models import Projet
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ProjetStatsInvalidationTests(TestCase):
+
+    def setUp(self):
+        self.formation = FormationType.objects.create(nom='Python', duree_estimee=10)
+        self.projet = Projet.objects.create(titre='Projet', formation=self.formation)
+
+    def assertBumpsVersion(self, operation):
+        before = get_version(PROJECT_STATS_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            operation()
+        self.assertGreater(get_version(PROJECT_STATS_VERSION_KEY), before)
+
+    def test_queryset_set_statut_bumps_version(self):
+        self.assertBumpsVersion(lambda: Projet.objects.filter(pk=self.projet.pk).set_statut('termine'))
+
+    def test_unchanged_statut_keeps_version(self):
+        before = get_version(PROJECT_STATS_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            updated = Projet.objects.filter(pk=self.projet.pk).set_statut('en_attente')
+        self.assertEqual(updated, 0)
+        self.assertEqual(get_version(PROJECT_STATS_VERSION_KEY), before)
+
+    def test_instance_set_statut_bumps_version(self):
+        self.assertBumpsVersion(lambda: self.projet.set_statut('en_cours'))
+
+    def test_save_and_delete_bump_version(self):
+        self.assertBumpsVersion(lambda: Projet.objects.create(titre='Autre', formation=self.formation))
+        self.assertBumpsVersion(self.projet.delete)
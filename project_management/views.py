@@ -5,8 +5,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 
+from user_management.downloads import serve_file
+
 from .models import Projet
-from .serializers import ProjetSerializer, ProjetListSerializer, ProjetDetailSerializer
+from .Services.StatsService import ProjetStatsService
+from .serializers import (
+    ProjetSerializer, ProjetListSerializer, ProjetDetailSerializer,
+    ProjetStatutSerializer, ProjetBulkStatutSerializer,
+)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -34,6 +40,7 @@ class ProjetViewSet(viewsets.ModelViewSet):
     """
     queryset = Projet.objects.select_related('formation').all()
     permission_classes = [IsAuthenticated]
+    lookup_value_regex = r'\d+'
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -50,7 +57,7 @@ class ProjetViewSet(viewsets.ModelViewSet):
         - list / retrieve → tout le monde (mais filtré dans get_queryset)
         - create / update / partial_update / destroy → SEUL admin
         """
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'download']:
             return [IsAuthenticated()]
         else:
             # create, update, partial_update, destroy
@@ -97,20 +104,50 @@ class ProjetViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Téléchargement du fichier du projet (Range, ETag, Last-Modified)"""
+        projet = self.get_object()  # Non-admin : uniquement les projets en cours
+        if not projet.fichier:
+            return Response({"error": "Aucun fichier pour ce projet."}, status=status.HTTP_404_NOT_FOUND)
+
+        return serve_file(
+            request,
+            projet.fichier,
+            as_attachment=request.query_params.get('attachment') in ('1', 'true'),
+        )
+
+    @action(detail=True, methods=['post'], url_path='statut')
+    def set_statut(self, request, pk=None):
+        """Changement de statut : un seul UPDATE de la colonne `statut`"""
+        serializer = ProjetStatutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        statut = serializer.validated_data['statut']
+
+        updated = self.get_queryset().filter(pk=pk).set_statut(statut)
+        if not updated and not self.get_queryset().filter(pk=pk).exists():
+            return Response({"error": "Projet introuvable."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"id": int(pk), "statut": statut, "updated": bool(updated)})
+
+    @action(detail=False, methods=['post'], url_path='bulk-statut')
+    def bulk_statut(self, request):
+        """
+        Transition de statut en masse, en un seul UPDATE.
+        Ex. clôturer les projets d'une formation : {"formation": 3, "statut": "termine"}
+        """
+        serializer = ProjetBulkStatutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        statut = serializer.validated_data['statut']
+        updated = serializer.get_queryset().set_statut(statut)
+        return Response({"statut": statut, "updated": updated})
+
     @action(detail=False, methods=['get'])
     def count(self, request):
-        """Nombre de projets visibles"""
-        total = self.get_queryset().count()
-        return Response({"count": total})
+        """Nombre de projets visibles (lu dans les statistiques en cache)"""
+        stats = ProjetStatsService.get_stats(request.user)
+        return Response({"count": stats['total_visible']})
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Stats simples visibles par tous"""
-        qs = self.get_queryset()
-        return Response({
-            "total_visible": qs.count(),
-            "avec_fichier": qs.exclude(fichier__isnull=True).count(),
-            "par_formation": list(qs.values('formation__nom')
-                                    .annotate(count=Count('id'))
-                                    .order_by('-count'))
-        })
\ No newline at end of file
+        """Stats simples, réservées aux admins (une requête groupée, mise en cache)"""
+        return Response(ProjetStatsService.get_stats(request.user))
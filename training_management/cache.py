@@ -0,0 +1,44 @@
+# training_management/cache.py
+"""
+Cache des lectures du catalogue de formations et de la liste des formateurs.
+Les clés sont versionnées : une modification incrémente la version et rend
+toutes les réponses en cache obsolètes sans avoir à les énumérer.
+"""
+from django.conf import settings
+
+from user_management.cache_versions import bump_version, get_version
+
+CATALOGUE_VERSION_KEY = 'training:catalogue:version'
+FORMATEURS_VERSION_KEY = 'training:formateurs:version'
+
+
+def get_catalogue_version():
+    return get_version(CATALOGUE_VERSION_KEY)
+
+
+def catalogue_cache_key(scope, path):
+    """Clé d'une réponse du catalogue pour une visibilité (`scope`) et une URL."""
+    return f"training:catalogue:v{get_catalogue_version()}:{scope}:{path}"
+
+
+def get_catalogue_cache_timeout():
+    return getattr(settings, 'CATALOGUE_CACHE_TIMEOUT', 60 * 10)
+
+
+def invalidate_catalogue_cache():
+    """Invalide toutes les réponses du catalogue en cache."""
+    bump_version(CATALOGUE_VERSION_KEY)
+
+
+def formateurs_cache_key(path):
+    """Clé d'une page de la liste des formateurs éligibles."""
+    return f"training:formateurs:v{get_version(FORMATEURS_VERSION_KEY)}:{path}"
+
+
+def get_formateurs_cache_timeout():
+    return getattr(settings, 'FORMATEURS_CACHE_TIMEOUT', 60 * 60)
+
+
+def invalidate_formateurs_cache():
+    """Invalide toutes les pages de la liste des formateurs en cache."""
+    bump_version(FORMATEURS_VERSION_KEY)
@@ -0,0 +1,59 @@
+# training_management/formateurs.py
+"""
+Éligibilité des formateurs : un stagiaire actif avec au moins
+FORMATEUR_MIN_TENURE_DAYS jours d'ancienneté peut animer des sessions.
+
+L'éligibilité est matérialisée par User.is_formateur_eligible, rafraîchi chaque
+jour par la tâche refresh_formateur_eligibility. Vues et permissions lisent
+ce champ au lieu de recalculer l'ancienneté à chaque requête.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from user_management.models import User
+from .cache import invalidate_formateurs_cache
+
+
+def get_min_tenure_days():
+    return getattr(settings, 'FORMATEUR_MIN_TENURE_DAYS', 30)
+
+
+def eligibility_q(now=None):
+    """Condition d'éligibilité, évaluée par la base de données."""
+    now = now or timezone.now()
+    return Q(
+        role='intern',
+        is_active=True,
+        date_joined__lte=now - timedelta(days=get_min_tenure_days()),
+    )
+
+
+def is_formateur(user):
+    """Vérifie si un utilisateur peut être formateur (flag maintenu)."""
+    return user.role == 'intern' and user.is_active and user.is_formateur_eligible
+
+
+def eligible_formateurs():
+    """
+    Formateurs éligibles, servis par l'index partiel user_formateur_eligible_idx.
+    Rôle et activité sont revérifiés : le flag n'est rafraîchi qu'à la sauvegarde
+    du compte ou par la tâche quotidienne.
+    """
+    return User.objects.filter(role='intern', is_active=True, is_formateur_eligible=True)
+
+
+def refresh_formateur_eligibility(now=None, ids=None):
+    """
+    Met à jour le flag avec deux UPDATE ensemblistes, éventuellement limités aux `ids`.
+    Retourne le nombre d'utilisateurs devenus éligibles et ayant perdu l'éligibilité.
+    """
+    condition = eligibility_q(now)
+    users = User.objects.all() if ids is None else User.objects.filter(pk__in=ids)
+    granted = users.filter(condition, is_formateur_eligible=False).update(is_formateur_eligible=True)
+    revoked = users.filter(is_formateur_eligible=True).exclude(condition).update(is_formateur_eligible=False)
+    if granted or revoked:
+        invalidate_formateurs_cache()
+    return {'granted': granted, 'revoked': revoked}
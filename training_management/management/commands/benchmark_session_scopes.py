@@ -0,0 +1,80 @@
+# training_management/management/commands/benchmark_session_scopes.py
+"""
+Compare, par rôle, le coût estimé du plan et la durée de la requête de liste
+des sessions (FormationSessionQuerySet.visible_to).
+
+    python manage.py benchmark_session_scopes --iterations 20 --limit 100
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from training_management.models import FormationSession
+from user_management.models import User
+
+
+class Command(BaseCommand):
+    help = "Coût du plan et durée de la liste des sessions pour chaque rôle"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10, help="Exécutions par scope")
+        parser.add_argument('--limit', type=int, default=100, help="Taille de la page évaluée")
+        parser.add_argument('--legacy', action='store_true',
+                            help="Inclure l'ancienne requête formateur (OR + DISTINCT) pour comparaison")
+
+    def _sample_user(self, role, formateur=False):
+        """Utilisateur existant du rôle demandé, sinon instance non sauvegardée."""
+        queryset = User.objects.filter(role=role)
+        if role == 'intern':
+            queryset = queryset.filter(is_formateur_eligible=formateur)
+        return queryset.first() or User(role=role, is_formateur_eligible=formateur)
+
+    def _plan_cost(self, queryset):
+        """Coût total estimé (PostgreSQL) ou plan brut pour les autres moteurs."""
+        if connection.vendor == 'postgresql':
+            plan = json.loads(queryset.explain(format='json'))
+            return plan[0]['Plan']['Total Cost']
+        return queryset.explain().replace('\n', ' | ')
+
+    def _timing_ms(self, queryset, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            list(queryset.all())
+        return (time.perf_counter() - start) * 1000 / iterations
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        limit = options['limit']
+
+        scopes = [
+            ('admin', self._sample_user('admin')),
+            ('intern', self._sample_user('intern')),
+            ('formateur', self._sample_user('intern', formateur=True)),
+            ('visitor', self._sample_user('visitor')),
+            ('supervisor', self._sample_user('supervisor')),
+        ]
+        rows = [
+            (label, FormationSession.objects.visible_to(user).with_relations())
+            for label, user in scopes
+        ]
+        if options['legacy']:
+            formateur = scopes[2][1]
+            rows.append((
+                'formateur (OR + DISTINCT)',
+                FormationSession.objects.filter(Q(formateur=formateur) | Q()).distinct(),
+            ))
+
+        self.stdout.write(
+            f"{FormationSession.objects.count()} sessions, {iterations} itérations, page de {limit} ({connection.vendor})"
+        )
+        for label, queryset in rows:
+            queryset = queryset[:limit]
+            if queryset.query.is_empty():
+                self.stdout.write(f"{label:<28} aucune requête (queryset vide)")
+                continue
+            cost = self._plan_cost(queryset)
+            duration = self._timing_ms(queryset, iterations)
+            self.stdout.write(f"{label:<28} coût={cost}  durée moyenne={duration:.2f} ms")
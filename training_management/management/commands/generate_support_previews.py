@@ -0,0 +1,34 @@
+# training_management/management/commands/generate_support_previews.py
+"""
+Programme la génération des aperçus manquants (supports existants, ou après
+installation de pdftoppm / ffmpeg sur les workers).
+
+    python manage.py generate_support_previews --statut INDISPONIBLE ECHEC
+"""
+from django.core.management.base import BaseCommand
+
+from training_management.models import SupportFormation
+from training_management.tasks import generate_support_preview
+
+
+class Command(BaseCommand):
+    help = "Programme la génération des aperçus des supports"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--statut', nargs='+', default=[SupportFormation.APERCU_EN_ATTENTE],
+                            choices=[value for value, _ in SupportFormation.APERCU_STATUT_CHOICES],
+                            help="Statuts d'aperçu à (re)traiter")
+
+    def handle(self, *args, **options):
+        ids = (
+            SupportFormation.objects
+            .filter(apercu_statut__in=options['statut'])
+            .exclude(fichier='')
+            .values_list('pk', flat=True)
+            .iterator()
+        )
+        count = 0
+        for support_id in ids:
+            generate_support_preview.delay(support_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count} aperçus programmés"))
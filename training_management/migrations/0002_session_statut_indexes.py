@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_management', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formationsession',
+            index=models.Index(fields=['statut', 'date_debut'], name='training_ma_statut_a41b37_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formationsession',
+            index=models.Index(fields=['statut', 'date_fin'], name='training_ma_statut_e95f7d_idx'),
+        ),
+    ]
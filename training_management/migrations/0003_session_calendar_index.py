@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_management', '0002_session_statut_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formationsession',
+            index=models.Index(fields=['date_debut', 'date_fin'], name='training_ma_date_de_64de6b_idx'),
+        ),
+    ]
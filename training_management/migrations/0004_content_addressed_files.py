@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:17
+
+import user_management.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_management', '0003_session_calendar_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='supportformation',
+            name='fichier',
+            field=models.FileField(help_text='Fichier support (PDF, PPT, DOC, etc.)', storage=user_management.storage.get_content_store, upload_to='supports_formation/%Y/%m/%d/'),
+        ),
+    ]
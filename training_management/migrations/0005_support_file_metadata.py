@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:18
+
+import mimetypes
+import os
+
+from django.db import migrations, models
+
+
+def backfill_metadata(apps, schema_editor):
+    """Relève taille, type MIME et extension des supports existants (un stat par fichier, une seule fois)."""
+    SupportFormation = apps.get_model('training_management', 'SupportFormation')
+    for support in SupportFormation.objects.filter(taille_octets__isnull=True).exclude(fichier='').iterator():
+        name = support.fichier.name
+        try:
+            size = support.fichier.size
+        except (ValueError, OSError):
+            size = None
+        SupportFormation.objects.filter(pk=support.pk).update(
+            taille_octets=size,
+            type_mime=(mimetypes.guess_type(name)[0] or '')[:100],
+            extension=os.path.splitext(name)[1].lower()[:10],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_management', '0004_content_addressed_files'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supportformation',
+            name='checksum_sha256',
+            field=models.CharField(blank=True, help_text='Empreinte SHA-256 du contenu', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='supportformation',
+            name='extension',
+            field=models.CharField(blank=True, help_text='Extension du fichier (.pdf, .pptx, ...)', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='supportformation',
+            name='nombre_pages',
+            field=models.PositiveIntegerField(blank=True, help_text='Nombre de pages (PDF)', null=True),
+        ),
+        migrations.AddField(
+            model_name='supportformation',
+            name='taille_octets',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Taille du fichier en octets', null=True),
+        ),
+        migrations.AddField(
+            model_name='supportformation',
+            name='type_mime',
+            field=models.CharField(blank=True, help_text='Type MIME du fichier', max_length=100),
+        ),
+        migrations.RunPython(backfill_metadata, migrations.RunPython.noop),
+    ]
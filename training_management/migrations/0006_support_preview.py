@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:24
+
+import user_management.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_management', '0005_support_file_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supportformation',
+            name='apercu',
+            field=models.FileField(blank=True, help_text='Aperçu JPEG (première page, image de la vidéo)', storage=user_management.storage.get_content_store, upload_to='apercus/'),
+        ),
+        migrations.AddField(
+            model_name='supportformation',
+            name='apercu_statut',
+            field=models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('PRET', 'Prêt'), ('INDISPONIBLE', 'Indisponible pour ce format'), ('ECHEC', 'Échec')], default='EN_ATTENTE', help_text="État de génération de l'aperçu", max_length=20),
+        ),
+    ]
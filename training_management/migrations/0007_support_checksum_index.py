@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_management', '0006_support_preview'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supportformation',
+            index=models.Index(fields=['checksum_sha256', 'apercu_statut'], name='training_ma_checksu_361677_idx'),
+        ),
+    ]
@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from user_management.storage import get_content_store, inspect_upload, set_known_digest
+
 class FormationType(models.Model):
     """
     Définit le modèle de base d'une formation (ex: MS Office, QGIS).
@@ -17,14 +19,7 @@ class FormationType(models.Model):
         default=True,
         help_text="Indique si la formation est active et visible dans le catalogue"
     )
-    def nombre_sessions(self):
-        """Compteur mis en cache pour éviter N+1 queries"""
-        if hasattr(self, '_nombre_sessions_cache'):
-            return self._nombre_sessions_cache
-        count = self.sessions.count()  # related_name='sessions' dans FormationSession
-        self._nombre_sessions_cache = count
-        return count
-    
+
     class Meta:
         verbose_name = "Modèle de Formation"
         verbose_name_plural = "Catalogue Permanent"
@@ -51,6 +46,7 @@ class SupportFormation(models.Model):
     )
     fichier = models.FileField(
         upload_to='supports_formation/%Y/%m/%d/',
+        storage=get_content_store,  # Stockage adressé par contenu (dédupliqué)
         help_text="Fichier support (PDF, PPT, DOC, etc.)"
     )
     titre = models.CharField(max_length=200, help_text="Titre du support")
@@ -70,33 +66,158 @@ class SupportFormation(models.Model):
     )
     date_ajout = models.DateTimeField(auto_now_add=True)
 
-    
-    
+    # Métadonnées relevées une seule fois au téléversement (voir inspect_upload) :
+    # les listes n'interrogent jamais le stockage.
+    taille_octets = models.PositiveBigIntegerField(null=True, blank=True, help_text="Taille du fichier en octets")
+    type_mime = models.CharField(max_length=100, blank=True, help_text="Type MIME du fichier")
+    extension = models.CharField(max_length=10, blank=True, help_text="Extension du fichier (.pdf, .pptx, ...)")
+    checksum_sha256 = models.CharField(max_length=64, blank=True, help_text="Empreinte SHA-256 du contenu")
+    nombre_pages = models.PositiveIntegerField(null=True, blank=True, help_text="Nombre de pages (PDF)")
+
+    # Aperçu léger généré en tâche de fond (voir training_management/previews.py)
+    APERCU_EN_ATTENTE = 'EN_ATTENTE'
+    APERCU_PRET = 'PRET'
+    APERCU_INDISPONIBLE = 'INDISPONIBLE'
+    APERCU_ECHEC = 'ECHEC'
+    APERCU_STATUT_CHOICES = [
+        (APERCU_EN_ATTENTE, 'En attente'),
+        (APERCU_PRET, 'Prêt'),
+        (APERCU_INDISPONIBLE, 'Indisponible pour ce format'),
+        (APERCU_ECHEC, 'Échec'),
+    ]
+    apercu = models.FileField(
+        upload_to='apercus/',
+        storage=get_content_store,
+        blank=True,
+        help_text="Aperçu JPEG (première page, image de la vidéo)"
+    )
+    apercu_statut = models.CharField(
+        max_length=20,
+        choices=APERCU_STATUT_CHOICES,
+        default=APERCU_EN_ATTENTE,
+        help_text="État de génération de l'aperçu"
+    )
+
     class Meta:
         verbose_name = "Support de Formation"
         verbose_name_plural = "Supports de Formation"
         ordering = ['formation_type', 'titre']
+        indexes = [
+            # Réutilisation d'un aperçu déjà calculé pour le même contenu (previews.py)
+            models.Index(fields=['checksum_sha256', 'apercu_statut']),
+        ]
 
     def __str__(self):
         return f"{self.formation_type.nom} - {self.titre}"
 
+    def save(self, *args, **kwargs):
+        """Relève les métadonnées lorsqu'un nouveau fichier est téléversé."""
+        if self.fichier and not self.fichier._committed:
+            self.capture_metadata()
+        preview_requested = getattr(self, '_preview_requested', False)
+        super().save(*args, **kwargs)
+        if preview_requested:
+            self._preview_requested = False
+            self.schedule_preview()
+
+    def schedule_preview(self):
+        """Programme la génération de l'aperçu une fois la transaction validée."""
+        from training_management.tasks import generate_support_preview
+        pk = self.pk
+        transaction.on_commit(lambda: generate_support_preview.delay(pk))
+
+    def capture_metadata(self):
+        """Renseigne taille, type MIME, extension, empreinte et pages depuis le fichier reçu."""
+        metadata = inspect_upload(self.fichier.file, self.fichier.name)
+        self.apply_metadata(metadata)
+        # Le store réutilise l'empreinte au lieu de relire le fichier pour la calculer
+        set_known_digest(self.fichier.file, metadata['checksum'])
+
+    def apply_metadata(self, metadata):
+        """Recopie un résultat de inspect_upload (déjà calculé, ex. téléversement par morceaux)."""
+        self.taille_octets = metadata['size']
+        self.type_mime = metadata['mime_type'][:100]
+        self.extension = metadata['extension'][:10]
+        self.checksum_sha256 = metadata['checksum']
+        self.nombre_pages = metadata['pages']
+        # Nouveau contenu : l'aperçu précédent ne correspond plus
+        self.apercu = None
+        self.apercu_statut = self.APERCU_EN_ATTENTE
+        self._preview_requested = True
+
     def extension_fichier(self):
         """Retourne l'extension du fichier"""
         import os
-        return os.path.splitext(self.fichier.name)[1].upper()
+        return (self.extension or os.path.splitext(self.fichier.name)[1]).upper()
 
     def taille_fichier(self):
         """Retourne la taille du fichier en format lisible"""
-        try:
-            size = self.fichier.size
-            if size < 1024:
-                return f"{size} octets"
-            elif size < 1024 * 1024:
-                return f"{size / 1024:.1f} KB"
-            else:
-                return f"{size / (1024 * 1024):.1f} MB"
-        except (ValueError, OSError):
+        size = self.taille_octets
+        if size is None:
             return "Inconnue"
+        if size < 1024:
+            return f"{size} octets"
+        elif size < 1024 * 1024:
+            return f"{size / 1024:.1f} KB"
+        else:
+            return f"{size / (1024 * 1024):.1f} MB"
+
+
+class FormationSessionQuerySet(models.QuerySet):
+    # Rôles sans accès aux sessions (rôle externe)
+    HIDDEN_ROLES = ('supervisor',)
+
+    def visible_to(self, user):
+        """
+        Sessions visibles par l'utilisateur. Tous les rôles internes voient
+        l'ensemble des sessions, formateurs compris : aucun OR ni DISTINCT.
+        """
+        if getattr(user, 'role', None) in self.HIDDEN_ROLES:
+            return self.none()
+        return self
+
+    def led_by(self, user):
+        """Sessions animées par le formateur donné."""
+        return self.filter(formateur=user)
+
+    def with_relations(self):
+        """Charge formation et formateur dans la même requête (listes, calendrier)."""
+        return self.select_related('formation_type', 'formateur')
+
+    def sync_statuts(self, now=None):
+        """
+        Fait avancer le statut des sessions échues avec deux UPDATE ensemblistes
+        (PLAN → ENCOURS, puis ENCOURS → TERMINEE), sans charger ni sauvegarder
+        chaque instance. Même règle que FormationSession.update_statut.
+        Retourne le nombre de sessions passées à chaque statut.
+        """
+        now = now or timezone.now()
+        started = self.filter(statut='PLAN', date_debut__lte=now).update(
+            statut='ENCOURS', updated_at=now
+        )
+        # Exécuté après le premier UPDATE : une session planifiée déjà terminée
+        # passe directement à TERMINEE dans le même passage.
+        finished = self.filter(statut='ENCOURS', date_fin__lt=now).update(
+            statut='TERMINEE', updated_at=now
+        )
+        return {'ENCOURS': started, 'TERMINEE': finished}
+
+
+class FormationSessionManager(models.Manager):
+    def get_queryset(self):
+        return FormationSessionQuerySet(self.model, using=self._db)
+
+    def visible_to(self, user):
+        return self.get_queryset().visible_to(user)
+
+    def led_by(self, user):
+        return self.get_queryset().led_by(user)
+
+    def with_relations(self):
+        return self.get_queryset().with_relations()
+
+    def sync_statuts(self, now=None):
+        return self.get_queryset().sync_statuts(now=now)
 
 
 class FormationSession(models.Model):
@@ -141,10 +262,19 @@ class FormationSession(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = FormationSessionManager()
+
     class Meta:
         ordering = ['date_debut']
         verbose_name = "Session de Formation"
         verbose_name_plural = "Sessions de Formation"
+        indexes = [
+            # Utilisés par FormationSessionQuerySet.sync_statuts et les filtres par statut
+            models.Index(fields=['statut', 'date_debut']),
+            models.Index(fields=['statut', 'date_fin']),
+            # Requêtes de chevauchement du calendrier
+            models.Index(fields=['date_debut', 'date_fin']),
+        ]
 
     def __str__(self):
         return f"{self.formation_type.nom} ({self.date_debut.strftime('%Y-%m-%d')})"
@@ -190,4 +320,42 @@ class FormationSession(models.Model):
             self.statut = 'ENCOURS'
         else:
             self.statut = 'PLAN'
-        self.save()
\ No newline at end of file
+        self.save(update_fields=['statut', 'updated_at'])
+
+
+# Invalidation du cache du catalogue (voir training_management/cache.py).
+# Les compteurs de sessions et de supports font partie de la réponse en cache.
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .cache import invalidate_catalogue_cache, invalidate_formateurs_cache
+
+
+@receiver([post_save, post_delete], sender=FormationType)
+@receiver([post_save, post_delete], sender=SupportFormation)
+@receiver([post_save, post_delete], sender=FormationSession)
+def catalogue_changed(sender, **kwargs):
+    """Invalide le catalogue en cache après toute modification."""
+    invalidate_catalogue_cache()
+
+
+# Éligibilité des formateurs (voir training_management/formateurs.py)
+ELIGIBILITY_FIELDS = {'role', 'is_active', 'date_joined'}
+# Champs affichés par la liste des formateurs en cache
+FORMATEUR_DISPLAY_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def formateur_eligibility_changed(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """
+    Rafraîchit le flag du compte sauvegardé et invalide la liste des formateurs
+    si un formateur change de nom ou d'email ; ignore les autres sauvegardes (ex. last_login).
+    """
+    if raw or created:
+        return
+    touched = None if update_fields is None else set(update_fields)
+    if touched is None or ELIGIBILITY_FIELDS & touched:
+        from .formateurs import refresh_formateur_eligibility
+        # Invalide le cache si le flag change
+        refresh_formateur_eligibility(ids=[instance.pk])
+    if instance.is_formateur_eligible and (touched is None or FORMATEUR_DISPLAY_FIELDS & touched):
+        invalidate_formateurs_cache()
@@ -28,10 +28,8 @@ class CanManageSessions(permissions.BasePermission):
         if request.user.role == 'admin':
             return True
         elif request.user.role == 'intern':
-            # Vérifier si l'utilisateur est éligible comme formateur
-            from django.utils import timezone
-            one_month_ago = timezone.now() - timezone.timedelta(days=30)
-            return request.user.date_joined <= one_month_ago
+            # Vérifier si l'utilisateur est éligible comme formateur (flag maintenu chaque jour)
+            return request.user.is_formateur_eligible
         return False
 
 class IsFormateurOrReadOnly(permissions.BasePermission):
@@ -47,9 +45,7 @@ class IsFormateurOrReadOnly(permissions.BasePermission):
         if request.user.role == 'admin':
             return True
         elif request.user.role == 'intern':
-            from django.utils import timezone
-            one_month_ago = timezone.now() - timezone.timedelta(days=30)
-            return request.user.date_joined <= one_month_ago
+            return request.user.is_formateur_eligible
         return False
 
     def has_object_permission(self, request, view, obj):
@@ -0,0 +1,122 @@
+"""training_management/previews.py
+Aperçus des supports de formation : une image JPEG de quelques dizaines de Ko
+(première page d'un PDF, image extraite d'une vidéo, miniature d'une image)
+pour que le catalogue n'ait pas à télécharger les fichiers complets.
+
+Le rendu délègue aux outils présents sur le worker (pdftoppm de poppler-utils,
+ffmpeg). Un format sans outil disponible est marqué « indisponible » et le
+frontend garde son icône par type de support.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+
+from user_management.storage import content_store
+
+logger = logging.getLogger(__name__)
+
+
+def get_preview_width():
+    return getattr(settings, 'SUPPORT_PREVIEW_WIDTH', 480)
+
+
+def get_preview_timeout():
+    return getattr(settings, 'SUPPORT_PREVIEW_TIMEOUT', 60)
+
+
+def _render_pdf(source, target, width):
+    """Première page du PDF, mise à l'échelle sur `width` pixels."""
+    prefix = os.path.splitext(target)[0]
+    subprocess.run(
+        ['pdftoppm', '-jpeg', '-f', '1', '-l', '1', '-singlefile',
+         '-scale-to-x', str(width), '-scale-to-y', '-1', source, prefix],
+        check=True, capture_output=True, timeout=get_preview_timeout(),
+    )
+
+
+def _render_video(source, target, width):
+    """Image prise à une seconde du début (ou la première si la vidéo est plus courte)."""
+    for offset in ('1', '0'):
+        subprocess.run(
+            ['ffmpeg', '-v', 'error', '-y', '-ss', offset, '-i', source,
+             '-frames:v', '1', '-vf', f'scale={width}:-2', target],
+            check=True, capture_output=True, timeout=get_preview_timeout(),
+        )
+        if os.path.exists(target) and os.path.getsize(target):
+            return
+
+
+def _render_image(source, target, width):
+    subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-i', source,
+         '-vf', f"scale='min({width},iw)':-2", '-frames:v', '1', target],
+        check=True, capture_output=True, timeout=get_preview_timeout(),
+    )
+
+
+# Extension -> (outil requis, fonction de rendu)
+RENDERERS = {
+    '.pdf': ('pdftoppm', _render_pdf),
+    '.mp4': ('ffmpeg', _render_video),
+    '.jpg': ('ffmpeg', _render_image),
+    '.jpeg': ('ffmpeg', _render_image),
+    '.png': ('ffmpeg', _render_image),
+}
+
+
+def get_renderer(extension):
+    """Fonction de rendu pour l'extension, ou None si l'outil n'est pas installé."""
+    tool, renderer = RENDERERS.get((extension or '').lower(), (None, None))
+    if tool is None or shutil.which(tool) is None:
+        return None
+    return renderer
+
+
+def build_preview(support):
+    """
+    Génère l'aperçu du support et retourne le statut obtenu.
+    Un aperçu déjà calculé pour le même contenu (même SHA-256) est réutilisé.
+    """
+    from training_management.models import SupportFormation
+
+    # Mise à jour conditionnelle : si le fichier a été remplacé pendant le
+    # rendu, l'aperçu obtenu n'est pas enregistré.
+    current = SupportFormation.objects.filter(pk=support.pk, checksum_sha256=support.checksum_sha256)
+
+    if support.checksum_sha256:
+        existing = (
+            SupportFormation.objects
+            .filter(checksum_sha256=support.checksum_sha256, apercu_statut=SupportFormation.APERCU_PRET)
+            .exclude(apercu='')
+            .values_list('apercu', flat=True)
+            .first()
+        )
+        if existing:
+            current.update(apercu=existing, apercu_statut=SupportFormation.APERCU_PRET)
+            return SupportFormation.APERCU_PRET
+
+    renderer = get_renderer(support.extension or os.path.splitext(support.fichier.name)[1])
+    if renderer is None:
+        current.update(apercu_statut=SupportFormation.APERCU_INDISPONIBLE)
+        return SupportFormation.APERCU_INDISPONIBLE
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        target = os.path.join(tmp_dir, 'apercu.jpg')
+        try:
+            renderer(support.fichier.path, target, get_preview_width())
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Preview rendering failed for support {support.pk}: {e}")
+        if not os.path.exists(target) or not os.path.getsize(target):
+            current.update(apercu_statut=SupportFormation.APERCU_ECHEC)
+            return SupportFormation.APERCU_ECHEC
+
+        with open(target, 'rb') as fh:
+            name = content_store.save('apercus/apercu.jpg', File(fh))
+
+    current.update(apercu=name, apercu_statut=SupportFormation.APERCU_PRET)
+    return SupportFormation.APERCU_PRET
@@ -1,19 +1,29 @@
 from rest_framework import serializers
 from django.conf import settings
 from django.utils import timezone
+from rest_framework.reverse import reverse
 from .models import FormationType, FormationSession, SupportFormation
 from user_management.models import User
 
+# Extensions acceptées pour les supports (téléversement direct ou par morceaux)
+SUPPORT_ALLOWED_EXTENSIONS = ['.pdf', '.ppt', '.pptx', '.doc', '.docx', '.xls', '.xlsx', '.jpg', '.jpeg', '.png', '.mp4']
+
 class FormationTypeSerializer(serializers.ModelSerializer):
-    nombre_sessions = serializers.ReadOnlyField()
-    supports_count = serializers.SerializerMethodField()  # Nouveau champ
+    nombre_sessions = serializers.SerializerMethodField()
+    supports_count = serializers.SerializerMethodField()
     class Meta:
         model = FormationType
         fields = ['id', 'nom', 'description', 'duree_estimee', 'est_actif', 'nombre_sessions', 'supports_count']
 
+    def get_nombre_sessions(self, obj):
+        """Nombre de sessions, annoté par FormationTypeViewSet.get_queryset"""
+        count = getattr(obj, 'nombre_sessions', None)
+        return obj.sessions.count() if count is None else count
+
     def get_supports_count(self, obj):
-        """Retourne le nombre de supports pour cette formation"""
-        return obj.supports.count()
+        """Nombre de supports, annoté par FormationTypeViewSet.get_queryset"""
+        count = getattr(obj, 'supports_count', None)
+        return obj.supports.count() if count is None else count
     
     def validate_duree_estimee(self, value):
         """Validation de la durée estimée"""
@@ -26,15 +36,29 @@ class SupportFormationSerializer(serializers.ModelSerializer):
     extension_fichier = serializers.ReadOnlyField()
     taille_fichier = serializers.ReadOnlyField()
     formation_type_nom = serializers.CharField(source='formation_type.nom', read_only=True)
+    apercu_url = serializers.SerializerMethodField()
     
     class Meta:
         model = SupportFormation
         fields = [
             'id', 'formation_type', 'formation_type_nom', 'fichier', 
             'titre', 'description', 'type_support', 'extension_fichier', 
-            'taille_fichier', 'date_ajout'
+            'taille_fichier', 'taille_octets', 'type_mime', 'checksum_sha256',
+            'nombre_pages', 'apercu_url', 'apercu_statut', 'date_ajout'
+        ]
+        read_only_fields = [
+            'date_ajout', 'extension_fichier', 'taille_fichier',
+            'taille_octets', 'type_mime', 'checksum_sha256', 'nombre_pages',
+            'apercu_statut'
         ]
-        read_only_fields = ['date_ajout', 'extension_fichier', 'taille_fichier']
+
+    def get_apercu_url(self, obj):
+        """URL de l'aperçu servi par l'action `apercu` (None tant qu'il n'est pas prêt)."""
+        if not obj.apercu:
+            return None
+        url = reverse('support-apercu', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
     def validate(self, data):
         """Validation globale"""
@@ -58,7 +82,7 @@ class SupportFormationSerializer(serializers.ModelSerializer):
                 )
             
             # Vérifier les extensions autorisées
-            allowed_extensions = ['.pdf', '.ppt', '.pptx', '.doc', '.docx', '.xls', '.xlsx', '.jpg', '.jpeg', '.png', '.mp4']
+            allowed_extensions = SUPPORT_ALLOWED_EXTENSIONS
             import os
             ext = os.path.splitext(value.name)[1].lower()
             if ext not in allowed_extensions:
@@ -76,18 +100,9 @@ class SupportFormationSerializer(serializers.ModelSerializer):
                 f"Erreur lors de la création du support: {str(e)}"
             )
 
-    def update(self, instance, validated_data):
-        """Surcharge pour gérer la suppression de l'ancien fichier"""
-        old_file = instance.fichier
-        
-        # Mise à jour normale
-        instance = super().update(instance, validated_data)
-        
-        # Si le fichier a changé, supprimer l'ancien
-        if 'fichier' in validated_data and old_file and old_file != instance.fichier:
-            old_file.delete(save=False)
-            
-        return instance
+    # Pas de suppression de l'ancien fichier à la mise à jour : le stockage est
+    # partagé entre supports et projets, les fichiers orphelins sont supprimés
+    # par la tâche collect_orphan_files.
 
 class FormationTypeDetailSerializer(FormationTypeSerializer):
     """Serializer détaillé avec les supports"""
@@ -210,6 +225,15 @@ class FormationSessionSerializer(serializers.ModelSerializer):
         return instance
 
 
+# Classe CSS d'un évènement du calendrier selon le statut de la session
+CALENDAR_CLASS_NAMES = {
+    'PLAN': 'event-planifie',
+    'ENCOURS': 'event-en-cours',
+    'TERMINEE': 'event-termine',
+}
+CALENDAR_DEFAULT_CLASS_NAME = 'event-planifie'
+
+
 class FormationSessionCalendarSerializer(serializers.ModelSerializer):
     """Serializer optimisé pour l'affichage calendaire"""
     title = serializers.CharField(source='formation_type.nom', read_only=True)
@@ -227,12 +251,7 @@ class FormationSessionCalendarSerializer(serializers.ModelSerializer):
     
     def get_className(self, obj):
         """Retourne la classe CSS en fonction du statut"""
-        class_map = {
-            'PLAN': 'event-planifie',
-            'ENCOURS': 'event-en-cours', 
-            'TERMINEE': 'event-termine'
-        }
-        return class_map.get(obj.statut, 'event-planifie')
+        return CALENDAR_CLASS_NAMES.get(obj.statut, CALENDAR_DEFAULT_CLASS_NAME)
 
 
 class FormationSessionStatutSerializer(serializers.ModelSerializer):
@@ -0,0 +1,54 @@
+"""tasks.py pour celery"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+# Tâche périodique : statut des sessions de formation.
+# Deux UPDATE ensemblistes (voir FormationSessionQuerySet.sync_statuts), de sorte
+# que les filtres en_cours / terminees restent à jour sans sauvegarde par session.
+@shared_task(bind=True, max_retries=3, retry_backoff=True)
+def update_sessions_statuts(self):
+    from training_management.models import FormationSession
+    try:
+        counts = FormationSession.objects.sync_statuts()
+    except Exception as e:
+        logger.error(f"Failed to update session statuses: {e}")
+        raise self.retry(exc=e, countdown=60)
+
+    logger.info(f"{counts['ENCOURS']} sessions started, {counts['TERMINEE']} sessions finished")
+    return f"{counts['ENCOURS']} ENCOURS, {counts['TERMINEE']} TERMINEE"
+
+
+# Tâche quotidienne : éligibilité des formateurs (voir training_management/formateurs.py)
+@shared_task(bind=True, max_retries=3, retry_backoff=True)
+def refresh_formateur_eligibility(self):
+    from training_management.formateurs import refresh_formateur_eligibility as refresh
+    try:
+        counts = refresh()
+    except Exception as e:
+        logger.error(f"Failed to refresh formateur eligibility: {e}")
+        raise self.retry(exc=e, countdown=60)
+
+    logger.info(f"Formateur eligibility: {counts['granted']} granted, {counts['revoked']} revoked")
+    return f"{counts['granted']} granted, {counts['revoked']} revoked"
+
+
+# Aperçu d'un support, programmé après chaque téléversement (voir SupportFormation.save).
+# Les échecs de rendu sont enregistrés dans apercu_statut ; seules les erreurs
+# inattendues (stockage, base) donnent lieu à une relance.
+@shared_task(bind=True, max_retries=3, retry_backoff=True)
+def generate_support_preview(self, support_id):
+    from training_management.models import SupportFormation
+    from training_management.previews import build_preview
+    support = SupportFormation.objects.filter(pk=support_id).first()
+    if support is None or not support.fichier:
+        return f"Support {support_id} not found"
+    try:
+        statut = build_preview(support)
+    except Exception as e:
+        logger.error(f"Failed to generate preview for support {support_id}: {e}")
+        raise self.retry(exc=e, countdown=60)
+    return f"Support {support_id} preview {statut}"
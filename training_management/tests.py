@@ -1,3 +1,125 @@
-from django.test import TestCase
+import hashlib
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from user_management.models import User
+
+from .formateurs import eligible_formateurs, is_formateur, refresh_formateur_eligibility
+from .models import FormationSession, FormationType, SupportFormation
+
+
+class FormateurEligibilityTests(TestCase):
+
+    def setUp(self):
+        self.intern = User.objects.create_user(
+            'intern@example.com', 'pw', role='intern', is_active=True,
+            date_joined=timezone.now() - timedelta(days=365),
+        )
+        refresh_formateur_eligibility()
+        self.intern.refresh_from_db()
+
+    def test_seasoned_intern_is_eligible(self):
+        self.assertTrue(is_formateur(self.intern))
+        self.assertIn(self.intern, eligible_formateurs())
+
+    def test_deactivation_revokes_eligibility_on_save(self):
+        self.intern.is_active = False
+        with mock.patch('training_management.formateurs.invalidate_formateurs_cache') as invalidate:
+            self.intern.save(update_fields=['is_active'])
+
+        invalidate.assert_called_once_with()
+        self.assertFalse(is_formateur(self.intern))
+        self.assertNotIn(self.intern, eligible_formateurs())
+        self.intern.refresh_from_db()
+        self.assertFalse(self.intern.is_formateur_eligible)
+
+    def test_role_change_revokes_eligibility_on_save(self):
+        self.intern.role = 'visitor'
+        self.intern.save()
+
+        self.intern.refresh_from_db()
+        self.assertFalse(self.intern.is_formateur_eligible)
+
+    def test_renaming_a_formateur_invalidates_the_list(self):
+        self.intern.first_name = 'Ada'
+        with mock.patch('training_management.models.invalidate_formateurs_cache') as invalidate:
+            self.intern.save(update_fields=['first_name'])
+
+        invalidate.assert_called_once_with()
+
+    def test_unrelated_save_does_not_refresh(self):
+        with mock.patch('training_management.formateurs.refresh_formateur_eligibility') as refresh:
+            self.intern.save(update_fields=['last_login'])
+
+        refresh.assert_not_called()
+
+    def test_stale_flag_is_ignored_for_inactive_users(self):
+        # Flag non encore rafraîchi (UPDATE sans signal)
+        User.objects.filter(pk=self.intern.pk).update(is_active=False)
+
+        self.assertFalse(eligible_formateurs().filter(pk=self.intern.pk).exists())
+
+
+class SupportUploadTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.formation = FormationType.objects.create(nom='Python', duree_estimee=10)
+
+    def create_support(self, content):
+        return SupportFormation.objects.create(
+            formation_type=self.formation,
+            titre='Cours',
+            fichier=SimpleUploadedFile('cours.pdf', content, content_type='application/pdf'),
+        )
+
+    def test_upload_is_hashed_once(self):
+        with mock.patch.object(hashlib, 'sha256', wraps=hashlib.sha256) as sha256:
+            support = self.create_support(b'%PDF-1.4 contenu')
+
+        self.assertEqual(sha256.call_count, 1)
+        self.assertEqual(support.checksum_sha256, hashlib.sha256(b'%PDF-1.4 contenu').hexdigest())
+        self.assertIn(support.checksum_sha256, support.fichier.name)
+        with support.fichier.open('rb') as stored:
+            self.assertEqual(stored.read(), b'%PDF-1.4 contenu')
+
+    def test_known_content_is_shared(self):
+        first = self.create_support(b'%PDF-1.4 contenu')
+        second = self.create_support(b'%PDF-1.4 contenu')
+
+        self.assertEqual(first.fichier.name, second.fichier.name)
+
+
+class CalendarTests(TestCase):
+
+    def test_compact_payload_keeps_class_name(self):
+        admin = User.objects.create_superuser('admin@example.com', 'pw')
+        formation = FormationType.objects.create(nom='Python', duree_estimee=10)
+        session = FormationSession.objects.create(
+            formation_type=formation, date_debut=timezone.now(), statut='ENCOURS'
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        today = timezone.localdate()
+
+        response = client.get('/api/sessions/calendar/', {
+            'start': (today - timedelta(days=1)).isoformat(), 'end': (today + timedelta(days=1)).isoformat(),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        events = [dict(zip(response.data['fields'], row)) for row in response.data['sessions']]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['id'], session.pk)
+        self.assertEqual(events[0]['title'], 'Python')
+        self.assertEqual(events[0]['className'], 'event-en-cours')
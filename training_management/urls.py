@@ -63,6 +63,8 @@ PUT    /api/supports/{id}/                      # Modifier un support
 PATCH  /api/supports/{id}/                      # Modifier partiellement
 DELETE /api/supports/{id}/                      # Supprimer un support
 GET    /api/supports/by_formation/              # Supports par formation
+GET    /api/supports/{id}/download/             # Téléchargement du fichier (Range, ETag)
+GET    /api/supports/{id}/apercu/               # Aperçu JPEG (première page, image vidéo)
 
 STATISTIQUES ET RAPPORTS :
 GET    /api/stats/                              # Statistiques globales
@@ -1,17 +1,34 @@
+import hashlib
+import json
+import os
+from datetime import datetime, time, timedelta
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from django.conf import settings
 from django.db import models
 from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
-from django.db.models import Q, Count
+from django.utils.dateparse import parse_date, parse_datetime
+from django.db.models import Q, Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.core.cache import cache
+from .cache import (
+    catalogue_cache_key, get_catalogue_cache_timeout,
+    formateurs_cache_key, get_formateurs_cache_timeout,
+)
+from .formateurs import eligible_formateurs, is_formateur
 from .models import FormationType, FormationSession, SupportFormation
-from user_management.models import User
+from user_management.downloads import serve_file
 from .serializers import (
     FormationTypeSerializer, FormationTypeDetailSerializer,
     FormationSessionSerializer, FormationSessionListSerializer,
     FormationSessionCalendarSerializer, FormationSessionStatutSerializer,
-    FormationSessionDetailSerializer, SupportFormationSerializer
+    FormationSessionDetailSerializer, SupportFormationSerializer,
+    CALENDAR_CLASS_NAMES, CALENDAR_DEFAULT_CLASS_NAME,
 )
 from .permissions import (
     CanViewFormations, CanManageFormations,
@@ -19,6 +36,13 @@ from .permissions import (
 )
 
 
+# Pagination de la liste des formateurs éligibles
+class FormateurPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
 class FormationTypeViewSet(viewsets.ModelViewSet):
     queryset = FormationType.objects.all()
     
@@ -40,46 +64,47 @@ class FormationTypeViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Retourne la liste des FormationType avec :
-        - nombre_sessions (annoté)
-        - supports_count (annoté)
+        - nombre_sessions (sous-requête)
+        - supports_count (sous-requête)
         Filtrage selon le rôle de l'utilisateur
         """
-        from django.db.models import Count
-
-        # On part toujours de FormationType
-        queryset = FormationType.objects.all()
-
-        # LES 2 LIGNES MAGIQUES QUI FONT TOUT FONCTIONNER
-        queryset = queryset.annotate(
-            nombre_sessions=Count('sessions', distinct=True),
-            supports_count=Count('supports', distinct=True)
-        )
-
         user = self.request.user
 
-        # Admins voient tout
-        if user.role == 'admin':
-            return queryset
-
-        # Tous les stagiaires (intern) voient les formations
-        if user.role == 'intern':
-            return queryset
-
         # Superviseurs ne voient rien
         if user.role == 'supervisor':
             return FormationType.objects.none()
 
-        # Par défaut (visitor, etc.) → on montre tout aussi
-        return queryset
+        # Admins, stagiaires et autres rôles (visitor, etc.) voient tout.
+        # Une sous-requête COUNT par relation plutôt que deux Count(distinct)
+        # sur une double jointure sessions x supports.
+        sessions_count = (
+            FormationSession.objects.filter(formation_type=OuterRef('pk'))
+            .order_by().values('formation_type').annotate(total=Count('pk')).values('total')
+        )
+        supports_count = (
+            SupportFormation.objects.filter(formation_type=OuterRef('pk'))
+            .order_by().values('formation_type').annotate(total=Count('pk')).values('total')
+        )
+        return FormationType.objects.annotate(
+            nombre_sessions=Coalesce(Subquery(sessions_count, output_field=IntegerField()), 0),
+            supports_count=Coalesce(Subquery(supports_count, output_field=IntegerField()), 0),
+        )
+
+    def list(self, request, *args, **kwargs):
+        """Catalogue servi depuis le cache, invalidé à chaque modification"""
+        scope = 'none' if request.user.role == 'supervisor' else 'all'
+        cache_key = catalogue_cache_key(scope, request.get_full_path())
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, get_catalogue_cache_timeout())
+        return response
 
     def _is_formateur(self, user):
-        """Vérifie si un utilisateur intern peut être formateur (au moins 1 mois de stage)"""
-        if user.role != 'intern':
-            return False
-        
-        # Vérifier si l'utilisateur a au moins 1 mois d'ancienneté
-        one_month_ago = timezone.now() - timezone.timedelta(days=30)
-        return user.date_joined <= one_month_ago
+        """Vérifie si un utilisateur intern peut être formateur (flag maintenu chaque jour)"""
+        return is_formateur(user)
 
     def create(self, request, *args, **kwargs):
         """Création avec vérification de permission explicite"""
@@ -137,45 +162,20 @@ class FormationSessionViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
-        """Filtrage intelligent selon le rôle"""
-        user = self.request.user
-        
-        if user.role == 'admin':
-            return FormationSession.objects.all()
-        elif user.role == 'intern':
-            # Formateurs (intern avec +1 mois) voient leurs sessions + toutes les sessions
-            if self._is_formateur(user):
-                return FormationSession.objects.filter(
-                    models.Q(formateur=user) | 
-                    models.Q()  # Toutes les sessions
-                ).distinct()
-            else:
-                # Stagiaires normaux voient toutes les sessions mais ne peuvent pas être formateurs
-                return FormationSession.objects.all()
-        elif user.role == 'supervisor':
-            # Superviseurs ne voient PAS les sessions (rôle externe)
-            return FormationSession.objects.none()
-        else:
-            # Visiteurs voient toutes les sessions
-            return FormationSession.objects.all()
+        """
+        Filtrage selon le rôle (voir FormationSessionQuerySet.visible_to) :
+        admins, stagiaires (formateurs ou non) et visiteurs voient toutes les
+        sessions, les superviseurs n'en voient aucune.
+        """
+        return FormationSession.objects.visible_to(self.request.user).with_relations()
 
     def _is_formateur(self, user):
-        """Vérifie si un utilisateur intern peut être formateur (au moins 1 mois de stage)"""
-        if user.role != 'intern':
-            return False
-        
-        # Vérifier si l'utilisateur a au moins 1 mois d'ancienneté
-        one_month_ago = timezone.now() - timezone.timedelta(days=30)
-        return user.date_joined <= one_month_ago
+        """Vérifie si un utilisateur intern peut être formateur (flag maintenu chaque jour)"""
+        return is_formateur(user)
 
     def _get_formateurs_queryset(self):
         """Retourne le queryset des utilisateurs pouvant être formateurs"""
-        one_month_ago = timezone.now() - timezone.timedelta(days=30)
-        return User.objects.filter(
-            role='intern',
-            is_active=True,
-            date_joined__lte=one_month_ago  # Au moins 1 mois d'ancienneté
-        )
+        return eligible_formateurs()
 
     def perform_create(self, serializer):
         """Création avec vérification des permissions pour formateur"""
@@ -248,7 +248,7 @@ class FormationSessionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        sessions = FormationSession.objects.filter(formateur=request.user)
+        sessions = FormationSession.objects.led_by(request.user).with_relations()
         page = self.paginate_queryset(sessions)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -259,37 +259,118 @@ class FormationSessionViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def formateurs_eligibles(self, request):
-        """Liste des stagiaires éligibles comme formateurs"""
+        """Liste paginée des stagiaires éligibles comme formateurs (en cache)"""
         if request.user.role not in ['admin', 'intern']:
             return Response(
                 {"error": "Accès non autorisé"}, 
                 status=status.HTTP_403_FORBIDDEN
             )
-        
-        formateurs = self._get_formateurs_queryset()
-        data = [
+
+        cache_key = formateurs_cache_key(request.get_full_path())
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        formateurs = self._get_formateurs_queryset().order_by('date_joined', 'id').only(
+            'id', 'first_name', 'last_name', 'email', 'date_joined'
+        )
+        paginator = FormateurPagination()
+        page = paginator.paginate_queryset(formateurs, request, view=self)
+        now = timezone.now()
+        results = [
             {
                 'id': user.id,
                 'nom_complet': user.get_full_name(),
                 'email': user.email,
                 'date_inscription': user.date_joined,
-                'anciennete_mois': round((timezone.now() - user.date_joined).days / 30, 1)
+                'anciennete_mois': round((now - user.date_joined).days / 30, 1)
             }
-            for user in formateurs
+            for user in page
         ]
-        return Response(data)
+        response = paginator.get_paginated_response(results)
+        cache.set(cache_key, response.data, get_formateurs_cache_timeout())
+        return response
+
+    # Colonnes de la charge utile compacte du calendrier, dans l'ordre des tuples
+    CALENDAR_FIELDS = ['id', 'title', 'start', 'end', 'statut', 'formateur_nom', 'className']
+
+    def _parse_calendar_bound(self, value):
+        """Accepte une date (YYYY-MM-DD) ou une date-heure ISO 8601."""
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            parsed = datetime.combine(day, time.min)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
 
     @action(detail=False, methods=['get'])
     def calendar(self, request):
-        """Endpoint pour les données calendaire"""
-        sessions = self.get_queryset()
-        page = self.paginate_queryset(sessions)
-        if page is not None:
-            serializer = FormationSessionCalendarSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-            
-        serializer = FormationSessionCalendarSerializer(sessions, many=True)
-        return Response(serializer.data)
+        """
+        Sessions chevauchant la fenêtre [start, end) pour l'affichage calendaire.
+        Sans paramètres, la fenêtre est le mois courant.
+        Réponse compacte : {"fields": [...], "sessions": [[...], ...]}, avec ETag.
+        """
+        start_param = request.query_params.get('start')
+        end_param = request.query_params.get('end')
+        if start_param or end_param:
+            start = self._parse_calendar_bound(start_param) if start_param else None
+            end = self._parse_calendar_bound(end_param) if end_param else None
+            if start is None or end is None:
+                return Response(
+                    {"error": "Les paramètres start et end sont requis (format YYYY-MM-DD ou ISO 8601)."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            today = timezone.localdate()
+            start = timezone.make_aware(datetime.combine(today.replace(day=1), time.min))
+            end = timezone.make_aware(datetime.combine(
+                (today.replace(day=28) + timedelta(days=4)).replace(day=1), time.min
+            ))
+
+        max_days = getattr(settings, 'CALENDAR_MAX_WINDOW_DAYS', 366)
+        if end <= start or (end - start).days > max_days:
+            return Response(
+                {"error": f"La fenêtre doit être positive et ne pas dépasser {max_days} jours."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Chevauchement : commence avant la fin de la fenêtre et se termine après
+        # son début (une session sans date de fin est ponctuelle). Une seule
+        # requête, jointures comprises, sur l'index (date_debut, date_fin).
+        rows = (
+            self.get_queryset()
+            .filter(date_debut__lt=end)
+            .filter(Q(date_fin__gte=start) | Q(date_fin__isnull=True, date_debut__gte=start))
+            .order_by('date_debut', 'id')
+            .values_list(
+                'id', 'formation_type__nom', 'date_debut', 'date_fin', 'statut',
+                'formateur__first_name', 'formateur__last_name',
+            )
+        )
+        sessions = [
+            [
+                pk, nom, debut, fin, statut, f"{first_name or ''} {last_name or ''}".strip() or None,
+                CALENDAR_CLASS_NAMES.get(statut, CALENDAR_DEFAULT_CLASS_NAME),
+            ]
+            for pk, nom, debut, fin, statut, first_name, last_name in rows
+        ]
+        payload = {
+            'start': start,
+            'end': end,
+            'fields': self.CALENDAR_FIELDS,
+            'sessions': sessions,
+        }
+
+        etag = '"%s"' % hashlib.md5(
+            json.dumps(payload, cls=DjangoJSONEncoder).encode()
+        ).hexdigest()
+        if etag in request.headers.get('If-None-Match', ''):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        return Response(payload, headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
 
     @action(detail=False, methods=['get'])
     def a_venir(self, request):
@@ -340,7 +421,7 @@ class SupportFormationViewSet(viewsets.ModelViewSet):
     
     def get_permissions(self):
         """Permissions pour les supports"""
-        if self.action in ['list', 'retrieve', 'by_formation']:
+        if self.action in ['list', 'retrieve', 'by_formation', 'download', 'apercu']:
             permission_classes = [CanViewFormations]
         else:
             permission_classes = [CanManageFormations]
@@ -348,10 +429,6 @@ class SupportFormationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filtrage des supports selon le rôle"""
-        queryset = SupportFormation.objects.all()
-        # AJOUTE CETTE LIGNE → C’EST TOUT !
-        queryset = queryset.annotate(nombre_sessions=Count('sessions'))
-        
         user = self.request.user
         formation_type_id = self.request.query_params.get('formation_type')
         
@@ -376,13 +453,8 @@ class SupportFormationViewSet(viewsets.ModelViewSet):
         return queryset
 
     def _is_formateur(self, user):
-        """Vérifie si un utilisateur intern peut être formateur (au moins 1 mois de stage)"""
-        if user.role != 'intern':
-            return False
-        
-        # Vérifier si l'utilisateur a au moins 1 mois d'ancienneté
-        one_month_ago = timezone.now() - timezone.timedelta(days=30)
-        return user.date_joined <= one_month_ago
+        """Vérifie si un utilisateur intern peut être formateur (flag maintenu chaque jour)"""
+        return is_formateur(user)
 
     def perform_create(self, serializer):
         """Création avec vérification des permissions"""
@@ -428,4 +500,43 @@ class SupportFormationViewSet(viewsets.ModelViewSet):
             return Response(
                 {"error": "ID de formation invalide"}, 
                 status=status.HTTP_400_BAD_REQUEST
-            )
\ No newline at end of file
+            )
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Téléchargement du fichier support (Range, ETag, Last-Modified)"""
+        support = self.get_object()
+        if not support.fichier:
+            return Response({"error": "Aucun fichier pour ce support."}, status=status.HTTP_404_NOT_FOUND)
+
+        return serve_file(
+            request,
+            support.fichier,
+            download_name=f"{support.titre}{support.extension or ''}",
+            content_type=support.type_mime or None,
+            size=support.taille_octets,
+            etag=f'"{support.checksum_sha256}"' if support.checksum_sha256 else None,
+            as_attachment=request.query_params.get('attachment') in ('1', 'true'),
+        )
+
+    @action(detail=True, methods=['get'])
+    def apercu(self, request, pk=None):
+        """Aperçu JPEG du support (quelques Ko, mis en cache par le navigateur)"""
+        support = self.get_object()
+        if not support.apercu:
+            return Response(
+                {"error": "Aperçu non disponible.", "apercu_statut": support.apercu_statut},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Le nom de l'aperçu dérive de son contenu : il sert d'ETag
+        etag = '"{}"'.format(os.path.splitext(os.path.basename(support.apercu.name))[0])
+        response = serve_file(
+            request,
+            support.apercu,
+            download_name=f"{support.titre}.jpg",
+            content_type='image/jpeg',
+            etag=etag,
+        )
+        response['Cache-Control'] = 'private, max-age=86400'
+        return response
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 import re, logging
-from user_management.models import Profile, User
+from user_management.models import OneTimeToken, Profile, User
 from django.core.validators import validate_email as django_validate_email
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.contrib.auth.password_validation import validate_password
@@ -190,17 +190,17 @@ class ActivationSerializer(serializers.Serializer):
             
             # Validation du token
             print("Recherche de l'utilisateur:", data['email'])
-            user = User.objects.get(
-                email__iexact=data['email'], 
-                activation_token=data['activation_token']
-            )
+            token = OneTimeToken.objects.lookup(data['activation_token'], OneTimeToken.Purpose.ACTIVATION)
+            if token is None or token.user.email.lower() != data['email'].lower():
+                raise User.DoesNotExist
+            user = token.user
             print("Utilisateur trouvé:", user.email)
             
             if user.is_active:
                 print("Utilisateur déjà actif")
                 raise serializers.ValidationError('Le compte est déjà activé.')
                 
-            if not user.is_activation_token_valid(data['activation_token']):
+            if not token.is_usable:
                 print("Token invalide ou expiré")
                 raise serializers.ValidationError('Token d\'activation invalide ou expiré.')
                 
@@ -221,14 +221,17 @@ class ActivationSerializer(serializers.Serializer):
         print("Activation de l'utilisateur:", user.email)
         
         user.is_active = True
-        user.activation_token = None
-        user.activation_token_expiry = None
         user.set_password(self.validated_data['password'])
         user.must_change_password = False
         user.status = User.Status.ACTIVE
         
         print("Sauvegarde de l'utilisateur...")
-        user.save()
+        from django.db import transaction
+        with transaction.atomic():
+            # Usage unique : une activation concurrente avec le même token échoue ici
+            if not OneTimeToken.objects.consume(self.validated_data['activation_token'], OneTimeToken.Purpose.ACTIVATION):
+                raise serializers.ValidationError('Token d\'activation invalide ou expiré.')
+            user.save()
         print("Utilisateur sauvegardé")
         
         return user
@@ -447,4 +450,38 @@ class UserCreateSerializer(serializers.ModelSerializer):
             logger.error(f"Échec de la création de l'utilisateur {validated_data.get('email')}: {str(e)}")
             raise serializers.ValidationError(
                 f"La création de l'utilisateur a échoué: {str(e)}"
-            )
\ No newline at end of file
+            )
+# Serializer pour les opérations de cycle de vie en masse
+class BulkUserLifecycleSerializer(serializers.Serializer):
+    ACTION_CHOICES = ['archive', 'restore', 'delete', 'change_role']
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=1000  # ← Limite de sécurité
+    )
+    filters = serializers.DictField(required=False)
+    role = serializers.ChoiceField(choices=[choice[0] for choice in User.ROLE_CHOICES], required=False)
+
+    def validate_filters(self, value):
+        """N'accepte que les filtres connus pour éviter un lot involontairement global."""
+        allowed = {'role', 'domain', 'university', 'is_active'}
+        unknown = set(value) - allowed
+        if unknown:
+            raise serializers.ValidationError(f"Filtres inconnus: {', '.join(sorted(unknown))}")
+        if not any(v not in (None, '') for v in value.values()):
+            raise serializers.ValidationError('Au moins un filtre doit être renseigné.')
+        if value.get('is_active') not in (None, ''):
+            value['is_active'] = serializers.BooleanField().to_internal_value(value['is_active'])
+        return value
+
+    def validate(self, data):
+        if not data.get('ids') and not data.get('filters'):
+            raise serializers.ValidationError('Fournir une liste "ids" ou des "filters".')
+        if data['action'] == 'change_role' and not data.get('role'):
+            raise serializers.ValidationError({'role': 'Le rôle cible est requis pour change_role.'})
+        if data.get('ids'):
+            data['ids'] = list(dict.fromkeys(data['ids']))
+        return data
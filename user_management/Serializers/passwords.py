@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from user_management.models import User
+from django.db import transaction
+from user_management.models import OneTimeToken, User
 from django.contrib.auth.password_validation import validate_password
 
 
@@ -24,25 +25,24 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         """Valide le token de réinitialisation."""
-        try:
-            user = User.objects.get(password_reset_token=attrs['token'])
-            
-            if not user.is_password_reset_token_valid(attrs['token']):
-                raise serializers.ValidationError('Token de réinitialisation invalide ou expiré.')
-                
-            attrs['user'] = user
-            return attrs
-            
-        except User.DoesNotExist:
+        token = OneTimeToken.objects.lookup(attrs['token'], OneTimeToken.Purpose.PASSWORD_RESET)
+        if token is None:
             raise serializers.ValidationError('Token de réinitialisation invalide.')
 
+        if not token.is_usable:
+            raise serializers.ValidationError('Token de réinitialisation invalide ou expiré.')
+
+        attrs['user'] = token.user
+        return attrs
+
     def save(self):
 
         """Sauvegarde le nouveau mot de passe."""
         user = self.validated_data['user']
         user.set_password(self.validated_data['new_password'])
-        user.password_reset_token = None
-        user.password_reset_token_expiry = None
         user.must_change_password = False
-        user.save()
+        with transaction.atomic():
+            if not OneTimeToken.objects.consume(self.validated_data['token'], OneTimeToken.Purpose.PASSWORD_RESET):
+                raise serializers.ValidationError('Token de réinitialisation invalide ou expiré.')
+            user.save()
 
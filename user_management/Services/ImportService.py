@@ -12,6 +12,7 @@ from datetime import timedelta
 from django.core.exceptions import ValidationError
 from django.db import transaction, IntegrityError
 from django.contrib.auth import get_user_model
+from user_management.models import OneTimeToken
 from django.utils.translation import gettext_lazy as _
 import re , string, random
 from rest_framework.exceptions import ValidationError as DRFValidationError
@@ -131,6 +132,10 @@ class UserImportService:
 
         try:
             self.model.objects.bulk_create(users_to_create, ignore_conflicts=False)
+            # bulk_create ne passe pas par save() : les tokens sont enregistrés à part
+            OneTimeToken.objects.bulk_issue(OneTimeToken.Purpose.ACTIVATION, [
+                (user, user.activation_token, user.activation_token_expiry) for user in users_to_create
+            ])
         except Exception as e:
             self.log_error('import_users_db_integrity_error', e, {'imported_by': imported_by})
             raise
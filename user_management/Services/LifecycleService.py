@@ -0,0 +1,174 @@
+# users/Services/LifecycleService.py
+"""Opérations de cycle de vie en masse (archivage, restauration, suppression, rôle).
+Chaque opération est appliquée avec un seul QuerySet.update()."""
+
+import logging
+from django.db import transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
+from django.contrib.auth import get_user_model
+from django.utils.timezone import now
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+class UserLifecycleService:
+    """Service dédié aux opérations de cycle de vie appliquées à un lot d'utilisateurs."""
+
+    ARCHIVE = 'archive'
+    RESTORE = 'restore'
+    DELETE = 'delete'
+    CHANGE_ROLE = 'change_role'
+    ACTIONS = (ARCHIVE, RESTORE, DELETE, CHANGE_ROLE)
+
+    # Raisons de rejet, alignées sur les messages de UserDetailView
+    SKIP_REASONS = {
+        ARCHIVE: 'Utilisateur déjà archivé.',
+        RESTORE: 'Utilisateur déjà actif.',
+        DELETE: 'Utilisateur déjà supprimé.',
+        CHANGE_ROLE: 'Utilisateur a déjà ce rôle.',
+    }
+
+    @staticmethod
+    def build_queryset(ids=None, filters=None):
+        """Construit le queryset cible à partir d'une liste d'ids ou de filtres."""
+        queryset = User.objects.all()
+        if ids:
+            queryset = queryset.filter(pk__in=ids)
+
+        filters = filters or {}
+        role = filters.get('role')
+        domain = filters.get('domain')
+        university = filters.get('university')
+        is_active = filters.get('is_active')
+
+        if role:
+            queryset = queryset.filter(role=role)
+        if domain:
+            queryset = queryset.filter(profile__domain_study__icontains=domain)
+        if university:
+            queryset = queryset.filter(profile__university_studies__icontains=university)
+        if is_active not in (None, ''):
+            queryset = queryset.filter(is_active=is_active)
+        return queryset
+
+    @classmethod
+    def _eligible(cls, action, is_active, current_role, role=None):
+        """Indique si un utilisateur peut recevoir l'action demandée."""
+        if action in (cls.ARCHIVE, cls.DELETE):
+            return is_active
+        if action == cls.RESTORE:
+            return not is_active
+        return current_role != role
+
+    @classmethod
+    def _update_kwargs(cls, action, admin_user, role=None):
+        """Valeurs écrites par l'UPDATE, identiques aux opérations unitaires."""
+        timestamp = now()
+        if action == cls.ARCHIVE:
+            return {
+                'is_active': False,
+                'status': 'Archivé',
+                'deleted_at': timestamp,
+                'deleted_by': admin_user,
+            }
+        if action == cls.RESTORE:
+            return {
+                'is_active': True,
+                'status': 'Actif',
+                'deleted_at': None,
+                'deleted_by': None,
+            }
+        if action == cls.DELETE:
+            pk_str = Cast('pk', output_field=CharField())
+            return {
+                'is_active': False,
+                'email': Concat(Value('deleted_'), pk_str, Value('@removed.local'),
+                                output_field=CharField()),
+                'first_name': 'Deleted',
+                'last_name': Concat(Value('User_'), pk_str, output_field=CharField()),
+                'phone_number': '',
+                'deleted_at': timestamp,
+                'deleted_by': admin_user,
+            }
+        kwargs = {'role': role}
+        if role == 'admin':
+            # Contrainte admin_requires_staff
+            kwargs['is_staff'] = True
+        else:
+            # Un admin rétrogradé perd l'accès à l'admin Django et aux permissions IsAdminUser
+            kwargs['is_staff'] = False
+            kwargs['is_superuser'] = False
+        return kwargs
+
+    @staticmethod
+    def _invalidate_caches():
+        """QuerySet.update() ne déclenche aucun signal : caches dépendant des utilisateurs."""
+        from internship_management.cache import invalidate_available_interns_count
+        from training_management.cache import invalidate_formateurs_cache
+        invalidate_available_interns_count()
+        invalidate_formateurs_cache()
+
+    @classmethod
+    def apply(cls, action, admin_user, ids=None, filters=None, role=None):
+        """
+        Applique l'action au lot et retourne les résultats par id.
+        :return: dict avec 'updated', 'skipped', 'not_found' et 'results'
+        """
+        if action not in cls.ACTIONS:
+            raise ValueError(f"Action inconnue: {action}")
+
+        queryset = cls.build_queryset(ids, filters)
+        rows = list(queryset.values_list('pk', 'is_active', 'role'))
+
+        results = {}
+        eligible_ids = []
+        for pk, is_active, current_role in rows:
+            if pk == admin_user.pk:
+                results[pk] = {'status': 'skipped', 'detail': 'Action impossible sur votre propre compte.'}
+            elif cls._eligible(action, is_active, current_role, role):
+                eligible_ids.append(pk)
+            else:
+                results[pk] = {'status': 'skipped', 'detail': cls.SKIP_REASONS[action]}
+
+        if ids:
+            found = {pk for pk, _, _ in rows}
+            for pk in ids:
+                if pk not in found:
+                    results[pk] = {'status': 'not_found', 'detail': 'Utilisateur introuvable.'}
+
+        updated_count = 0
+        if eligible_ids:
+            with transaction.atomic():
+                # La condition d'éligibilité est répétée dans le WHERE pour rester
+                # correcte si un autre admin modifie le lot entre-temps.
+                target = User.objects.filter(pk__in=eligible_ids)
+                if action in (cls.ARCHIVE, cls.DELETE):
+                    target = target.filter(is_active=True)
+                elif action == cls.RESTORE:
+                    target = target.filter(is_active=False)
+                else:
+                    target = target.exclude(role=role)
+                updated_ids = set(target.select_for_update().values_list('pk', flat=True))
+                updated_count = target.update(**cls._update_kwargs(action, admin_user, role))
+                if updated_count:
+                    from training_management.formateurs import refresh_formateur_eligibility
+                    refresh_formateur_eligibility(ids=updated_ids)
+                    transaction.on_commit(cls._invalidate_caches)
+
+            for pk in eligible_ids:
+                if pk in updated_ids:
+                    results[pk] = {'status': 'updated'}
+                else:
+                    results[pk] = {'status': 'skipped', 'detail': cls.SKIP_REASONS[action]}
+
+        summary = {'updated': 0, 'skipped': 0, 'not_found': 0}
+        for outcome in results.values():
+            summary[outcome['status']] += 1
+
+        logger.info(f"Bulk {action}: {updated_count} utilisateurs modifiés par {admin_user.email}")
+        return {
+            **summary,
+            'results': [{'id': pk, **outcome} for pk, outcome in sorted(results.items())],
+        }
@@ -0,0 +1,247 @@
+# users/Services/UploadService.py
+"""Téléversement par morceaux reprenable (protocole inspiré de tus).
+
+Le client crée une session en annonçant la taille totale, envoie ensuite le
+contenu par requêtes PATCH successives en précisant l'offset (Upload-Offset),
+puis demande la complétion. Après une coupure, il interroge l'offset courant
+et reprend à partir de là : seuls les octets manquants sont renvoyés."""
+
+import logging
+import os
+import shutil
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+
+from user_management.models import UploadSession
+from user_management.storage import content_store, inspect_upload
+
+logger = logging.getLogger(__name__)
+
+# Taille des lectures sur le flux de la requête
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """Erreur de protocole ; `status_code` est le code HTTP à renvoyer."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _allowed_extensions(target):
+    """Extensions autorisées par cible, reprises des sérialiseurs existants."""
+    if target == UploadSession.Target.SUPPORT:
+        from training_management.serializers import SUPPORT_ALLOWED_EXTENSIONS
+        return [ext.lstrip('.') for ext in SUPPORT_ALLOWED_EXTENSIONS]
+    from project_management.serializers import PROJET_ALLOWED_EXTENSIONS
+    return PROJET_ALLOWED_EXTENSIONS
+
+
+class ChunkedUploadService:
+    """Création, ajout de morceaux, complétion et abandon d'une session."""
+
+    @staticmethod
+    def temp_path(session):
+        return content_store.path(session.temp_name)
+
+    @classmethod
+    def create(cls, owner, target, filename, total_size, content_type=''):
+        max_size = getattr(settings, 'CHUNKED_UPLOAD_MAX_SIZE', 2 * 1024 * 1024 * 1024)
+        if total_size > max_size:
+            raise UploadError(f"Le fichier dépasse la taille maximale ({max_size} octets).", 413)
+
+        ext = os.path.splitext(filename)[1].lstrip('.').lower()
+        allowed = _allowed_extensions(target)
+        if ext not in allowed:
+            raise UploadError(f"Extension non autorisée. Utilisez: {', '.join(allowed)}")
+
+        session = UploadSession.objects.create(
+            owner=owner,
+            target=target,
+            filename=os.path.basename(filename),
+            content_type=content_type,
+            total_size=total_size,
+        )
+        path = cls.temp_path(session)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'wb').close()
+        return session
+
+    @classmethod
+    def append(cls, session_id, owner, offset, stream, length):
+        """
+        Écrit `length` octets de `stream` à la position `offset`.
+        L'offset doit correspondre aux octets déjà reçus : un morceau rejoué ou
+        décalé est refusé (409) et le client doit relire l'offset courant.
+        """
+        max_chunk = getattr(settings, 'CHUNKED_UPLOAD_CHUNK_MAX_SIZE', 8 * 1024 * 1024)
+        if length > max_chunk:
+            raise UploadError(f"Morceau trop volumineux (max {max_chunk} octets).", 413)
+
+        with transaction.atomic():
+            # Le verrou sérialise les PATCH concurrents d'une même session
+            session = cls._get_pending(session_id, owner, lock=True)
+            if offset != session.received:
+                raise UploadError(f"Offset attendu: {session.received}.", 409)
+            if session.received + length > session.total_size:
+                raise UploadError("Le morceau dépasse la taille annoncée.", 413)
+
+            path = cls.temp_path(session)
+            written = 0
+            # r+b + seek : les octets d'un morceau interrompu au-delà de
+            # `received` sont écrasés plutôt qu'ajoutés à la suite
+            with open(path, 'r+b') as part:
+                part.seek(session.received)
+                while written < length:
+                    block = stream.read(min(READ_BLOCK_SIZE, length - written))
+                    if not block:
+                        break
+                    part.write(block)
+                    written += len(block)
+                part.truncate()
+
+            session.received += written
+            session.save(update_fields=['received', 'updated_at'])
+        return session
+
+    @classmethod
+    def complete(cls, session_id, owner, attach_data):
+        """
+        Range le fichier reçu dans le store et l'associe à sa cible.
+        Le fichier partiel est haché en une lecture puis déplacé (os.replace)
+        sous son nom de contenu, sans recopie. Les données de la cible sont
+        validées avant le déplacement : une complétion refusée peut être rejouée.
+        """
+        with transaction.atomic():
+            session = cls._get_pending(session_id, owner, lock=True)
+            if not session.is_complete:
+                raise UploadError(f"Téléversement incomplet ({session.received}/{session.total_size} octets).", 409)
+
+            path = cls.temp_path(session)
+            try:
+                with open(path, 'rb') as part:
+                    metadata = inspect_upload(File(part), session.filename)
+            except FileNotFoundError:
+                raise UploadError("Fichier partiel introuvable, recommencez le téléversement.", 410)
+            if session.content_type:
+                metadata['mime_type'] = session.content_type
+
+            instance = cls._attach(session, metadata, attach_data)
+
+            session.status = UploadSession.Status.COMPLETE
+            session.stored_name = instance.fichier.name
+            session.save(update_fields=['status', 'stored_name', 'updated_at'])
+
+        logger.info(f"Chunked upload {session.pk} completed: {session.stored_name} ({metadata['size']} octets)")
+        return session, instance
+
+    @classmethod
+    def abort(cls, session_id, owner):
+        with transaction.atomic():
+            session = cls._get_pending(session_id, owner, lock=True)
+            cls.discard_temp(session)
+            session.delete()
+
+    @classmethod
+    def discard_temp(cls, session):
+        try:
+            os.remove(cls.temp_path(session))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _get_pending(session_id, owner, lock=False):
+        queryset = UploadSession.objects.filter(pk=session_id, owner=owner)
+        if lock:
+            queryset = queryset.select_for_update()
+        session = queryset.first()
+        if session is None:
+            raise UploadError("Session de téléversement introuvable.", 404)
+        if session.status != UploadSession.Status.PENDING:
+            raise UploadError("Session déjà terminée.", 409)
+        if session.is_expired:
+            raise UploadError("Session de téléversement expirée.", 410)
+        return session
+
+    @classmethod
+    def _attach(cls, session, metadata, data):
+        """Associe le contenu au support ou au projet désigné par `data`."""
+        if session.target == UploadSession.Target.SUPPORT:
+            return cls._attach_support(session, metadata, data)
+        return cls._attach_projet(session, metadata, data)
+
+    @staticmethod
+    def _store(session, metadata):
+        return content_store.store_temp(
+            metadata['checksum'], ChunkedUploadService.temp_path(session), metadata['extension']
+        )
+
+    @classmethod
+    def _store_and_save(cls, session, metadata, instance, **save_kwargs):
+        """
+        Range le fichier partiel dans le store puis enregistre la ligne. Si
+        l'enregistrement échoue, le fichier partiel est recopié depuis le store
+        (le contenu peut y être partagé, il n'est pas retiré) : la transaction
+        est annulée et une nouvelle complétion reste possible.
+        """
+        instance.fichier = cls._store(session, metadata)
+        try:
+            instance.save(**save_kwargs)
+        except Exception:
+            shutil.copyfile(content_store.path(instance.fichier.name), cls.temp_path(session))
+            raise
+
+    @classmethod
+    def _attach_support(cls, session, metadata, data):
+        from training_management.models import FormationType, SupportFormation
+
+        formation_type = FormationType.objects.filter(pk=data.get('formation_type')).first()
+        if formation_type is None:
+            raise UploadError("formation_type invalide.")
+        titre = (data.get('titre') or '').strip()
+        if not titre:
+            raise UploadError("Le titre est requis.")
+        type_support = data.get('type_support') or 'PDF'
+        valid_types = dict(SupportFormation._meta.get_field('type_support').choices)
+        if type_support not in valid_types:
+            raise UploadError(f"type_support invalide. Utilisez: {', '.join(valid_types)}")
+
+        support = SupportFormation(
+            formation_type=formation_type,
+            titre=titre[:200],
+            description=data.get('description') or '',
+            type_support=type_support,
+        )
+        try:
+            support.full_clean(exclude=['fichier', 'apercu'])
+        except ValidationError as exc:
+            raise UploadError(' '.join(exc.messages))
+        support.apply_metadata(metadata)
+        # Nom déjà enregistré dans le store : save() ne relit pas le fichier
+        cls._store_and_save(session, metadata, support)
+        return support
+
+    @classmethod
+    def _attach_projet(cls, session, metadata, data):
+        from project_management.models import Projet
+
+        projet = Projet.objects.select_for_update().filter(pk=data.get('projet')).first()
+        if projet is None:
+            raise UploadError("Projet introuvable.", 404)
+        cls._store_and_save(session, metadata, projet, update_fields=['fichier'])
+        return projet
+
+    @classmethod
+    def purge_expired(cls):
+        """Supprime les sessions expirées et leurs fichiers partiels."""
+        deleted = 0
+        for session in UploadSession.objects.expired().iterator():
+            cls.discard_temp(session)
+            session.delete()
+            deleted += 1
+        return deleted
@@ -0,0 +1,40 @@
+"""users/authentication.py
+Authentification JWT chargeant une vue allégée de l'utilisateur.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class SlimUserJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication dont request.user est chargé via User.objects.auth_view() :
+    seules les colonnes utiles à l'authentification et aux permissions sont lues,
+    le reste de la ligne est chargé à la demande.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        queryset = self.user_model.objects.auth_view()
+        if api_settings.CHECK_REVOKE_TOKEN:
+            queryset = queryset.only(*self.user_model.AUTH_FIELDS, 'password')
+
+        try:
+            user = queryset.get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
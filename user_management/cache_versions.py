@@ -0,0 +1,27 @@
+"""users/cache_versions.py
+Versions des clés de cache partagées par les applications (catalogue de
+formations, formateurs, fil d'annonces, statistiques de projets).
+
+Une clé de cache contient la version courante de son espace : incrémenter la
+version rend toutes les entrées de l'espace obsolètes sans avoir à les
+énumérer. Les entrées orphelines expirent avec leur durée de vie.
+"""
+from django.core.cache import cache
+
+
+def get_version(version_key):
+    """Version courante de l'espace `version_key`, créée à 1 si absente."""
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, 1, None)
+        version = cache.get(version_key, 1)
+    return version
+
+
+def bump_version(version_key):
+    """Incrémente la version : les clés construites avec l'ancienne ne sont plus lues."""
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Clé absente (expirée ou cache vidé) : repartir d'une nouvelle version
+        cache.set(version_key, 1, None)
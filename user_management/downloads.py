@@ -0,0 +1,166 @@
+"""users/downloads.py
+Téléchargement authentifié des fichiers (supports de formation, projets).
+
+Les fichiers sont servis par blocs, jamais chargés entièrement en mémoire, avec
+gestion des requêtes HTTP Range (lecture vidéo, reprise de téléchargement) et
+des requêtes conditionnelles (ETag / Last-Modified).
+Si MEDIA_ACCEL_REDIRECT_PREFIX est défini, l'envoi est délégué à nginx via
+X-Accel-Redirect après le contrôle des permissions.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def _file_etag(name, size, modified):
+    """ETag fort : empreinte du contenu pour le stockage adressé par contenu, sinon taille et date."""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if SHA256_PATTERN.match(stem):
+        return f'"{stem}"'
+    return f'"{size:x}-{int(modified or 0):x}"'
+
+
+class RangeNotSatisfiable(Exception):
+    """Plage unique bien formée mais hors du fichier (416)."""
+
+
+def _parse_range(header, size):
+    """
+    Retourne (début, fin incluse) pour une plage unique.
+    None si l'en-tête n'est pas pris en charge (plusieurs plages, autre unité,
+    syntaxe invalide) : il est alors ignoré et le fichier entier est servi
+    (RFC 7233, section 3.1). RangeNotSatisfiable si la plage est hors du fichier.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if start == '' and end == '':
+        return None
+    if start == '':
+        # Suffixe : les N derniers octets
+        length = int(end)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(start)
+    if end and int(end) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(end), size - 1) if end else size - 1
+    return start, end
+
+
+def _iter_range(file, start, length):
+    """Lit `length` octets à partir de `start`, par blocs, puis ferme le fichier."""
+    try:
+        file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def serve_file(request, fieldfile, download_name=None, content_type=None, size=None,
+               etag=None, as_attachment=False):
+    """
+    Construit la réponse de téléchargement d'un FieldFile.
+    :param size: taille connue (évite un stat), sinon lue sur le stockage
+    :param etag: ETag explicite, sinon dérivé du nom de fichier
+    """
+    storage = fieldfile.storage
+    name = fieldfile.name
+    download_name = download_name or os.path.basename(name)
+    content_type = content_type or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    try:
+        modified = storage.get_modified_time(name).timestamp()
+    except (NotImplementedError, OSError):
+        modified = None
+    if size is None:
+        try:
+            size = storage.size(name)
+        except OSError:
+            raise Http404("Fichier introuvable.")
+    etag = etag or _file_etag(name, size, modified)
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=modified and int(modified))
+    if not_modified is not None:
+        return not_modified
+
+    headers = {
+        'ETag': etag,
+        'Accept-Ranges': 'bytes',
+        'Content-Disposition': content_disposition_header(as_attachment, download_name),
+        'Cache-Control': 'private, max-age=0, must-revalidate',
+    }
+    if modified:
+        headers['Last-Modified'] = http_date(modified)
+
+    accel_prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '')
+    if accel_prefix:
+        # nginx gère lui-même Range et l'envoi du fichier
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(name)
+        return response
+
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and if_range:
+        # Plage ignorée si le fichier a changé depuis la première requête
+        if_range_date = parse_http_date_safe(if_range)
+        if if_range != etag and not (if_range_date and modified and int(modified) <= if_range_date):
+            range_header = None
+
+    byte_range = None
+    if range_header:
+        try:
+            byte_range = _parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416, headers=headers)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    try:
+        file = storage.open(name, 'rb')
+    except OSError:
+        raise Http404("Fichier introuvable.")
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(file, start, length),
+            status=206,
+            content_type=content_type,
+            headers=headers,
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        return response
+
+    response = FileResponse(
+        file,
+        content_type=content_type,
+        as_attachment=as_attachment,
+        filename=download_name,
+        headers=headers,
+    )
+    response.block_size = DOWNLOAD_CHUNK_SIZE
+    return response
@@ -0,0 +1,157 @@
+"""user_management/maintenance.py
+Tâches de maintenance exécutées par lots bornés de clés primaires.
+Chaque lot est une transaction courte : les écritures des utilisateurs ne
+sont jamais bloquées plus de quelques millisecondes.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_CACHE_PREFIX = "maintenance:"
+MAINTENANCE_METRICS_TIMEOUT = 60 * 60 * 24 * 7  # 7 jours
+
+
+class BatchedJob:
+    """
+    Traite un queryset par lots de clés primaires croissantes.
+    Les sous-classes définissent `name`, `get_queryset()` et `apply_batch()`.
+
+    La progression (dernier pk traité) est conservée dans le cache : une tâche
+    interrompue reprend là où elle s'était arrêtée.
+    """
+    name = None
+    batch_size = None
+    pause = None
+
+    def __init__(self, batch_size=None, pause=None):
+        self.batch_size = batch_size or self.batch_size or getattr(settings, 'MAINTENANCE_BATCH_SIZE', 500)
+        self.pause = pause if pause is not None else (
+            self.pause if self.pause is not None else getattr(settings, 'MAINTENANCE_BATCH_PAUSE', 0.1)
+        )
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def apply_batch(self, queryset):
+        """Applique l'opération aux lignes verrouillées et retourne le nombre de lignes touchées."""
+        raise NotImplementedError
+
+    @property
+    def cursor_key(self):
+        return f"{MAINTENANCE_CACHE_PREFIX}{self.name}:cursor"
+
+    @property
+    def metrics_key(self):
+        return f"{MAINTENANCE_CACHE_PREFIX}{self.name}:metrics"
+
+    def _process_batch(self, queryset, pks):
+        """Verrouille les lignes libres du lot et leur applique l'opération."""
+        with transaction.atomic():
+            # skip_locked : une ligne en cours d'écriture par un utilisateur est
+            # simplement ignorée, elle sera traitée au prochain passage.
+            locked = list(
+                queryset.filter(pk__in=pks)
+                .select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)
+            )
+            if not locked:
+                return 0
+            return self.apply_batch(queryset.model._default_manager.filter(pk__in=locked))
+
+    def run(self):
+        """Exécute le job jusqu'à épuisement et retourne les métriques."""
+        started_at = timezone.now()
+        start = time.monotonic()
+        last_pk = cache.get(self.cursor_key, 0)
+        metrics = {
+            'name': self.name,
+            'started_at': started_at.isoformat(),
+            'resumed_from_pk': last_pk,
+            'batches': 0,
+            'rows_affected': 0,
+            'finished_at': None,
+            'duration_seconds': None,
+        }
+
+        queryset = self.get_queryset()
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:self.batch_size]
+            )
+            if not pks:
+                break
+
+            metrics['rows_affected'] += self._process_batch(queryset, pks)
+            metrics['batches'] += 1
+            last_pk = pks[-1]
+
+            cache.set(self.cursor_key, last_pk, MAINTENANCE_METRICS_TIMEOUT)
+            cache.set(self.metrics_key, {**metrics, 'last_pk': last_pk}, MAINTENANCE_METRICS_TIMEOUT)
+
+            if len(pks) < self.batch_size:
+                break
+            if self.pause:
+                time.sleep(self.pause)
+
+        cache.delete(self.cursor_key)
+        metrics['finished_at'] = timezone.now().isoformat()
+        metrics['duration_seconds'] = round(time.monotonic() - start, 3)
+        cache.set(self.metrics_key, {**metrics, 'last_pk': last_pk}, MAINTENANCE_METRICS_TIMEOUT)
+
+        logger.info(
+            f"Maintenance {self.name}: {metrics['rows_affected']} lignes en {metrics['batches']} lots "
+            f"({metrics['duration_seconds']}s)"
+        )
+        return metrics
+
+
+class BatchedUpdateJob(BatchedJob):
+    """UPDATE par lots ; les sous-classes définissent `get_update_values()`."""
+
+    def get_update_values(self):
+        raise NotImplementedError
+
+    def apply_batch(self, queryset):
+        return queryset.update(**self.get_update_values())
+
+
+class BatchedDeleteJob(BatchedJob):
+    """DELETE par lots."""
+
+    def apply_batch(self, queryset):
+        deleted, _ = queryset.delete()
+        return deleted
+
+
+class OneTimeTokenPurge(BatchedDeleteJob):
+    """Supprime les tokens à usage unique expirés ou consommés d'un usage donné."""
+    purpose = None
+
+    def get_queryset(self):
+        from user_management.models import OneTimeToken
+        return OneTimeToken.objects.purgeable().filter(purpose=self.purpose)
+
+
+class ExpiredActivationTokenCleanup(OneTimeTokenPurge):
+    """Purge les tokens d'activation expirés ou consommés."""
+    name = 'expired_activation_tokens'
+    purpose = 'activation'
+
+
+class ExpiredPasswordResetTokenCleanup(OneTimeTokenPurge):
+    """Purge les tokens de réinitialisation de mot de passe expirés ou consommés."""
+    name = 'expired_password_reset_tokens'
+    purpose = 'password_reset'
+
+
+def get_maintenance_metrics(name):
+    """Retourne les dernières métriques enregistrées pour un job."""
+    return cache.get(f"{MAINTENANCE_CACHE_PREFIX}{name}:metrics")
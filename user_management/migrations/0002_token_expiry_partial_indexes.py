@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('internship_management', '0001_initial'),
+        ('user_management', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('activation_token_expiry__isnull', False)), fields=['activation_token_expiry'], name='user_activation_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('password_reset_token_expiry__isnull', False)), fields=['password_reset_token_expiry'], name='user_reset_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:10
+
+import hashlib
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_pending_tokens(apps, schema_editor):
+    """Reprend les tokens encore en attente avant la suppression des colonnes."""
+    User = apps.get_model('user_management', 'User')
+    OneTimeToken = apps.get_model('user_management', 'OneTimeToken')
+
+    def token_hash(token):
+        return hashlib.sha256(str(token).strip().lower().encode()).hexdigest()
+
+    tokens = []
+    pending = User.objects.filter(activation_token__isnull=False, activation_token_expiry__isnull=False)
+    for user_id, token, expiry in pending.values_list('pk', 'activation_token', 'activation_token_expiry').iterator():
+        tokens.append(OneTimeToken(user_id=user_id, purpose='activation',
+                                   token_hash=token_hash(token), expires_at=expiry))
+    pending = User.objects.filter(password_reset_token__isnull=False, password_reset_token_expiry__isnull=False)
+    for user_id, token, expiry in pending.values_list('pk', 'password_reset_token', 'password_reset_token_expiry').iterator():
+        tokens.append(OneTimeToken(user_id=user_id, purpose='password_reset',
+                                   token_hash=token_hash(token), expires_at=expiry))
+    OneTimeToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_management', '0002_token_expiry_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OneTimeToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('purpose', models.CharField(choices=[('activation', 'Activation'), ('password_reset', 'Réinitialisation du mot de passe')], max_length=20, verbose_name='purpose')),
+                ('token_hash', models.CharField(max_length=64, unique=True, verbose_name='token hash')),
+                ('expires_at', models.DateTimeField(verbose_name='expires at')),
+                ('used_at', models.DateTimeField(blank=True, null=True, verbose_name='used at')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+            ],
+            options={
+                'verbose_name': 'one-time token',
+                'verbose_name_plural': 'one-time tokens',
+            },
+        ),
+        migrations.AddField(
+            model_name='onetimetoken',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='one_time_tokens', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='onetimetoken',
+            index=models.Index(fields=['expires_at'], name='user_manage_expires_c7d762_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='onetimetoken',
+            index=models.Index(fields=['user', 'purpose'], name='user_manage_user_id_85f358_idx'),
+        ),
+        migrations.RunPython(copy_pending_tokens, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_activation_expiry_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_reset_expiry_idx',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='activation_token',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='activation_token_expiry',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='password_reset_token',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='password_reset_token_expiry',
+        ),
+    ]
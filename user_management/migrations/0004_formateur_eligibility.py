@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:15
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def compute_initial_eligibility(apps, schema_editor):
+    """Initialise le flag ; la tâche quotidienne prend le relais ensuite."""
+    User = apps.get_model('user_management', 'User')
+    tenure = getattr(settings, 'FORMATEUR_MIN_TENURE_DAYS', 30)
+    User.objects.filter(
+        role='intern',
+        is_active=True,
+        date_joined__lte=timezone.now() - timedelta(days=tenure),
+    ).update(is_formateur_eligible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('internship_management', '0001_initial'),
+        ('user_management', '0003_one_time_token_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='is_formateur_eligible',
+            field=models.BooleanField(default=False, verbose_name='formateur eligible'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_formateur_eligible', True)), fields=['date_joined'], name='user_formateur_eligible_idx'),
+        ),
+        migrations.RunPython(compute_initial_eligibility, migrations.RunPython.noop),
+    ]
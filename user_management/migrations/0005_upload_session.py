@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:21
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_management', '0004_formateur_eligibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('support', 'Support de formation'), ('projet', 'Fichier de projet')], max_length=20, verbose_name='target')),
+                ('filename', models.CharField(max_length=255, verbose_name='filename')),
+                ('content_type', models.CharField(blank=True, max_length=100, verbose_name='content type')),
+                ('total_size', models.PositiveBigIntegerField(verbose_name='total size')),
+                ('received', models.PositiveBigIntegerField(default=0, verbose_name='received bytes')),
+                ('status', models.CharField(choices=[('pending', 'En cours'), ('complete', 'Terminé')], default='pending', max_length=20, verbose_name='status')),
+                ('stored_name', models.CharField(blank=True, max_length=255, verbose_name='stored name')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('expires_at', models.DateTimeField(verbose_name='expires at')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'upload session',
+                'verbose_name_plural': 'upload sessions',
+                'indexes': [models.Index(fields=['expires_at'], name='user_manage_expires_a8dea1_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('internship_management', '0002_theme_keyset_index'),
+        ('user_management', '0005_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('assigned_theme__isnull', True), ('is_active', True), ('role', 'intern')), fields=['id'], name='user_available_intern_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 """users/models.py
 Modèles pour la gestion des utilisateurs, profils et suggestions.
 """
+import hashlib
 import logging
 import random
 import re
@@ -81,6 +82,20 @@ class CustomUserManager(BaseUserManager):
 
         return self._create_user(email, password, **extra_fields)
 
+    def auth_view(self):
+        """
+        Vue allégée de l'utilisateur pour l'authentification et les permissions :
+        seules les colonnes AUTH_FIELDS sont chargées, les autres le sont à la demande.
+        """
+        return self.get_queryset().only(*self.model.AUTH_FIELDS)
+
+    def available_interns(self):
+        """
+        Stagiaires actifs sans thème. Le filtre reprend exactement la condition
+        de l'index partiel user_available_intern_idx.
+        """
+        return self.get_queryset().filter(role='intern', is_active=True, assigned_theme__isnull=True)
+
 #Active User Manager qui filtre les utilisateurs actifs non supprimés et non désactivés
 class ActiveUserManager(models.Manager):
     """Manager pour les utilisateurs actifs non supprimés."""
@@ -176,17 +191,26 @@ class User(AbstractUser):
     # Cycle de vie du mot de passe
     password_expiry = models.DateTimeField(_('password expiry'), null=True, blank=True)
     must_change_password = models.BooleanField(_('must change password'), default=False)
-    
-    # Tokens d'activation et réinitialisation
-    activation_token = models.UUIDField(_('activation token'), null=True, blank=True)
-    activation_token_expiry = models.DateTimeField(_('activation token expiry'), null=True, blank=True)
-    password_reset_token = models.UUIDField(_('password reset token'), null=True, blank=True)
-    password_reset_token_expiry = models.DateTimeField(_('password reset token expiry'), null=True, blank=True)
+
+    # Éligibilité formateur (stagiaire actif avec l'ancienneté requise), maintenue
+    # par la tâche quotidienne training_management.tasks.refresh_formateur_eligibility
+    is_formateur_eligible = models.BooleanField(_('formateur eligible'), default=False)
+
+    # Les tokens d'activation et de réinitialisation sont stockés dans OneTimeToken
 
     # Managers
     objects = CustomUserManager()
     active_objects = ActiveUserManager()
 
+    # Colonnes chargées par CustomUserManager.auth_view() (authentification JWT et
+    # classes de permissions). Tout autre champ est chargé à la demande.
+    AUTH_FIELDS = (
+        'id', 'email', 'username', 'first_name', 'last_name',
+        'role', 'status', 'is_active', 'is_staff', 'is_superuser',
+        'date_joined', 'password_expiry', 'must_change_password', 'deleted_at',
+        'is_formateur_eligible',
+    )
+
     # Utiliser email comme champ d'authentification principal
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username'] if not getattr(settings, 'REMOVE_USERNAME_FIELD', False) else []
@@ -207,6 +231,18 @@ class User(AbstractUser):
             models.Index(fields=['is_active']),
             models.Index(fields=['date_joined']),
             models.Index(fields=['role', 'is_active']),
+            # Index partiel : liste des formateurs éligibles, triée par ancienneté
+            models.Index(
+                fields=['date_joined'],
+                condition=Q(is_formateur_eligible=True),
+                name='user_formateur_eligible_idx',
+            ),
+            # Index partiel : stagiaires disponibles pour l'attribution d'un thème
+            models.Index(
+                fields=['id'],
+                condition=Q(role='intern', is_active=True, assigned_theme__isnull=True),
+                name='user_available_intern_idx',
+            ),
         ]
         verbose_name = _('user')
         verbose_name_plural = _('users')
@@ -224,12 +260,17 @@ class User(AbstractUser):
             self.username = self.email.split('@')[0]
             
         # Générer un token d'activation pour les nouveaux utilisateurs inactifs
-        if not self.pk and not self.is_active and not self.activation_token:
-            self.activation_token = uuid.uuid4()
-            self.activation_token_expiry = timezone.now() + timedelta(hours=48)
-            
+        needs_activation = not self.pk and not self.is_active
+
         super().save(*args, **kwargs)
 
+        if needs_activation:
+            # Un token fourni par l'appelant (imports) est conservé tel quel
+            self.issue_activation_token(
+                token=getattr(self, 'activation_token', None),
+                expires_at=getattr(self, 'activation_token_expiry', None),
+            )
+
     def clean(self):
         """Validation métier."""
         super().clean()
@@ -264,29 +305,40 @@ class User(AbstractUser):
             #Sinon les seules permissions accordées sont celles basiques (pour les visiteurs)
             return BASIC_USER_PERMISSIONS
 
+    def issue_activation_token(self, token=None, expires_at=None, expiry_hours=48):
+        """
+        Émet un token d'activation. Le token en clair et son expiration restent
+        disponibles sur l'instance (activation_token, activation_token_expiry)
+        pour l'envoi de l'email ; seule son empreinte est stockée.
+        """
+        token, expires_at = OneTimeToken.objects.issue(
+            self, OneTimeToken.Purpose.ACTIVATION,
+            token=token, expires_at=expires_at, lifetime=timedelta(hours=expiry_hours),
+        )
+        self.activation_token = token
+        self.activation_token_expiry = expires_at
+        return token
+
     def is_activation_token_valid(self, token):
         """Vérifie si le token d'activation est valide."""
-        return (
-            self.activation_token == token and
-            self.activation_token_expiry and
-            timezone.now() < self.activation_token_expiry and
-            not self.is_active
-        )
+        return not self.is_active and self.one_time_tokens.usable().filter(
+            purpose=OneTimeToken.Purpose.ACTIVATION,
+            token_hash=OneTimeToken.hash_token(token),
+        ).exists()
 
     def generate_password_reset_token(self, expiry_hours=1):
         """Génère un token de réinitialisation de mot de passe."""
-        self.password_reset_token = uuid.uuid4()
-        self.password_reset_token_expiry = timezone.now() + timedelta(hours=expiry_hours)
-        self.save(update_fields=['password_reset_token', 'password_reset_token_expiry'])
-        return self.password_reset_token
+        token, _expires_at = OneTimeToken.objects.issue(
+            self, OneTimeToken.Purpose.PASSWORD_RESET, lifetime=timedelta(hours=expiry_hours),
+        )
+        return token
 
     def is_password_reset_token_valid(self, token):
         """Vérifie si le token de réinitialisation est valide."""
-        return (
-            self.password_reset_token == token and
-            self.password_reset_token_expiry and
-            timezone.now() < self.password_reset_token_expiry
-        )
+        return self.one_time_tokens.usable().filter(
+            purpose=OneTimeToken.Purpose.PASSWORD_RESET,
+            token_hash=OneTimeToken.hash_token(token),
+        ).exists()
 
     def is_password_expired(self):
         """Vérifie si le mot de passe a expiré."""
@@ -344,6 +396,196 @@ class Profile(models.Model):
         return _("Profile for %(email)s") % {'email': self.user.email}
 
 
+class OneTimeTokenQuerySet(models.QuerySet):
+    def usable(self):
+        """Tokens ni consommés ni expirés."""
+        return self.filter(used_at__isnull=True, expires_at__gt=timezone.now())
+
+    def purgeable(self):
+        """
+        Tokens expirés sans avoir servi, ou consommés depuis plus de
+        ONE_TIME_TOKEN_RETENTION_DAYS jours (les activations récentes alimentent
+        les agrégats quotidiens, voir logs_and_analytics/rollups.py).
+        """
+        now = timezone.now()
+        retention = timedelta(days=getattr(settings, 'ONE_TIME_TOKEN_RETENTION_DAYS', 3))
+        return self.filter(
+            Q(expires_at__lte=now, used_at__isnull=True) | Q(used_at__lte=now - retention)
+        )
+
+
+class OneTimeTokenManager(models.Manager):
+    def get_queryset(self):
+        return OneTimeTokenQuerySet(self.model, using=self._db)
+
+    def usable(self):
+        return self.get_queryset().usable()
+
+    def purgeable(self):
+        return self.get_queryset().purgeable()
+
+    def issue(self, user, purpose, token=None, expires_at=None, lifetime=None):
+        """
+        Émet un token pour l'utilisateur et invalide ceux encore en attente
+        pour le même usage. Retourne le token en clair et son expiration.
+        """
+        token = token or uuid.uuid4()
+        expires_at = expires_at or timezone.now() + (lifetime or timedelta(hours=48))
+        with transaction.atomic():
+            self.filter(user=user, purpose=purpose, used_at__isnull=True).delete()
+            self.create(
+                user=user,
+                purpose=purpose,
+                token_hash=self.model.hash_token(token),
+                expires_at=expires_at,
+            )
+        return token, expires_at
+
+    def bulk_issue(self, purpose, entries):
+        """
+        Enregistre en une requête les tokens d'utilisateurs nouvellement créés.
+        :param entries: itérable de (user, token, expires_at)
+        """
+        return self.bulk_create([
+            self.model(
+                user=user,
+                purpose=purpose,
+                token_hash=self.model.hash_token(token),
+                expires_at=expires_at,
+            )
+            for user, token, expires_at in entries
+        ])
+
+    def lookup(self, token, purpose):
+        """Retrouve un token par son empreinte (index unique), avec son utilisateur."""
+        return self.select_related('user').filter(
+            purpose=purpose,
+            token_hash=self.model.hash_token(token),
+        ).first()
+
+    def consume(self, token, purpose):
+        """
+        Consomme un token à usage unique. L'UPDATE conditionnel garantit qu'une
+        seule requête concurrente réussit. Retourne True si le token a été consommé.
+        """
+        return self.usable().filter(
+            purpose=purpose,
+            token_hash=self.model.hash_token(token),
+        ).update(used_at=timezone.now()) == 1
+
+
+# Tokens à usage unique (activation, réinitialisation du mot de passe).
+# Seule l'empreinte SHA-256 du token est stockée : la recherche passe par
+# l'index unique et un dump de la table ne permet pas d'activer un compte.
+class OneTimeToken(models.Model):
+    """Token à usage unique avec expiration."""
+
+    class Purpose(models.TextChoices):
+        ACTIVATION = 'activation', _('Activation')
+        PASSWORD_RESET = 'password_reset', _('Réinitialisation du mot de passe')
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='one_time_tokens'
+    )
+    purpose = models.CharField(_('purpose'), max_length=20, choices=Purpose.choices)
+    token_hash = models.CharField(_('token hash'), max_length=64, unique=True)
+    expires_at = models.DateTimeField(_('expires at'))
+    used_at = models.DateTimeField(_('used at'), null=True, blank=True)
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+
+    objects = OneTimeTokenManager()
+
+    class Meta:
+        verbose_name = _('one-time token')
+        verbose_name_plural = _('one-time tokens')
+        indexes = [
+            models.Index(fields=['expires_at']),
+            models.Index(fields=['user', 'purpose']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_purpose_display()} - {self.user_id}"
+
+    @staticmethod
+    def hash_token(token):
+        """Empreinte SHA-256 de la forme textuelle du token."""
+        return hashlib.sha256(str(token).strip().lower().encode()).hexdigest()
+
+    @property
+    def is_usable(self):
+        return self.used_at is None and timezone.now() < self.expires_at
+
+
+class UploadSessionQuerySet(models.QuerySet):
+    def expired(self, now=None):
+        return self.filter(expires_at__lt=now or timezone.now())
+
+
+# Téléversement par morceaux reprenable : les octets reçus sont ajoutés à un
+# fichier partiel ; à la complétion il est haché puis rangé dans le stockage
+# adressé par contenu sans recopie (voir user_management/Services/UploadService.py).
+class UploadSession(models.Model):
+    """Session de téléversement par morceaux."""
+
+    class Target(models.TextChoices):
+        SUPPORT = 'support', _('Support de formation')
+        PROJET = 'projet', _('Fichier de projet')
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('En cours')
+        COMPLETE = 'complete', _('Terminé')
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    target = models.CharField(_('target'), max_length=20, choices=Target.choices)
+    filename = models.CharField(_('filename'), max_length=255)
+    content_type = models.CharField(_('content type'), max_length=100, blank=True)
+    total_size = models.PositiveBigIntegerField(_('total size'))
+    received = models.PositiveBigIntegerField(_('received bytes'), default=0)
+    status = models.CharField(_('status'), max_length=20, choices=Status.choices, default=Status.PENDING)
+    stored_name = models.CharField(_('stored name'), max_length=255, blank=True)
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('updated at'), auto_now=True)
+    expires_at = models.DateTimeField(_('expires at'))
+
+    objects = UploadSessionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _('upload session')
+        verbose_name_plural = _('upload sessions')
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.total_size})"
+
+    def save(self, *args, **kwargs):
+        if not self.expires_at:
+            hours = getattr(settings, 'CHUNKED_UPLOAD_EXPIRY_HOURS', 24)
+            self.expires_at = timezone.now() + timedelta(hours=hours)
+        super().save(*args, **kwargs)
+
+    @property
+    def temp_name(self):
+        """Fichier partiel, hors du préfixe du store pour échapper au ramasse-miettes."""
+        return f"uploads_tmp/{self.pk}.part"
+
+    @property
+    def is_complete(self):
+        return self.received >= self.total_size
+
+    @property
+    def is_expired(self):
+        return timezone.now() >= self.expires_at
+
+
 
 
 # Signaux pour créer automatiquement un profil à la création d'un utilisateur. 
@@ -0,0 +1,236 @@
+"""users/storage.py
+Stockage adressé par contenu des fichiers téléversés (supports de formation,
+fichiers de projet).
+
+Le nom d'un fichier est l'empreinte SHA-256 de son contenu : un même document
+envoyé plusieurs fois n'est écrit qu'une fois sur le disque. Un fichier peut
+donc être partagé par plusieurs lignes ; il n'est jamais supprimé depuis une
+requête mais par le ramasse-miettes (collect_orphan_files) lorsqu'aucune
+ligne n'y fait plus référence.
+"""
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import LazyObject
+
+logger = logging.getLogger(__name__)
+
+# Champs fichier stockés dans le store : 'app_label.Model.champ'
+DEFAULT_CONTENT_STORE_REFERENCES = (
+    'training_management.SupportFormation.fichier',
+    'training_management.SupportFormation.apercu',
+    'project_management.Projet.fichier',
+)
+
+
+# Attribut portant l'empreinte connue d'un fichier à enregistrer (set_known_digest)
+KNOWN_DIGEST_ATTR = '_content_sha256'
+
+
+def get_content_store_prefix():
+    return getattr(settings, 'CONTENT_STORE_PREFIX', 'cas')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage dont les noms sont dérivés du SHA-256 du contenu."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prefix = get_content_store_prefix()
+
+    def content_name(self, digest, ext=''):
+        """Chemin relatif d'un contenu : cas/ab/cd/abcd…<ext>"""
+        return f"{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+    @property
+    def tmp_dir(self):
+        return self.path(f"{self.prefix}/tmp")
+
+    def get_available_name(self, name, max_length=None):
+        # Le nom définitif est calculé dans _save à partir du contenu
+        return name
+
+    def _stream_to_temp(self, content, digest=None):
+        """
+        Écrit le contenu par blocs dans un fichier temporaire en calculant son
+        empreinte, sauf si elle est déjà connue (`digest`).
+        """
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        hasher = None if digest else hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    if hasher:
+                        hasher.update(chunk)
+                    tmp.write(chunk)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        return digest or hasher.hexdigest(), tmp_path
+
+    def store_temp(self, digest, tmp_path, ext=''):
+        """Range un fichier temporaire déjà haché sous son nom de contenu."""
+        name = self.content_name(digest, ext)
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            # Contenu déjà connu : rien à écrire. Le mtime est rafraîchi pour que le
+            # ramasse-miettes ne supprime pas le fichier avant l'enregistrement de la ligne.
+            os.remove(tmp_path)
+            os.utime(full_path)
+        else:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            os.replace(tmp_path, full_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        # Empreinte déjà calculée par inspect_upload (voir set_known_digest)
+        digest = getattr(content, KNOWN_DIGEST_ATTR, None)
+        if digest:
+            full_path = self.path(self.content_name(digest, ext))
+            if os.path.exists(full_path):
+                # Contenu déjà connu : ni hachage ni écriture
+                os.utime(full_path)
+                return self.content_name(digest, ext)
+        digest, tmp_path = self._stream_to_temp(content, digest)
+        return self.store_temp(digest, tmp_path, ext)
+
+
+def set_known_digest(file, digest):
+    """
+    Transmet au store l'empreinte SHA-256 déjà calculée d'un fichier à enregistrer
+    (ex. par inspect_upload) : son contenu n'est pas haché une seconde fois.
+    """
+    setattr(file, KNOWN_DIGEST_ATTR, digest)
+
+
+# Objets page d'un PDF (« /Type /Page », sans « /Pages »)
+PDF_PAGE_PATTERN = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+
+
+def inspect_upload(file, name=None):
+    """
+    Métadonnées d'un fichier téléversé, calculées en une lecture par blocs :
+    taille, type MIME, extension, SHA-256 et nombre de pages (PDF).
+    Le nombre de pages est une estimation (objets page non compressés) et vaut
+    None lorsqu'il n'est pas détectable.
+    """
+    name = name or getattr(file, 'name', '') or ''
+    ext = os.path.splitext(name)[1].lower()
+    mime_type = (
+        getattr(file, 'content_type', None)
+        or mimetypes.guess_type(name)[0]
+        or 'application/octet-stream'
+    )
+    is_pdf = ext == '.pdf' or mime_type == 'application/pdf'
+
+    hasher = hashlib.sha256()
+    size = 0
+    pages = 0
+    tail = b''
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    for chunk in file.chunks():
+        hasher.update(chunk)
+        size += len(chunk)
+        if is_pdf:
+            # Les derniers octets du bloc précédent couvrent un motif à cheval sur deux blocs
+            window = tail + chunk
+            pages += len(PDF_PAGE_PATTERN.findall(window)) - len(PDF_PAGE_PATTERN.findall(tail))
+            tail = window[-32:]
+    if hasattr(file, 'seek'):
+        file.seek(0)
+
+    return {
+        'size': size,
+        'mime_type': mime_type,
+        'extension': ext,
+        'checksum': hasher.hexdigest(),
+        'pages': (pages or None) if is_pdf else None,
+    }
+
+
+class DefaultContentStore(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage()
+
+
+content_store = DefaultContentStore()
+
+
+def get_content_store():
+    """Callable passé aux FileField (storage=) pour garder les migrations stables."""
+    return content_store
+
+
+def _reference_fields():
+    for path in getattr(settings, 'CONTENT_STORE_REFERENCES', DEFAULT_CONTENT_STORE_REFERENCES):
+        app_label, model_name, field_name = path.split('.')
+        yield apps.get_model(app_label, model_name), field_name
+
+
+def referenced_names():
+    """Ensemble des fichiers du store encore référencés."""
+    prefix = f"{get_content_store_prefix()}/"
+    names = set()
+    for model, field_name in _reference_fields():
+        names.update(
+            model._default_manager
+            .filter(**{f'{field_name}__startswith': prefix})
+            .values_list(field_name, flat=True)
+            .iterator()
+        )
+    return names
+
+
+def collect_orphans(grace_seconds=None):
+    """
+    Supprime les fichiers du store qui ne sont plus référencés.
+    Seuls les fichiers plus anciens que `grace_seconds` sont considérés : un
+    fichier venant d'être écrit dont la ligne n'est pas encore enregistrée est épargné.
+    """
+    if grace_seconds is None:
+        grace_seconds = getattr(settings, 'CONTENT_STORE_GC_GRACE_SECONDS', 60 * 60)
+    storage = content_store
+    root = storage.path(get_content_store_prefix())
+    cutoff = time.time() - grace_seconds
+    referenced = referenced_names()
+    stats = {'deleted': 0, 'bytes_freed': 0, 'kept': 0}
+
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            full_path = os.path.join(dirpath, filename)
+            try:
+                info = os.stat(full_path)
+            except FileNotFoundError:
+                continue
+            if info.st_mtime > cutoff:
+                stats['kept'] += 1
+                continue
+            name = os.path.relpath(full_path, storage.location).replace(os.sep, '/')
+            in_tmp = os.path.dirname(full_path) == storage.tmp_dir
+            if not in_tmp and name in referenced:
+                stats['kept'] += 1
+                continue
+            try:
+                os.remove(full_path)
+            except FileNotFoundError:
+                continue
+            stats['deleted'] += 1
+            stats['bytes_freed'] += info.st_size
+
+    logger.info(f"Content store GC: {stats['deleted']} fichiers supprimés ({stats['bytes_freed']} octets)")
+    return stats
@@ -76,18 +76,50 @@ def send_password_reset_email(email, first_name, reset_token, expiry_date):
         raise
 
 # Celery Daily task to clean expired tokens
+# Nettoyage par lots bornés (voir user_management/maintenance.py) pour ne jamais
+# verrouiller la table des tokens pendant toute la durée du nettoyage.
 @shared_task (bind=True, max_retries=3, retry_backoff=True)
-def clean_expired_tokens():
-    from user_management.models import User  # Assuming you have a User model
+def clean_expired_tokens(self):
+    from user_management.maintenance import (
+        ExpiredActivationTokenCleanup, ExpiredPasswordResetTokenCleanup
+    )
     now = timezone.now()
-    expired_activation = User.objects.filter(activation_token_expiry__lt=now)
-    activation_count = expired_activation.count()
-    expired_activation.update(activation_token=None, activation_token_expiry=None)
-    
-    expired_reset = User.objects.filter(password_reset_token_expiry__lt=now)
-    reset_count = expired_reset.count()
-    expired_reset.update(password_reset_token=None, password_reset_token_expiry=None)
-    
+    try:
+        activation = ExpiredActivationTokenCleanup().run()
+        reset = ExpiredPasswordResetTokenCleanup().run()
+    except Exception as e:
+        # La progression est conservée en cache : la relance reprend au dernier lot traité
+        logger.error(f"Failed to clean expired tokens: {e}")
+        raise self.retry(exc=e, countdown=60)
+
+    activation_count = activation['rows_affected']
+    reset_count = reset['rows_affected']
     logger.info(f"{activation_count} expired activation tokens and {reset_count} expired reset tokens deleted at {now}")
     return f"{activation_count} activation, {reset_count} reset tokens deleted"
 
+
+# Tâche quotidienne : ramasse-miettes du stockage adressé par contenu
+# (voir user_management/storage.py). Un fichier partagé n'est supprimé que
+# lorsqu'aucun support ni projet n'y fait plus référence.
+@shared_task(bind=True, max_retries=3, retry_backoff=True)
+def collect_orphan_files(self):
+    from user_management.storage import collect_orphans
+    try:
+        stats = collect_orphans()
+    except Exception as e:
+        logger.error(f"Failed to collect orphan files: {e}")
+        raise self.retry(exc=e, countdown=60)
+    return f"{stats['deleted']} orphan files deleted, {stats['bytes_freed']} bytes freed"
+
+
+# Tâche horaire : purge des téléversements par morceaux abandonnés
+# (sessions expirées et fichiers partiels correspondants).
+@shared_task(bind=True, max_retries=3, retry_backoff=True)
+def purge_expired_uploads(self):
+    from user_management.Services.UploadService import ChunkedUploadService
+    try:
+        deleted = ChunkedUploadService.purge_expired()
+    except Exception as e:
+        logger.error(f"Failed to purge expired uploads: {e}")
+        raise self.retry(exc=e, countdown=60)
+    return f"{deleted} expired upload sessions purged"
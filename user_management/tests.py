@@ -0,0 +1,232 @@
+import io
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import DatabaseError
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from project_management.models import Projet
+from training_management.models import FormationType
+from user_management.downloads import serve_file
+from user_management.models import OneTimeToken, UploadSession, User
+from user_management.Services.LifecycleService import UserLifecycleService
+from user_management.Services.UploadService import ChunkedUploadService, UploadError
+
+
+class BulkLifecycleTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin@example.com', 'pw')
+        self.other_admin = User.objects.create_superuser('other@example.com', 'pw')
+
+    def test_demoting_admin_clears_staff_and_superuser(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            outcome = UserLifecycleService.apply(
+                UserLifecycleService.CHANGE_ROLE, self.admin, ids=[self.other_admin.pk], role='supervisor'
+            )
+
+        self.assertEqual(outcome['updated'], 1)
+        self.other_admin.refresh_from_db()
+        self.assertEqual(self.other_admin.role, 'supervisor')
+        self.assertFalse(self.other_admin.is_staff)
+        self.assertFalse(self.other_admin.is_superuser)
+
+    def test_promoting_to_admin_sets_staff(self):
+        user = User.objects.create_user('intern@example.com', 'pw', role='intern', is_active=True)
+        UserLifecycleService.apply(UserLifecycleService.CHANGE_ROLE, self.admin, ids=[user.pk], role='admin')
+
+        user.refresh_from_db()
+        self.assertEqual(user.role, 'admin')
+        self.assertTrue(user.is_staff)
+
+    def test_own_account_is_skipped(self):
+        outcome = UserLifecycleService.apply(
+            UserLifecycleService.CHANGE_ROLE, self.admin, ids=[self.admin.pk], role='intern'
+        )
+
+        self.assertEqual(outcome['skipped'], 1)
+        self.admin.refresh_from_db()
+        self.assertEqual(self.admin.role, 'admin')
+        self.assertTrue(self.admin.is_superuser)
+
+    def test_bulk_update_invalidates_user_caches_on_commit(self):
+        user = User.objects.create_user('intern@example.com', 'pw', role='intern', is_active=True)
+        with mock.patch('internship_management.cache.invalidate_available_interns_count') as interns, \
+                mock.patch('training_management.cache.invalidate_formateurs_cache') as formateurs:
+            with self.captureOnCommitCallbacks(execute=True):
+                UserLifecycleService.apply(UserLifecycleService.ARCHIVE, self.admin, ids=[user.pk])
+
+        interns.assert_called_once_with()
+        formateurs.assert_called_once_with()
+
+    def test_archived_intern_loses_formateur_eligibility(self):
+        user = User.objects.create_user(
+            'formateur@example.com', 'pw', role='intern', is_active=True,
+            date_joined=timezone.now() - timedelta(days=365),
+        )
+        User.objects.filter(pk=user.pk).update(is_formateur_eligible=True)
+
+        UserLifecycleService.apply(UserLifecycleService.ARCHIVE, self.admin, ids=[user.pk])
+
+        user.refresh_from_db()
+        self.assertFalse(user.is_formateur_eligible)
+
+
+class ChunkedUploadCompletionTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.admin = User.objects.create_superuser('admin@example.com', 'pw')
+        self.formation = FormationType.objects.create(nom='Python', duree_estimee=10)
+        content = b'%PDF-1.4 contenu'
+        self.session = ChunkedUploadService.create(
+            self.admin, UploadSession.Target.SUPPORT, 'cours.pdf', len(content)
+        )
+        ChunkedUploadService.append(self.session.pk, self.admin, 0, io.BytesIO(content), len(content))
+
+    def test_rejected_completion_keeps_partial_file(self):
+        with self.assertRaises(UploadError) as ctx:
+            ChunkedUploadService.complete(
+                self.session.pk, self.admin, {'formation_type': self.formation.pk, 'titre': ''}
+            )
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertTrue(os.path.exists(ChunkedUploadService.temp_path(self.session)))
+
+        session, support = ChunkedUploadService.complete(
+            self.session.pk, self.admin, {'formation_type': self.formation.pk, 'titre': 'Cours'}
+        )
+        self.assertEqual(session.status, UploadSession.Status.COMPLETE)
+        self.assertTrue(support.fichier.storage.exists(support.fichier.name))
+
+    def test_missing_partial_file_is_gone(self):
+        os.remove(ChunkedUploadService.temp_path(self.session))
+
+        with self.assertRaises(UploadError) as ctx:
+            ChunkedUploadService.complete(
+                self.session.pk, self.admin, {'formation_type': self.formation.pk, 'titre': 'Cours'}
+            )
+        self.assertEqual(ctx.exception.status_code, 410)
+
+    def test_failed_projet_save_restores_partial_file(self):
+        formation = FormationType.objects.create(nom='Java', duree_estimee=10)
+        projet = Projet.objects.create(titre='Projet', formation=formation)
+        content = b'%PDF-1.4 projet'
+        session = ChunkedUploadService.create(self.admin, UploadSession.Target.PROJET, 'projet.pdf', len(content))
+        ChunkedUploadService.append(session.pk, self.admin, 0, io.BytesIO(content), len(content))
+
+        with mock.patch.object(Projet, 'save', side_effect=DatabaseError('écriture refusée')):
+            with self.assertRaises(DatabaseError):
+                ChunkedUploadService.complete(session.pk, self.admin, {'projet': projet.pk})
+
+        with open(ChunkedUploadService.temp_path(session), 'rb') as partial:
+            self.assertEqual(partial.read(), content)
+        _, projet = ChunkedUploadService.complete(session.pk, self.admin, {'projet': projet.pk})
+        projet.refresh_from_db()
+        self.assertTrue(projet.fichier.name.endswith('.pdf'))
+
+
+class ServeFileTests(TestCase):
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.storage = FileSystemStorage(location=root)
+        self.storage.save('doc.txt', ContentFile(b'0123456789'))
+        self.factory = RequestFactory()
+
+    def serve(self, name='doc.txt', **headers):
+        request = self.factory.get('/download/', headers=headers)
+        return serve_file(request, SimpleNamespace(storage=self.storage, name=name))
+
+    def test_single_range(self):
+        response = self.serve(Range='bytes=2-4')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'234')
+
+    def test_multiple_ranges_are_ignored(self):
+        response = self.serve(Range='bytes=0-1,4-5')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+
+    def test_unsatisfiable_range(self):
+        response = self.serve(Range='bytes=20-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_missing_file_is_not_found(self):
+        with self.assertRaises(Http404):
+            self.serve(name='absent.txt')
+
+
+class OneTimeTokenTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('intern@example.com', 'pw', role='intern', is_active=True)
+        self.purpose = OneTimeToken.Purpose.PASSWORD_RESET
+
+    def test_only_the_hash_is_stored_and_found(self):
+        token, _ = OneTimeToken.objects.issue(self.user, self.purpose)
+
+        row = OneTimeToken.objects.lookup(str(token).upper(), self.purpose)
+        self.assertEqual(row.user, self.user)
+        self.assertNotEqual(row.token_hash, str(token))
+        self.assertFalse(OneTimeToken.objects.filter(token_hash=str(token)).exists())
+        self.assertIsNone(OneTimeToken.objects.lookup(uuid.uuid4(), self.purpose))
+
+    def test_token_is_consumed_once(self):
+        token, _ = OneTimeToken.objects.issue(self.user, self.purpose)
+
+        self.assertTrue(OneTimeToken.objects.consume(token, self.purpose))
+        self.assertFalse(OneTimeToken.objects.consume(token, self.purpose))
+        self.assertFalse(OneTimeToken.objects.lookup(token, self.purpose).is_usable)
+
+    def test_expired_token_cannot_be_consumed(self):
+        token, _ = OneTimeToken.objects.issue(
+            self.user, self.purpose, expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertFalse(OneTimeToken.objects.consume(token, self.purpose))
+        self.assertIn(OneTimeToken.objects.lookup(token, self.purpose), OneTimeToken.objects.purgeable())
+
+    def test_purpose_mismatch(self):
+        token, _ = OneTimeToken.objects.issue(self.user, self.purpose)
+
+        self.assertIsNone(OneTimeToken.objects.lookup(token, OneTimeToken.Purpose.ACTIVATION))
+        self.assertFalse(OneTimeToken.objects.consume(token, OneTimeToken.Purpose.ACTIVATION))
+        self.assertTrue(OneTimeToken.objects.consume(token, self.purpose))
+
+    def test_reissue_replaces_pending_token(self):
+        first, _ = OneTimeToken.objects.issue(self.user, self.purpose)
+        second, _ = OneTimeToken.objects.issue(self.user, self.purpose)
+
+        self.assertIsNone(OneTimeToken.objects.lookup(first, self.purpose))
+        self.assertTrue(OneTimeToken.objects.consume(second, self.purpose))
+
+    def test_bulk_issue(self):
+        other = User.objects.create_user('other@example.com', 'pw', role='intern', is_active=True)
+        expires_at = timezone.now() + timedelta(hours=1)
+        tokens = {self.user: uuid.uuid4(), other: uuid.uuid4()}
+
+        OneTimeToken.objects.bulk_issue(
+            self.purpose, [(user, token, expires_at) for user, token in tokens.items()]
+        )
+
+        for user, token in tokens.items():
+            self.assertEqual(OneTimeToken.objects.lookup(token, self.purpose).user, user)
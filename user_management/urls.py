@@ -7,7 +7,8 @@ from .views.users_security import (ActivationView, PasswordResetRequestView,
                                   PasswordResetConfirmView, PasswordChangeView)
 
 from user_management.views.users_crud import ( UserDetailView, BulkUserImportView, SingleUserCreateView,
-                                            UserExportView)
+                                            UserExportView, BulkUserLifecycleView)
+from .views.uploads import ChunkedUploadCreateView, ChunkedUploadDetailView, ChunkedUploadCompleteView
 from .views.utils import verify_captcha                            
 from rest_framework_simplejwt.views import TokenObtainPairView  
 from user_management.views.views import me_view
@@ -47,6 +48,13 @@ urlpatterns = [
     path('users/bulk-import/', BulkUserImportView.as_view(), name='user-import'),
     # chemin pour l'export des utilisateurs
     path('users/bulk-export/', UserExportView.as_view(), name='user-export'),
+    # chemin pour archiver, restaurer, supprimer ou changer le rôle d'un lot d'utilisateurs
+    path('users/bulk-lifecycle/', BulkUserLifecycleView.as_view(), name='user-bulk-lifecycle'),
+
+    # TÉLÉVERSEMENT PAR MORCEAUX (supports de formation, fichiers de projet)
+    path('uploads/', ChunkedUploadCreateView.as_view(), name='chunked-upload-create'),
+    path('uploads/<uuid:pk>/', ChunkedUploadDetailView.as_view(), name='chunked-upload-detail'),
+    path('uploads/<uuid:pk>/complete/', ChunkedUploadCompleteView.as_view(), name='chunked-upload-complete'),
 
     # SUGGESTIONS & STATS
     #path('suggestions/', SuggestionView.as_view(), name='user-suggestions'),
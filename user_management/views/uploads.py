@@ -0,0 +1,144 @@
+# user_management/views/uploads.py
+"""Téléversement par morceaux reprenable des supports et fichiers de projet.
+
+    POST   uploads/                 crée la session (filename, size, target)
+    HEAD   uploads/<id>/            offset courant (en-tête Upload-Offset)
+    PATCH  uploads/<id>/            ajoute un morceau à l'offset Upload-Offset
+    POST   uploads/<id>/complete/   range le fichier et l'associe à sa cible
+    DELETE uploads/<id>/            abandonne la session
+
+L'envoi en une seule requête multipart reste disponible sur les endpoints
+existants, avec leurs limites de taille.
+"""
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from user_management.mixins import LoggingMixin
+from user_management.models import UploadSession
+from user_management.Services.UploadService import ChunkedUploadService, UploadError
+
+
+def _offset_headers(response, session):
+    response['Upload-Offset'] = str(session.received)
+    response['Upload-Length'] = str(session.total_size)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def _session_payload(session):
+    return {
+        'id': str(session.pk),
+        'target': session.target,
+        'filename': session.filename,
+        'size': session.total_size,
+        'offset': session.received,
+        'status': session.status,
+        'expires_at': session.expires_at,
+    }
+
+
+def _error_response(error):
+    return Response({'detail': error.message}, status=error.status_code)
+
+
+class ChunkedUploadPermissionMixin:
+    """Supports et fichiers de projet ne sont modifiables que par les administrateurs."""
+    permission_classes = [IsAuthenticated]
+
+    def check_permissions(self, request):
+        super().check_permissions(request)
+        if getattr(request.user, 'role', None) != 'admin':
+            self.permission_denied(request, message='Permission denied')
+
+
+class ChunkedUploadCreateView(LoggingMixin, ChunkedUploadPermissionMixin, APIView):
+
+    def post(self, request):
+        self.setup_logging_context(request)
+        target = request.data.get('target')
+        filename = request.data.get('filename') or ''
+        content_type = request.data.get('content_type') or ''
+        try:
+            total_size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'detail': 'size doit être un entier.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if target not in UploadSession.Target.values:
+            return Response(
+                {'detail': f"target invalide. Utilisez: {', '.join(UploadSession.Target.values)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not filename or total_size <= 0:
+            return Response({'detail': 'filename et size sont requis.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            session = ChunkedUploadService.create(
+                request.user, target, filename, total_size, content_type[:100]
+            )
+        except UploadError as e:
+            return _error_response(e)
+
+        self.log_success('chunked_upload_created', {
+            'upload_id': str(session.pk), 'target': target, 'size': total_size,
+        })
+        response = Response(_session_payload(session), status=status.HTTP_201_CREATED)
+        response['Location'] = request.build_absolute_uri(f"{session.pk}/")
+        return _offset_headers(response, session)
+
+
+class ChunkedUploadDetailView(LoggingMixin, ChunkedUploadPermissionMixin, APIView):
+
+    def get(self, request, pk):
+        # Sert aussi HEAD : le client y relit l'offset avant de reprendre
+        session = UploadSession.objects.filter(pk=pk, owner=request.user).first()
+        if session is None:
+            return Response({'detail': 'Session de téléversement introuvable.'}, status=status.HTTP_404_NOT_FOUND)
+        return _offset_headers(Response(_session_payload(session)), session)
+
+    def patch(self, request, pk):
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length') or 0)
+        except ValueError:
+            return Response({'detail': "En-tête Upload-Offset requis."}, status=status.HTTP_400_BAD_REQUEST)
+        if length <= 0 or request.stream is None:
+            return Response({'detail': 'Morceau vide.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # Le corps est lu par blocs depuis le flux, jamais chargé en mémoire
+            session = ChunkedUploadService.append(pk, request.user, offset, request.stream, length)
+        except UploadError as e:
+            return _error_response(e)
+        return _offset_headers(Response(status=status.HTTP_204_NO_CONTENT), session)
+
+    def delete(self, request, pk):
+        self.setup_logging_context(request)
+        try:
+            ChunkedUploadService.abort(pk, request.user)
+        except UploadError as e:
+            return _error_response(e)
+        self.log_success('chunked_upload_aborted', {'upload_id': str(pk)})
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ChunkedUploadCompleteView(LoggingMixin, ChunkedUploadPermissionMixin, APIView):
+
+    def post(self, request, pk):
+        self.setup_logging_context(request)
+        try:
+            session, instance = ChunkedUploadService.complete(pk, request.user, request.data)
+        except UploadError as e:
+            return _error_response(e)
+
+        self.log_success('chunked_upload_completed', {
+            'upload_id': str(session.pk),
+            'target': session.target,
+            'object_id': instance.pk,
+            'stored_name': session.stored_name,
+        })
+        return Response({
+            **_session_payload(session),
+            'object_id': instance.pk,
+        }, status=status.HTTP_201_CREATED)
@@ -14,13 +14,15 @@ from datetime import timedelta
 import uuid
 from django.db import transaction
 import logging
-from user_management.models import User
-from user_management.Serializers.User_Serializer import UserSerializer, UserRegistrationSerializer
+from user_management.models import OneTimeToken, User
+from user_management.Serializers.User_Serializer import (UserSerializer, UserRegistrationSerializer,
+                                                        BulkUserLifecycleSerializer)
 from user_management.permissions import Permission
 from rest_framework.permissions import IsAuthenticated
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from user_management.Services.ExportService import UserExportService
+from user_management.Services.LifecycleService import UserLifecycleService
 
 # Pagination
 class StandardPagination(PageNumberPagination):
@@ -192,7 +194,49 @@ class UserDetailView(LoggingMixin, RateLimitMixin, APIView):
         })
 
         return Response({'detail': f'Utilisateur {old_email} supprimé (soft delete).'}, status=status.HTTP_200_OK)
-     
+
+# Vue pour les opérations de cycle de vie en masse (archivage, restauration, suppression, rôle)
+class BulkUserLifecycleView(LoggingMixin, RateLimitMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    rate_limit = 10
+    rate_period = 60
+    rate_scope = 'user'
+
+    def post(self, request):
+        self.setup_logging_context(request)
+
+        # Mêmes permissions que les opérations unitaires de UserDetailView
+        if request.user.role != 'admin' or not request.user.has_perm(Permission.MANAGE_USERS):
+            return Response({'detail': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = BulkUserLifecycleSerializer(data=request.data)
+        if not serializer.is_valid():
+            self.log_error('users_bulk_lifecycle_invalid', Exception('ValidationError'), {'errors': serializer.errors})
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        action = data['action']
+        outcome = UserLifecycleService.apply(
+            action,
+            request.user,
+            ids=data.get('ids'),
+            filters=data.get('filters'),
+            role=data.get('role'),
+        )
+
+        # Un seul enregistrement d'audit pour tout le lot
+        self.log_success(f'users_bulk_{action}', {
+            'performed_by': request.user.email,
+            'filters': data.get('filters'),
+            'role': data.get('role'),
+            'updated': outcome['updated'],
+            'skipped': outcome['skipped'],
+            'not_found': outcome['not_found'],
+            'updated_ids': [r['id'] for r in outcome['results'] if r['status'] == 'updated'],
+        })
+
+        return Response({'action': action, **outcome}, status=status.HTTP_200_OK)
+
 # Vue pour l'importation en masse d'utilisateurs
 @method_decorator(csrf_exempt, name='dispatch')
 class BulkUserImportView(APIView):
@@ -357,6 +401,10 @@ class BulkUserImportView(APIView):
 
             try:
                 User.objects.bulk_create(users_to_create, ignore_conflicts=False)
+                # bulk_create ne passe pas par save() : les tokens sont enregistrés à part
+                OneTimeToken.objects.bulk_issue(OneTimeToken.Purpose.ACTIVATION, [
+                    (user, user.activation_token, user.activation_token_expiry) for user in users_to_create
+                ])
                 results['success'] = len(users_to_create)
                 logger.info(f"Import réussi: {results['success']} utilisateurs créés par {imported_by}")
 